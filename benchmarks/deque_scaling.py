@@ -0,0 +1,96 @@
+"""
+Сравнение пропускной способности общей очереди (DequeEnviroment) и локальных очередей
+с кражей задач (RuntimeConfig.WORK_STEALING) при разном количестве воркеров.
+
+Запуск:
+    python -m benchmarks.deque_scaling --items 10000 --workers 1 2 4 8
+"""
+
+import argparse
+import logging
+import time
+from itertools import count
+from typing import Generator, List, Sequence
+
+from fiber import get_main_logger
+from fiber.step import Step
+from fiber.pipeline.task import Task, TaskBuilder
+from fiber.pipeline.runtime import Runtime, RuntimeConfig, ITaskProvider
+
+ITEMS = 10_000
+SOURCES = 8
+
+_sunk = count()
+
+
+class Source(Step[None, int]):
+    @classmethod
+    def start(cls, data: None) -> Generator[int, None, None]:
+        yield from range(ITEMS // SOURCES)
+
+
+class Transform(Step[int, int]):
+    @classmethod
+    def start(cls, data: int) -> int:
+        return data + 1
+
+
+class Sink(Step[int, None]):
+    @classmethod
+    def start(cls, data: int) -> None:
+        next(_sunk)
+
+
+class Provider(ITaskProvider):
+    def get_tasks(self) -> List[Task]:
+        return [
+            TaskBuilder.build_from(
+                [Source, Transform, Sink],
+                strict_building_types=True,
+                strict_runtime_types=False,
+            )
+            for _ in range(SOURCES)
+        ]
+
+
+def measure(workers: int, work_stealing: bool) -> float:
+    """
+    Returns:
+        Пропускная способность в элементах в секунду.
+    """
+    runtime = Runtime(
+        tasks_provider=Provider(),
+        config=RuntimeConfig(
+            WORKERS=workers,
+            TASKS_PER_ITER=16,
+            TASK_LIMIT=1000,
+            WORK_STEALING=work_stealing,
+        ),
+    )
+
+    started = time.perf_counter()
+    runtime.run()
+    return ITEMS / (time.perf_counter() - started)
+
+
+def main(workers: Sequence[int]) -> None:
+    print(
+        f"{'workers':>8} | {'shared, items/s':>16} | {'stealing, items/s':>18} | speedup"
+    )
+    for n in workers:
+        shared = measure(n, work_stealing=False)
+        stealing = measure(n, work_stealing=True)
+        print(
+            f"{n:>8} | {shared:>16.0f} | {stealing:>18.0f} | {stealing / shared:.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--items", type=int, default=ITEMS)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    args = parser.parse_args()
+
+    ITEMS = args.items
+    get_main_logger().setLevel(logging.WARNING)
+    main(args.workers)
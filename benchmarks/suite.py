@@ -0,0 +1,373 @@
+"""
+Набор бенчмарков горячих путей Runtime (TaskWorker.run(), Task.step(), DequeEnviroment)
+со сравнением с сохранённым базовым прогоном.
+
+Сценарии покрывают длинные линейные цепочки, широкие генераторы (fan-out), дешёвые, CPU-ёмкие
+и ждущие (sleep) шаги, разное количество воркеров и настройки TASKS_PER_ITER / TASK_LIMIT.
+Для каждого сценария считаются:
+    - items/s - значений, дошедших до последнего шага, в секунду;
+    - p50 / p99 - задержка значения от выдачи шагом-источником до конца последнего шага;
+    - peak RSS - пиковая память процесса.
+
+Каждый сценарий запускается в отдельном процессе, чтобы пиковая память не накапливалась между сценариями.
+Базовый прогон зависит от машины: сохраняйте его (--save) на той же машине, на которой сравниваете.
+
+Запуск:
+    python -m benchmarks.suite                         # все сценарии, сравнение с benchmarks/baseline.json
+    python -m benchmarks.suite --filter chain --repeat 5
+    python -m benchmarks.suite --save                  # перезаписать базовый прогон
+"""
+
+import argparse
+import json
+import logging
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from dataclasses import asdict, dataclass
+from time import perf_counter_ns
+from typing import Dict, Generator, List, Optional, Sequence, Type
+
+from fiber import get_main_logger
+from fiber.step import Step
+from fiber.pipeline.task import Task, TaskBuilder
+from fiber.pipeline.runtime import Runtime, RuntimeConfig, ITaskProvider
+
+BASELINE = os.path.join(os.path.dirname(__file__), "baseline.json")
+# допустимое ухудшение метрики относительно базового прогона
+THRESHOLD = 0.15
+
+# задержки значений, дошедших до Sink (нс); list.append() атомарен под GIL
+_latencies: List[int] = []
+
+
+class Source(Step[None, int]):
+    """
+    Выдаёт ITEMS значений - момент выдачи (perf_counter_ns()), по нему Sink считает задержку.
+    """
+
+    items = 0
+
+    @classmethod
+    def start(cls, data: None) -> Generator[int, None, None]:
+        for _ in range(cls.items):
+            yield perf_counter_ns()
+
+
+class Cheap(Step[int, int]):
+    @classmethod
+    def start(cls, data: int) -> int:
+        return data
+
+
+class FanOut(Step[int, int]):
+    width = 64
+
+    @classmethod
+    def start(cls, data: int) -> Generator[int, None, None]:
+        for _ in range(cls.width):
+            yield data
+
+
+class CpuHeavy(Step[int, int]):
+    @classmethod
+    def start(cls, data: int) -> int:
+        total = 0
+        for i in range(5_000):
+            total += i * i
+        return data
+
+
+class Sleepy(Step[int, int]):
+    @classmethod
+    def start(cls, data: int) -> int:
+        time.sleep(0.001)
+        return data
+
+
+class Sink(Step[int, None]):
+    @classmethod
+    def start(cls, data: int) -> None:
+        _latencies.append(perf_counter_ns() - data)
+
+
+@dataclass(frozen=True)
+class Scenario:
+    """
+    Attrs:
+        name: Имя сценария (по нему выбираются сценарии и сопоставляются с базовым прогоном).
+        steps: Шаги между Source и Sink.
+        items: Значений, которые выдаёт каждый Source.
+        sources: Стартовых Task (цепочек).
+    """
+
+    name: str
+    steps: Sequence[Type[Step]]
+    items: int
+    sources: int = 8
+    workers: int = 1
+    tasks_per_iter: int = 16
+    task_limit: int = 1000
+
+
+@dataclass(frozen=True)
+class Result:
+    items: int
+    items_per_sec: float
+    p50_ms: float
+    p99_ms: float
+    peak_rss_mb: float
+
+
+def _scenarios() -> List[Scenario]:
+    scenarios = [
+        Scenario("chain-2", [Cheap], items=4_000),
+        Scenario("chain-8", [Cheap] * 7, items=1_500),
+        Scenario("chain-32", [Cheap] * 31, items=400),
+        Scenario("fanout-64", [FanOut], items=64, sources=8),
+        Scenario("fanout-1024", [FanOut] * 2, items=2, sources=4),
+        Scenario("cpu", [CpuHeavy], items=150),
+        Scenario("sleep", [Sleepy], items=40),
+    ]
+    for workers in (2, 4):
+        scenarios.append(
+            Scenario(f"chain-8/w{workers}", [Cheap] * 7, items=1_500, workers=workers)
+        )
+        scenarios.append(
+            Scenario(f"cpu/w{workers}", [CpuHeavy], items=150, workers=workers)
+        )
+        scenarios.append(
+            Scenario(f"sleep/w{workers}", [Sleepy], items=40, workers=workers)
+        )
+    for tasks_per_iter in (1, 256):
+        scenarios.append(
+            Scenario(
+                f"chain-8/tpi{tasks_per_iter}",
+                [Cheap] * 7,
+                items=1_500,
+                tasks_per_iter=tasks_per_iter,
+            )
+        )
+    for task_limit in (50, 100_000):
+        scenarios.append(
+            Scenario(
+                f"fanout-64/limit{task_limit}",
+                [FanOut],
+                items=64,
+                task_limit=task_limit,
+            )
+        )
+    return scenarios
+
+
+SCENARIOS: Dict[str, Scenario] = {scenario.name: scenario for scenario in _scenarios()}
+
+
+class _Provider(ITaskProvider):
+    def __init__(self, scenario: Scenario):
+        self._scenario = scenario
+
+    def get_tasks(self) -> List[Task]:
+        return [
+            TaskBuilder.build_from(
+                [Source, *self._scenario.steps, Sink],
+                strict_building_types=True,
+                strict_runtime_types=False,
+            )
+            for _ in range(self._scenario.sources)
+        ]
+
+
+def run_scenario(scenario: Scenario, repeat: int) -> Result:
+    """
+    Прогоняет сценарий repeat раз в текущем процессе.
+
+    Returns:
+        Медиана пропускной способности по прогонам, квантили задержки по всем прогонам.
+    """
+    Source.items = scenario.items
+    rates = []
+    latencies: List[int] = []
+    for _ in range(repeat):
+        _latencies.clear()
+        runtime = Runtime(
+            tasks_provider=_Provider(scenario),
+            config=RuntimeConfig(
+                WORKERS=scenario.workers,
+                TASKS_PER_ITER=scenario.tasks_per_iter,
+                TASK_LIMIT=scenario.task_limit,
+            ),
+        )
+        started = time.perf_counter()
+        runtime.run()
+        elapsed = time.perf_counter() - started
+
+        rates.append(len(_latencies) / elapsed)
+        latencies.extend(_latencies)
+
+    latencies.sort()
+    return Result(
+        items=len(latencies) // repeat,
+        items_per_sec=statistics.median(rates),
+        p50_ms=_quantile(latencies, 0.5) / 1e6,
+        p99_ms=_quantile(latencies, 0.99) / 1e6,
+        peak_rss_mb=_peak_rss_mb(),
+    )
+
+
+def run_isolated(name: str, repeat: int) -> Result:
+    """
+    Прогоняет сценарий в отдельном процессе (свой пик RSS, нет прогретых кэшей от других сценариев).
+    """
+    output = subprocess.run(
+        [
+            sys.executable,
+            "-m",
+            "benchmarks.suite",
+            "--child",
+            name,
+            "--repeat",
+            str(repeat),
+        ],
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+    return Result(**json.loads(output.splitlines()[-1]))
+
+
+def compare(
+    result: Result, baseline: Optional[Dict[str, float]], threshold: float
+) -> List[str]:
+    """
+    Returns:
+        Метрики, ухудшившиеся относительно базового прогона больше чем на threshold.
+    """
+    if baseline is None:
+        return []
+
+    regressions = []
+    if result.items_per_sec < baseline["items_per_sec"] * (1 - threshold):
+        regressions.append("items/s")
+    # хвост задержки между потоками шумнее остальных метрик - для p99 порог вдвое больше
+    for attr, label, limit in (
+        ("p50_ms", "p50", threshold),
+        ("p99_ms", "p99", 2 * threshold),
+        ("peak_rss_mb", "rss", threshold),
+    ):
+        if getattr(result, attr) > baseline[attr] * (1 + limit):
+            regressions.append(label)
+    return regressions
+
+
+def load_baseline(path: str) -> Dict[str, Dict[str, float]]:
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding="utf-8") as file:
+        return json.load(file)["scenarios"]
+
+
+def save_baseline(path: str, results: Dict[str, Result]) -> None:
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump(
+            {
+                "machine": platform.platform(),
+                "python": platform.python_version(),
+                "scenarios": {name: asdict(result) for name, result in results.items()},
+            },
+            file,
+            indent=2,
+        )
+        file.write("\n")
+
+
+def main(
+    names: Sequence[str], repeat: int, baseline_path: str, save: bool, threshold: float
+) -> int:
+    baseline = load_baseline(baseline_path)
+    results: Dict[str, Result] = {}
+    failed = 0
+
+    print(
+        f"{'scenario':<22} | {'items/s':>10} | {'vs base':>8} | {'p50, ms':>8} | "
+        f"{'p99, ms':>8} | {'rss, MB':>8} | regressions"
+    )
+    for name in names:
+        result = results[name] = run_isolated(name, repeat)
+        base = baseline.get(name)
+        change = (
+            f"{result.items_per_sec / base['items_per_sec'] - 1:>+8.1%}"
+            if base is not None
+            else f"{'-':>8}"
+        )
+        regressions = compare(result, base, threshold)
+        failed += bool(regressions)
+        print(
+            f"{name:<22} | {result.items_per_sec:>10.0f} | {change} | {result.p50_ms:>8.3f} | "
+            f"{result.p99_ms:>8.3f} | {result.peak_rss_mb:>8.1f} | {', '.join(regressions)}"
+        )
+
+    if save:
+        save_baseline(baseline_path, results)
+        print(f"\nБазовый прогон сохранён в {baseline_path}.")
+        return 0
+    if failed:
+        print(f"\nРегрессии в {failed} сценариях (порог {threshold:.0%}).")
+        return 1
+    return 0
+
+
+def _quantile(values: List[int], q: float) -> float:
+    # values отсортированы
+    if not values:
+        return 0.0
+    return values[min(int(q * len(values)), len(values) - 1)]
+
+
+def _peak_rss_mb() -> float:
+    import resource
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux отдаёт килобайты, macOS - байты
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def _select(patterns: Sequence[str]) -> List[str]:
+    if not patterns:
+        return list(SCENARIOS)
+    return [name for name in SCENARIOS if any(p in name for p in patterns)]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument(
+        "--filter", nargs="+", default=[], help="Подстроки имён сценариев."
+    )
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--baseline", default=BASELINE)
+    parser.add_argument(
+        "--save", action="store_true", help="Сохранить прогон как базовый."
+    )
+    parser.add_argument("--threshold", type=float, default=THRESHOLD)
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    get_main_logger().setLevel(logging.WARNING)
+    if args.child is not None:
+        print(json.dumps(asdict(run_scenario(SCENARIOS[args.child], args.repeat))))
+        sys.exit(0)
+
+    sys.exit(
+        main(
+            _select(args.filter),
+            args.repeat,
+            args.baseline,
+            args.save,
+            args.threshold,
+        )
+    )
@@ -0,0 +1,133 @@
+"""
+Память на одну ожидающую задачу (Task в очереди) и пропускная способность
+с переиспользованием завершённых задач (RuntimeConfig.TASK_FREE_LIST) и без него.
+
+Для сравнения память считается и для прежнего представления задачи - объекта с __dict__
+из семи полей (вершина вызова, данные, логгер, флаги, генератор, тип выхода).
+
+Запуск:
+    python -m benchmarks.task_memory --tasks 1000000 --items 100000
+"""
+
+import argparse
+import logging
+import time
+import tracemalloc
+from itertools import count
+from typing import Any, Callable, Generator, List
+
+from fiber import get_main_logger
+from fiber.step import Step
+from fiber.pipeline.task import ExecutionPlan, Task, TaskBuilder
+from fiber.pipeline.runtime import Runtime, RuntimeConfig, ITaskProvider
+
+TASKS = 1_000_000
+ITEMS = 100_000
+SOURCES = 8
+
+_sunk = count()
+
+
+class Source(Step[None, int]):
+    @classmethod
+    def start(cls, data: None) -> Generator[int, None, None]:
+        yield from range(ITEMS // SOURCES)
+
+
+class Transform(Step[int, int]):
+    @classmethod
+    def start(cls, data: int) -> int:
+        return data + 1
+
+
+class Sink(Step[int, None]):
+    @classmethod
+    def start(cls, data: int) -> None:
+        next(_sunk)
+
+
+class Provider(ITaskProvider):
+    def get_tasks(self) -> List[Task]:
+        return [
+            TaskBuilder.build_from(
+                [Source, Transform, Sink],
+                strict_building_types=True,
+                strict_runtime_types=False,
+            )
+            for _ in range(SOURCES)
+        ]
+
+
+class _DictTask:
+    # прежнее представление: те же поля, но в __dict__ каждого объекта
+    def __init__(self, call_node: Any, payload: Any):
+        self._call_node = call_node
+        self._payload = payload
+        self._kernel_logger = None
+        self._strict_types = False
+        self._is_done = False
+        self._generator = None
+        self._out_t = int
+
+
+def bytes_per_task(factory: Callable[[int], Any], tasks: int) -> float:
+    """
+    Returns:
+        Сколько байт занимает одна задача вместе с местом в очереди (данные - маленькие int, они не выделяются).
+    """
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    pending = [factory(i) for i in range(tasks)]
+    after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    del pending
+    return (after - before) / tasks
+
+
+def throughput(free_list: int) -> float:
+    """
+    Returns:
+        Пропускная способность в элементах в секунду.
+    """
+    runtime = Runtime(
+        tasks_provider=Provider(),
+        config=RuntimeConfig(
+            WORKERS=1,
+            TASKS_PER_ITER=16,
+            TASK_LIMIT=1000,
+            TASK_FREE_LIST=free_list,
+        ),
+    )
+
+    started = time.perf_counter()
+    runtime.run()
+    return ITEMS / (time.perf_counter() - started)
+
+
+def main(tasks: int) -> None:
+    plan = ExecutionPlan.from_steps([Transform, Sink], strict_types=False)
+
+    legacy = bytes_per_task(lambda i: _DictTask(plan, i % 256), tasks)
+    current = bytes_per_task(lambda i: Task(plan, i % 256, 0), tasks)
+    print(f"{'layout':>10} | {'bytes/task':>10}")
+    print(f"{'__dict__':>10} | {legacy:>10.1f}")
+    print(f"{'__slots__':>10} | {current:>10.1f}   ({legacy / current:.1f}x меньше)")
+    print()
+
+    plain = throughput(free_list=0)
+    recycled = throughput(free_list=1024)
+    print(f"{'free list':>10} | {'items/s':>10}")
+    print(f"{'off':>10} | {plain:>10.0f}")
+    print(f"{'1024':>10} | {recycled:>10.0f}   ({recycled / plain:.2f}x)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tasks", type=int, default=TASKS)
+    parser.add_argument("--items", type=int, default=ITEMS)
+    args = parser.parse_args()
+
+    ITEMS = args.items
+    get_main_logger().setLevel(logging.WARNING)
+    main(args.tasks)
@@ -2,7 +2,7 @@ __version__ = "0.3.0"
 __author__ = "kotmarkot"
 __appname__ = "Fiber"
 
-from fiber.logging import get_main_logger
+from fiber.logging import configure_logging, get_main_logger
 from fiber.api.pipeliner import Pipeliner
 from fiber.pipeline.runtime import RuntimeConfig
 from fiber.pipeline.builder import PipelineBuilder
@@ -13,4 +13,5 @@ __all__ = [
     "Pipeliner",
     "RuntimeConfig",
     "get_main_logger",
+    "configure_logging",
 ]
@@ -1,20 +1,144 @@
-from typing import Sequence, Type
+from threading import Thread
+from typing import Any, Iterable, Iterator, List, Optional, Union
 from fiber.pipeline.builder import PipelineBuilder
-from fiber.pipeline.runtime import Runtime, RuntimeConfig, TaskProvider
-from fiber.step.core import Step
+from fiber.pipeline.runtime import (
+    AsyncRuntime,
+    MetricsSnapshot,
+    ResultStream,
+    Runtime,
+    RuntimeConfig,
+    TaskProvider,
+)
+from fiber.pipeline.task.plan import PipelineSteps
 
 
 class Pipeliner:
-    def __init__(self, runtime_config: RuntimeConfig) -> None:
+    def __init__(
+        self, runtime_config: RuntimeConfig, merge_prefixes: bool = False
+    ) -> None:
+        """
+        Args:
+            merge_prefixes: Сливать общие начала добавленных конвееров, чтобы общие шаги
+                исполнялись один раз на значение (см. PipelineBuilder).
+        """
         self._runtime_config = runtime_config
-        self._pipeline_builder = PipelineBuilder()
+        self._pipeline_builder = PipelineBuilder(merge_prefixes=merge_prefixes)
+        self._runtime: Optional[Union[Runtime, AsyncRuntime]] = None
 
-    def add_pipeline(self, steps: Sequence[Type[Step]]):
-        self._pipeline_builder.add_pipeline(steps)
+    def add_pipeline(
+        self,
+        steps: PipelineSteps,
+        fuse: bool = False,
+        stream: bool = False,
+        ordered: bool = False,
+    ):
+        """
+        Добавляет конвеер. fuse=True сливает идущие подряд 1:1 шаги (см. TaskBuilder.build_from).
+        Последним элементом steps может быть список ветвей: [Read, Parse, [[Count, Report], [Store]]].
+        stream=True - значения последнего шага возвращаются вызывающему коду (см. run_iter()),
+        ordered=True - в порядке исходных данных (см. Step.ordered).
+        """
+        self._pipeline_builder.add_pipeline(
+            steps, fuse=fuse, stream=stream, ordered=ordered
+        )
+        return self
+
+    def feed(
+        self,
+        steps: PipelineSteps,
+        inputs: Iterable[Any],
+        fuse: bool = False,
+        stream: bool = False,
+        ordered: bool = False,
+    ):
+        """
+        Добавляет конвеер, первый шаг которого получает каждое значение inputs (см. PipelineBuilder.feed()):
+        цепочка собирается и проверяется один раз, стартовые задачи подаются лениво.
+
+        Пример:
+            >>> Pipeliner(config).feed([Parse, Store], open("data.txt")).run()
+        """
+        self._pipeline_builder.feed(
+            steps, inputs, fuse=fuse, stream=stream, ordered=ordered
+        )
         return self
 
     def run(self) -> None:
-        Runtime(
+        self._runtime = Runtime(
+            tasks_provider=TaskProvider(self._pipeline_builder),
+            config=self._runtime_config,
+        )
+        self._runtime.run()
+
+    def run_iter(self, maxsize: int = 1024) -> Iterator[Any]:
+        """
+        Исполняет добавленные конвееры в фоновом потоке и по мере готовности выдаёт значения последних шагов
+        конвееров, добавленных со stream=True (в порядке готовности, а у конвееров с ordered=True -
+        в порядке исходных данных).
+        Значения идут через буфер на maxsize штук: если читатель отстаёт, воркеры ждут его.
+
+        Если итерацию прервать, оставшиеся значения отбрасываются, а выход из итератора
+        ждёт завершения конвееров. Ошибка Runtime поднимается в конце итерации.
+
+        Пример:
+            >>> for row in Pipeliner(config).add_pipeline([Read, Parse], stream=True).run_iter():
+            >>>     print(row)
+
+        Raises:
+            ValueError: если BACKEND="process" (значения не передаются из процессов воркеров)
+                или maxsize меньше 1.
+        """
+        if self._runtime_config.BACKEND == "process":
+            raise ValueError('run_iter() не поддерживается с BACKEND="process".')
+
+        self._runtime = runtime = Runtime(
             tasks_provider=TaskProvider(self._pipeline_builder),
             config=self._runtime_config,
-        ).run()
+        )
+        results = self._pipeline_builder.get_results()
+        results.open(maxsize)
+        # проверки выше срабатывают при вызове run_iter(), а не на первом next()
+        return self._stream(runtime, results)
+
+    @staticmethod
+    def _stream(runtime: Runtime, results: ResultStream) -> Iterator[Any]:
+        errors: List[BaseException] = []
+
+        def run() -> None:
+            try:
+                runtime.run()
+            except BaseException as e:
+                errors.append(e)
+            finally:
+                results.finish()
+
+        thread = Thread(target=run, name="fiber-pipeliner", daemon=True)
+        thread.start()
+        try:
+            yield from results
+        finally:
+            results.close()
+            thread.join()
+        if errors:
+            raise errors[0]
+
+    async def run_async(self) -> None:
+        """
+        Исполняет добавленные конвееры в текущем event loop-е (см. AsyncRuntime).
+        """
+        self._runtime = AsyncRuntime(
+            tasks_provider=TaskProvider(self._pipeline_builder),
+            config=self._runtime_config,
+        )
+        await self._runtime.run()
+
+    def get_metrics(self) -> Optional[MetricsSnapshot]:
+        """
+        Снимок метрик последнего (или текущего) запуска (см. Runtime.get_metrics() и RuntimeConfig.METRICS).
+
+        Returns:
+            None, если конвееры ещё не запускались.
+        """
+        if self._runtime is None:
+            return None
+        return self._runtime.get_metrics()
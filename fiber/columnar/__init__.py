@@ -0,0 +1,13 @@
+"""
+Колоночные данные для векторизованных шагов: NumPy-массивы и RecordBatch.
+Требует NumPy (необязательная зависимость Fiber).
+"""
+
+try:
+    import numpy  # noqa: F401
+except ImportError as e:
+    raise ImportError("fiber.columnar требует NumPy: pip install numpy") from e
+
+from fiber.columnar.core import RecordBatch, iter_chunks
+
+__all__ = ["RecordBatch", "iter_chunks"]
@@ -0,0 +1,160 @@
+from typing import Dict, Generator, Iterable, Iterator, List, Mapping, Sequence, TypeVar
+
+import numpy as np
+import numpy.typing as npt
+
+A = TypeVar("A", bound=np.ndarray)
+
+
+def iter_chunks(array: A, chunk_size: int) -> Generator[A, None, None]:
+    """
+    Нарезает массив на куски по chunk_size элементов (по первой оси, последний кусок может быть короче).
+    Куски - представления (view) исходного массива, данные не копируются.
+
+    Предназначен для шагов-источников: вместо yield каждого значения источник выдаёт куски,
+    и каждый кусок проходит векторизованные шаги одной задачей.
+
+    Raises:
+        ValueError: если chunk_size < 1.
+    """
+    if chunk_size < 1:
+        raise ValueError(f"chunk_size должен быть больше 0, а не {chunk_size}.")
+
+    for start in range(0, len(array), chunk_size):
+        yield array[start : start + chunk_size]  # type: ignore[misc]
+
+
+class RecordBatch:
+    """
+    Пачка записей в колоночном виде: именованные одномерные NumPy-массивы одинаковой длины.
+
+    Неизменяема: with_column(), select() и slice() возвращают новую пачку,
+    переиспользуя массивы (без копирования данных).
+
+    Пример:
+        >>> batch = RecordBatch({"id": np.arange(3), "score": np.array([0.1, 0.5, 0.9])})
+        >>> batch.with_column("passed", batch["score"] > 0.3)
+    """
+
+    __slots__ = ("_columns", "_num_rows")
+
+    def __init__(self, columns: Mapping[str, npt.ArrayLike]):
+        """
+        Args:
+            columns: Имя колонки -> одномерный массив (или то, что в него преобразуется через np.asarray).
+
+        Raises:
+            ValueError: если колонка не одномерная или длины колонок различаются.
+        """
+        self._columns: Dict[str, np.ndarray] = {}
+        self._num_rows = 0
+
+        for i, (name, values) in enumerate(columns.items()):
+            array = np.asarray(values)
+            if array.ndim != 1:
+                raise ValueError(
+                    f"Колонка {name!r} должна быть одномерной, а не {array.ndim}-мерной."
+                )
+            if i == 0:
+                self._num_rows = len(array)
+            elif len(array) != self._num_rows:
+                raise ValueError(
+                    f"Длина колонки {name!r} ({len(array)}) не совпадает с длиной пачки ({self._num_rows})."
+                )
+            self._columns[name] = array
+
+    @classmethod
+    def concat(cls, batches: Sequence["RecordBatch"]) -> "RecordBatch":
+        """
+        Склеивает пачки с одинаковыми колонками в одну (данные копируются).
+
+        Raises:
+            ValueError: если список пуст или колонки пачек различаются.
+        """
+        if not batches:
+            raise ValueError("Нельзя склеить пустой список пачек.")
+
+        names = batches[0].column_names
+        for batch in batches[1:]:
+            if batch.column_names != names:
+                raise ValueError(
+                    f"Колонки пачек не совпадают: {names} и {batch.column_names}."
+                )
+
+        return cls(
+            {name: np.concatenate([batch[name] for batch in batches]) for name in names}
+        )
+
+    @property
+    def num_rows(self) -> int:
+        return self._num_rows
+
+    @property
+    def column_names(self) -> List[str]:
+        return list(self._columns)
+
+    @property
+    def schema(self) -> Dict[str, np.dtype]:
+        """
+        Returns:
+            Имя колонки -> dtype.
+        """
+        return {name: array.dtype for name, array in self._columns.items()}
+
+    def column(self, name: str) -> np.ndarray:
+        """
+        Raises:
+            KeyError: если колонки нет.
+        """
+        return self._columns[name]
+
+    def with_column(self, name: str, values: npt.ArrayLike) -> "RecordBatch":
+        """
+        Returns:
+            Новая пачка с добавленной (или заменённой) колонкой.
+        """
+        columns = dict(self._columns)
+        columns[name] = values  # type: ignore[assignment]
+        return RecordBatch(columns)
+
+    def select(self, names: Iterable[str]) -> "RecordBatch":
+        """
+        Returns:
+            Новая пачка только с указанными колонками (в указанном порядке).
+        """
+        return RecordBatch({name: self._columns[name] for name in names})
+
+    def slice(self, start: int, stop: int) -> "RecordBatch":
+        """
+        Returns:
+            Новая пачка из строк [start, stop) - представления исходных колонок.
+        """
+        return RecordBatch(
+            {name: array[start:stop] for name, array in self._columns.items()}
+        )
+
+    def iter_chunks(self, chunk_size: int) -> Generator["RecordBatch", None, None]:
+        """
+        Нарезает пачку на куски по chunk_size строк (см. iter_chunks()).
+        """
+        if chunk_size < 1:
+            raise ValueError(f"chunk_size должен быть больше 0, а не {chunk_size}.")
+
+        for start in range(0, self._num_rows, chunk_size):
+            yield self.slice(start, start + chunk_size)
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        return self.column(name)
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._columns
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._columns)
+
+    def __len__(self) -> int:
+        return self._num_rows
+
+    def __repr__(self) -> str:
+        columns = ", ".join(f"{name}: {dtype}" for name, dtype in self.schema.items())
+        return f"RecordBatch({self._num_rows} строк; {columns})"
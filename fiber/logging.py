@@ -1,7 +1,71 @@
+import atexit
 import logging
+import os
+import queue
+from functools import lru_cache
+from logging.handlers import QueueHandler, QueueListener
+from typing import Optional
 
+from colorama import Fore, Style, init
 
 _main_logger = None
+_listener: Optional[QueueListener] = None
+
+
+class ColoredFormatter(logging.Formatter):
+    """
+    Раскрашивает уровень и сообщение записи.
+
+    Запись не изменяется (имя, уровень и сообщение подставляются в строку напрямую),
+    поэтому одну запись можно отдать нескольким обработчикам.
+    """
+
+    COLOR_MAP = {
+        logging.DEBUG: Fore.CYAN,
+        logging.INFO: Fore.GREEN,
+        logging.WARNING: Fore.YELLOW,
+        logging.ERROR: Fore.RED,
+        logging.CRITICAL: Fore.RED + Style.BRIGHT,
+        logging.FATAL: Fore.RED + Style.DIM,
+    }
+
+    def __init__(self, datefmt: Optional[str] = "%H:%M:%S"):
+        super().__init__(datefmt=datefmt)
+
+    def format(self, record: logging.LogRecord) -> str:
+        color = self.COLOR_MAP.get(record.levelno, "")
+        reset = Style.RESET_ALL if color else ""
+
+        line = (
+            f"[{_upper(record.name)}] {self.formatTime(record, self.datefmt)} | "
+            f"{color}{record.levelname}{reset} | {color}{record.getMessage()}{reset}"
+        )
+
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            line = f"{line}\n{record.exc_text}"
+        if record.stack_info:
+            line = f"{line}\n{self.formatStack(record.stack_info)}"
+        return line
+
+
+@lru_cache(maxsize=None)
+def _upper(name: str) -> str:
+    return name.upper()
+
+
+class _DeferredQueueHandler(QueueHandler):
+    """
+    QueueHandler, который откладывает всё оформление записи (цвет, время, traceback) в поток записи.
+    В вызывающем потоке собирается только текст сообщения: данные шага могут измениться к моменту записи.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # запись создана этим вызовом логгера и никуда больше не попадает (обработчик у логгера один)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
 
 
 def get_main_logger() -> logging.Logger:
@@ -18,41 +82,61 @@ def get_main_logger() -> logging.Logger:
         logger.setLevel(logging.DEBUG)
         logger.propagate = False
 
-        from colorama import Fore, Style, init
-
-        class ColoredFormatter(logging.Formatter):
-            COLOR_MAP = {
-                logging.DEBUG: Fore.CYAN,
-                logging.INFO: Fore.GREEN,
-                logging.WARNING: Fore.YELLOW,
-                logging.ERROR: Fore.RED,
-                logging.CRITICAL: Fore.RED + Style.BRIGHT,
-                logging.FATAL: Fore.RED + Style.DIM,
-            }
-
-            def format(self, record: logging.LogRecord):
-                color = self.COLOR_MAP.get(record.levelno, "")
-                record.name = record.name.upper()
-                record.levelname = f"{color}{record.levelname}{Style.RESET_ALL}"
-                record.msg = f"{color}{record.getMessage()}{Style.RESET_ALL}"
-                return super().format(record)
-
         init(autoreset=True)
-
-        hdlr = logging.StreamHandler()
-
-        formatter = ColoredFormatter(
-            fmt="[%(name)s] %(asctime)s | %(levelname)s | %(message)s",
-            datefmt="%H:%M:%S",
-        )
-        hdlr.setFormatter(formatter)
-        logger.addHandler(hdlr)
+        logger.addHandler(_create_stream_handler())
 
         _main_logger = logger
 
     return _main_logger
 
 
+def configure_logging(
+    level: int = logging.DEBUG, background: bool = False
+) -> logging.Logger:
+    """
+    Настраивает логгер приложения.
+
+    Args:
+        level: Уровень логгера приложения. Для production рекомендуется logging.WARNING:
+            записи шагов и воркеров на уровнях DEBUG/INFO тогда отсекаются одной проверкой уровня.
+        background: Писать записи в фоновом потоке: вызов логгера только кладёт запись в очередь,
+            а оформление и вывод (под блокировкой обработчика) выполняет отдельный поток.
+            Оставшиеся в очереди записи дописываются при shutdown_logging() или выходе из программы.
+
+    Returns:
+        Логгер приложения.
+    """
+    global _listener
+
+    logger = get_main_logger()
+    logger.setLevel(level)
+
+    shutdown_logging()
+    for hdlr in list(logger.handlers):
+        logger.removeHandler(hdlr)
+
+    if background:
+        records: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+        _listener = QueueListener(records, _create_stream_handler())
+        _listener.start()
+        logger.addHandler(_DeferredQueueHandler(records))
+    else:
+        logger.addHandler(_create_stream_handler())
+
+    return logger
+
+
+def shutdown_logging() -> None:
+    """
+    Останавливает фоновый поток записи (если он запущен), дописав все записи из очереди.
+    """
+    global _listener
+
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
 def get_main_step_logger() -> logging.Logger:
     """
     Возвращает:
@@ -67,3 +151,28 @@ def get_kernel_logger() -> logging.Logger:
         Логгер используемый "под капотом" у фремворка.
     """
     return get_main_logger().getChild("kernel")
+
+
+def _create_stream_handler() -> logging.Handler:
+    hdlr = logging.StreamHandler()
+    hdlr.setFormatter(ColoredFormatter())
+    return hdlr
+
+
+def _reset_after_fork() -> None:
+    # поток записи не переживает fork(): дочерний процесс (BACKEND="process") пишет синхронно
+    global _listener
+
+    if _listener is None:
+        return
+
+    _listener = None
+    logger = get_main_logger()
+    for hdlr in list(logger.handlers):
+        logger.removeHandler(hdlr)
+    logger.addHandler(_create_stream_handler())
+
+
+atexit.register(shutdown_logging)
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
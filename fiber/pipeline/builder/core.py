@@ -1,26 +1,191 @@
-from typing import Sequence, Type
+from itertools import chain
+from types import NoneType
+from typing import Any, Iterable, Iterator, List, Optional, Tuple, Union
 
-from fiber.step import Step
 from fiber.logging import get_kernel_logger
-from fiber.pipeline.task import TaskBuilder, TaskBuildError
+from fiber.pipeline.task import Task, TaskBuilder, TaskBuildError, TaskRuntimeError
+from fiber.pipeline.task.plan import ExecutionPlan, PipelineSteps
+from fiber.pipeline.task.utils.datastructs import (
+    Node,
+    count_nodes,
+    get_graph_from,
+    get_sequence_from,
+    iter_nodes,
+    merge_prefixes,
+)
+from fiber.pipeline.runtime.streaming import ResultStream, SinkRegistry
 from fiber.pipeline.runtime.tasks_provider import _HasTasks
+from fiber.step import Step, get_step_types
 from fiber.pipeline.builder.exceptions import PipelineBuildError
 
 
 class PipelineBuilder(_HasTasks):
-    def __init__(self) -> None:
+    def __init__(self, merge_prefixes: bool = False) -> None:
+        """
+        Args:
+            merge_prefixes: Сливать общие начала конвееров в одно дерево (trie): конвееры,
+                начинающиеся с одних и тех же шагов, исполняют общую часть один раз на значение
+                и ветвятся там, где расходятся (см. add_pipeline()). Сливаются только конвееры
+                с одинаковым fuse. Итог слияния пишется в лог при первом запросе задач.
+        """
         self._logger = get_kernel_logger().getChild("builder")
-        self.__tasks_for_provider__ = []
+        self._merge_prefixes = merge_prefixes
+        self._pipelines: List[Tuple[PipelineSteps, bool]] = []
+        self._tasks: List[Task] = []
+        self._merged: Optional[List[Task]] = None
+        self._feeds: List[Tuple[ExecutionPlan, Iterable[Any]]] = []
+        self._results = ResultStream()
+        self._sinks = SinkRegistry(self._results)
 
-    def add_pipeline(self, steps: Sequence[Type[Step]]) -> None:
+    @property
+    def __tasks_for_provider__(self) -> Union[List[Task], Iterator[Task]]:  # type: ignore[override]
+        if not self._merge_prefixes:
+            tasks = self._tasks
+        else:
+            if self._merged is None:
+                self._merged = self._merge()
+            tasks = self._merged
+        if not self._feeds:
+            return tasks
+        if not any(isinstance(inputs, Iterator) for _, inputs in self._feeds):
+            # все входные данные - конечные коллекции: задачи кладутся в очередь сразу
+            return tasks + list(self._iter_fed())
+        # итератор: Runtime подаёт стартовые задачи лениво, по мере освобождения очереди
+        return chain(tasks, self._iter_fed())
+
+    def get_results(self) -> ResultStream:
+        """
+        Returns:
+            Поток результатов конвееров, добавленных со stream=True.
+        """
+        return self._results
+
+    def add_pipeline(
+        self,
+        steps: PipelineSteps,
+        fuse: bool = False,
+        stream: bool = False,
+        ordered: bool = False,
+    ) -> None:
+        """
+        Добавляет конвеер. Конвеер может ветвиться: последним элементом steps может быть список ветвей
+        (см. TaskBuilder.build_from()) - общая часть исполняется один раз на значение.
+
+        Args:
+            stream: Последние шаги (всех ветвей, которые что-то возвращают) отдают значения
+                в поток результатов (см. get_results()), а не обязаны возвращать None.
+            ordered: Значения уходят в поток результатов в порядке исходных данных (см. Step.ordered).
+                Только вместе со stream.
+
+        Raises:
+            ValueError: если ordered задан без stream.
+        """
+        if ordered and not stream:
+            raise ValueError("ordered=True имеет смысл только вместе со stream=True.")
+        if stream:
+            steps = self._stream_to(steps, ordered)
+        task = self._build(steps, fuse)
+        self._pipelines.append((steps, fuse))
+        self._tasks.append(task)
+        self._merged = None
+
+    def feed(
+        self,
+        steps: PipelineSteps,
+        inputs: Iterable[Any],
+        fuse: bool = False,
+        stream: bool = False,
+        ordered: bool = False,
+    ) -> None:
+        """
+        Добавляет конвеер с входными данными: первый шаг получает каждое значение inputs
+        (и может принимать не только None). Цепочка проверяется и компилируется один раз.
+        Если inputs - итератор (например генератор или открытый файл), стартовые задачи создаются лениво -
+        по одной на значение, по мере освобождения очереди, поэтому он может быть любой длины;
+        задачи по коллекциям (list, set ...) создаются сразу.
+
+        Конвееры с входными данными не сливаются с другими (см. merge_prefixes).
+        stream и ordered - как в add_pipeline().
+        """
+        if ordered and not stream:
+            raise ValueError("ordered=True имеет смысл только вместе со stream=True.")
+        if stream:
+            steps = self._stream_to(steps, ordered)
+        plan = self._build_plan(steps, fuse)
+        self._feeds.append((plan, inputs))
+
+    def _iter_fed(self) -> Iterator[Task]:
+        for plan, inputs in self._feeds:
+            for payload in inputs:
+                try:
+                    yield Task(plan, payload)
+                except TaskRuntimeError:
+                    # значение не подошло первому шагу, ошибка уже записана в лог шага
+                    pass
+
+    def _stream_to(self, steps: PipelineSteps, ordered: bool) -> PipelineSteps:
+        """
+        Дописывает шаг-приёмник потока результатов за каждым последним шагом, который что-то возвращает.
+        """
+        try:
+            head = get_graph_from(steps)
+        except ValueError:
+            # некорректную цепочку разберёт проверка при сборке
+            return steps
+        for node in list(iter_nodes(head)):
+            if node.next or not (
+                isinstance(node.item, type) and issubclass(node.item, Step)
+            ):
+                continue
+            _, out_t = get_step_types(node.item)
+            if out_t is not NoneType:
+                node.next.append(Node(self._sinks.get(out_t, ordered)))
+        return get_sequence_from(head)
+
+    def _build_plan(self, steps: PipelineSteps, fuse: bool) -> ExecutionPlan:
         try:
-            task = TaskBuilder.build_from(
+            return TaskBuilder.build_plan(
                 steps,
                 strict_building_types=True,
                 strict_runtime_types=False,
+                fuse=fuse,
+                with_input=True,
             )
         except TaskBuildError as e:
             self._logger.fatal(e, exc_info=True)
             raise PipelineBuildError(f"Ошибка сборки конвеера: {e}") from e
 
-        self.__tasks_for_provider__.append(task)
+    def _build(self, steps: PipelineSteps, fuse: bool) -> Task:
+        try:
+            return TaskBuilder.build_from(
+                steps,
+                strict_building_types=True,
+                strict_runtime_types=False,
+                fuse=fuse,
+            )
+        except TaskBuildError as e:
+            self._logger.fatal(e, exc_info=True)
+            raise PipelineBuildError(f"Ошибка сборки конвеера: {e}") from e
+
+    def _merge(self) -> List[Task]:
+        """
+        Сливает общие начала добавленных конвееров (отдельно для fuse=False и fuse=True).
+        """
+        tasks = []
+        before = after = 0
+        for fuse in (False, True):
+            heads = [
+                get_graph_from(steps)
+                for steps, pipeline_fuse in self._pipelines
+                if pipeline_fuse == fuse
+            ]
+            roots = merge_prefixes(heads)
+            before += count_nodes(heads)
+            after += count_nodes(roots)
+            tasks.extend(self._build(get_sequence_from(root), fuse) for root in roots)
+
+        self._logger.info(
+            f"Слияние общих начал: конвееров {len(self._pipelines)} -> {len(tasks)}, "
+            f"вызовов шагов на значение {before} -> {after} (убрано повторов: {before - after})."
+        )
+        return tasks
@@ -1,5 +1,37 @@
 from fiber.pipeline.runtime.core import Runtime
+from fiber.pipeline.runtime.aio import AsyncRuntime
 from fiber.pipeline.runtime.config import RuntimeConfig
+from fiber.pipeline.runtime.metrics import (
+    LatencySnapshot,
+    MetricsSnapshot,
+    StepSnapshot,
+)
+from fiber.pipeline.runtime.profiling import ProfileSummary, StepProfile
+from fiber.pipeline.runtime.scheduling import (
+    SchedulingPolicy,
+    FifoPolicy,
+    LifoPolicy,
+    DepthPriorityPolicy,
+)
+from fiber.pipeline.runtime.service import PersistentRuntime
+from fiber.pipeline.runtime.streaming import ResultStream
 from fiber.pipeline.runtime.tasks_provider import TaskProvider, ITaskProvider
 
-__all__ = ["Runtime", "RuntimeConfig", "TaskProvider", "ITaskProvider"]
+__all__ = [
+    "Runtime",
+    "AsyncRuntime",
+    "PersistentRuntime",
+    "RuntimeConfig",
+    "MetricsSnapshot",
+    "StepSnapshot",
+    "LatencySnapshot",
+    "ProfileSummary",
+    "StepProfile",
+    "TaskProvider",
+    "ITaskProvider",
+    "ResultStream",
+    "SchedulingPolicy",
+    "FifoPolicy",
+    "LifoPolicy",
+    "DepthPriorityPolicy",
+]
@@ -0,0 +1,375 @@
+from threading import Event, Lock, Thread
+from time import perf_counter
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Hashable,
+    Iterable,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+from fiber.logging import get_kernel_logger
+from fiber.pipeline.task import ExecutionPlan, Task, TaskRuntimeError
+from fiber.step import CountWindow, SlidingWindow, TumblingWindow
+
+# как часто поток закрытия окон просыпается, если шагов с окнами по времени ещё не было
+_IDLE_INTERVAL = 0.05
+
+# шаг-агрегат: (план, индекс шага)
+_Slot = Tuple[ExecutionPlan, int]
+# ключ -> состояние
+_States = Dict[Hashable, Any]
+_TimeWindow = Union[TumblingWindow, SlidingWindow]
+
+
+def has_aggregate_steps(tasks: Iterable[Task]) -> bool:
+    """
+    Проверяет, есть ли в цепочках задач шаги-агрегаты (AggregateStep).
+    """
+    return any(task.get_plan().has_aggregate_steps() for task in tasks)
+
+
+class WorkerAggregates:
+    """
+    Частичные состояния агрегатов одного воркера. Блокировка своя у каждого воркера: кроме него
+    её берёт только поток закрытия окон, поэтому воркеры не ждут друг друга.
+
+    Окна по времени делятся на отрезки длиной window.every: отрезок входит в window.panes окон,
+    и его состояние сливается в каждое из них. Окна по количеству частичных состояний не имеют
+    (см. Aggregator).
+    """
+
+    __slots__ = ("lock", "panes")
+
+    def __init__(self) -> None:
+        self.lock = Lock()
+        # (шаг, номер отрезка) -> состояния ключей
+        self.panes: Dict[Tuple[_Slot, int], _States] = {}
+
+
+class Aggregator:
+    """
+    Стадия агрегации: задачи шагов-агрегатов (AggregateStep) не кладутся в очередь,
+    а их значения складываются в частичные состояния воркера, который их породил (см. WorkerAggregates).
+
+    Окна по времени закрывает собственный поток (см. start()): он сливает состояния всех воркеров
+    (AggregateStep.merge()) и кладёт результаты окна (AggregateStep.finish()) в очередь задачами
+    следующих шагов. Окна по количеству общие для всех воркеров (под блокировкой стадии):
+    окно закрывает воркер, на значении которого оно набралось.
+    """
+
+    def __init__(
+        self,
+        put: Callable[[List[Task]], None],
+        on_absorb: Optional[Callable[[int], None]] = None,
+    ):
+        """
+        Args:
+            put: Кладёт задачи результатов закрытых окон в очередь.
+            on_absorb: Вызывается воркером с количеством забранных задач за вычетом задач результатов
+                (например для учёта мест жёсткого предела: забранные задачи места в очереди не занимают).
+        """
+        self._logger = get_kernel_logger().getChild("aggregator")
+        self._put = put
+        self._on_absorb = on_absorb
+        self._origin = perf_counter()
+        self._lock = Lock()
+        self._partials: List[WorkerAggregates] = []
+        # шаги с окнами по времени, слитые состояния их отрезков и номер первого незакрытого окна
+        self._windows: Dict[_Slot, _TimeWindow] = {}
+        self._panes: Dict[_Slot, Dict[int, _States]] = {}
+        self._next: Dict[_Slot, int] = {}
+        # шаг -> ключ -> [состояние, значений в окне] (окна по количеству)
+        self._counts: Dict[_Slot, Dict[Hashable, List[Any]]] = {}
+        self._flushes = 0
+        self._stopped = Event()
+        self._wakeup = Event()
+        self._thread: Optional[Thread] = None
+
+    def create_partial(self) -> WorkerAggregates:
+        """
+        Returns:
+            Частичные состояния нового воркера.
+        """
+        partial = WorkerAggregates()
+        with self._lock:
+            self._partials.append(partial)
+        return partial
+
+    def absorb(self, tasks: Sequence[Task], partial: WorkerAggregates) -> List[Task]:
+        """
+        Забирает задачи шагов-агрегатов: их значения добавляются в частичные состояния воркера.
+
+        Returns:
+            Остальные задачи и задачи результатов окон по количеству, закрывшихся на этих значениях
+            (их нужно положить в очередь как обычно).
+        """
+        rest: List[Task] = []
+        absorbed = 0
+        for task in tasks:
+            plan, index = task.get_plan(), task.get_index()
+            if not plan[index].is_aggregate:
+                rest.append(task)
+                continue
+
+            absorbed += 1
+            closed = self._add(partial, plan, index, task.get_payload())
+            if closed is not None:
+                emitted = self._emit(plan, index, *closed)
+                absorbed -= len(emitted)
+                rest.extend(emitted)
+
+        if absorbed and self._on_absorb is not None:
+            self._on_absorb(absorbed)
+        return rest
+
+    def get_flushes(self) -> int:
+        """
+        Returns:
+            Сколько раз результаты окон уходили в очередь (меняется при каждой отправке).
+        """
+        return self._flushes
+
+    def settle(self, flushes: int) -> bool:
+        """
+        Вызывается Runtime-ом после того, как очередь опустела. Закрывает все открытые окна.
+
+        Args:
+            flushes: get_flushes() до ожидания очереди.
+
+        Returns:
+            True - очередь действительно пуста, и результатов больше не будет (поток закрытия окон остановлен);
+            False - в очередь ушли новые задачи, её нужно дождаться ещё раз.
+        """
+        with self._lock:
+            self._collect(None)
+            tasks = []
+            for slot in list(self._panes):
+                tasks.extend(self._close(slot, None))
+            for (plan, index), states in self._counts.items():
+                for key, (state, _) in states.items():
+                    tasks.extend(self._emit(plan, index, key, state))
+            self._counts.clear()
+
+            if tasks:
+                self._send(tasks)
+                return False
+
+            if self._flushes != flushes:
+                return False
+
+            self._stopped.set()
+            self._wakeup.set()
+            return True
+
+    def start(self) -> None:
+        self._thread = Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stopped.set()
+        self._wakeup.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def _add(
+        self, partial: WorkerAggregates, plan: ExecutionPlan, index: int, data: Any
+    ) -> Optional[Tuple[Hashable, Any]]:
+        """
+        Добавляет значение в состояние его окна (частичное состояние воркера для окон по времени).
+
+        Returns:
+            Ключ и состояние окна по количеству, если на этом значении оно набралось (иначе None).
+        """
+        slot = plan[index]
+        step = slot.step
+        window = step.window
+        try:
+            key = step.key(data)
+            if isinstance(window, CountWindow):
+                with self._lock:
+                    states = self._counts.setdefault((plan, index), {})
+                    entry = states.get(key)
+                    if entry is None:
+                        entry = states[key] = [step.create(), 0]
+                    entry[0] = step.add(entry[0], data)
+                    entry[1] += 1
+                    if entry[1] < window.count:
+                        return None
+                    del states[key]
+                return key, entry[0]
+
+            if (plan, index) not in self._windows:
+                # регистрация - до записи в отрезок (и не под блокировкой воркера: её берут после self._lock)
+                with self._lock:
+                    self._windows.setdefault((plan, index), window)
+                    self._wakeup.set()
+            with partial.lock:
+                # время - под блокировкой: иначе значение может попасть в отрезок, который уже забран
+                pane = self._pane_of(window, perf_counter())
+                states = partial.panes.setdefault(((plan, index), pane), {})
+                states[key] = step.add(
+                    states[key] if key in states else step.create(), data
+                )
+        except Exception as e:
+            slot.logger.fatal(f"{e}", exc_info=True)
+        return None
+
+    def _emit(
+        self, plan: ExecutionPlan, index: int, key: Hashable, state: Any
+    ) -> List[Task]:
+        """
+        Returns:
+            Задачи следующих шагов с результатом окна ключа (пусто, если агрегат последний или результат отброшен).
+        """
+        slot = plan[index]
+        try:
+            result = slot.step.finish(key, state)
+        except Exception as e:
+            slot.logger.fatal(f"{e}", exc_info=True)
+            return []
+
+        if slot.check_output is not None and not slot.check_output(result):
+            slot.logger.critical(
+                f"{slot.out_t} - ожидаемый тип выходных данных. Не совпал с типом полученных данных - {type(result)}"
+            )
+            return []
+
+        tasks = []
+        for next_index in slot.next:
+            try:
+                tasks.append(Task(plan, result, next_index))
+            except TaskRuntimeError:
+                # ошибка типов уже записана в лог шага
+                pass
+        return tasks
+
+    def _collect(self, currents: Optional[Dict[_Slot, int]]) -> None:
+        """
+        Забирает у воркеров состояния отрезков, в которые значения больше не попадут,
+        и сливает их (вызывается под self._lock).
+
+        Args:
+            currents: Шаг -> номер текущего отрезка (забираются отрезки до него). None - забрать все.
+        """
+        for partial in self._partials:
+            with partial.lock:
+                taken = [
+                    (pane_key, partial.panes.pop(pane_key))
+                    for pane_key in list(partial.panes)
+                    if currents is None or pane_key[1] < currents[pane_key[0]]
+                ]
+            for (slot, pane), states in taken:
+                panes = self._panes.setdefault(slot, {})
+                merged = panes.get(pane)
+                if merged is None:
+                    panes[pane] = states
+                else:
+                    self._merge(slot, merged, states)
+
+    def _close(self, slot: _Slot, upto: Optional[int]) -> List[Task]:
+        """
+        Закрывает окна шага, закончившиеся до отрезка upto (вызывается под self._lock).
+
+        Args:
+            upto: Номер текущего отрезка. None - закрыть все окна (конец потока).
+
+        Returns:
+            Задачи с результатами закрытых окон.
+        """
+        panes = self._panes.get(slot)
+        if not panes:
+            return []
+
+        plan, index = slot
+        step = plan[index].step
+        size = step.window.panes
+        first = self._next.get(slot)
+        # окно k состоит из отрезков k - size + 1 ... k
+        windows = sorted(
+            {
+                k
+                for pane in panes
+                for k in range(pane, pane + size)
+                if (first is None or k >= first) and (upto is None or k < upto)
+            }
+        )
+
+        tasks = []
+        for k in windows:
+            states: _States = {}
+            try:
+                for pane in range(k - size + 1, k + 1):
+                    for key, state in panes.get(pane, {}).items():
+                        if key not in states:
+                            states[key] = step.create()
+                        states[key] = step.merge(states[key], state)
+            except Exception as e:
+                step.logger.fatal(f"{e}", exc_info=True)
+                continue
+            for key, state in states.items():
+                tasks.extend(self._emit(plan, index, key, state))
+        if windows:
+            self._logger.debug("Закрыто окон шага %s: %s.", step.__name__, len(windows))
+
+        if upto is None:
+            del self._panes[slot]
+            self._next.pop(slot, None)
+        else:
+            self._next[slot] = upto
+            for pane in [pane for pane in panes if pane <= upto - size]:
+                del panes[pane]
+        return tasks
+
+    def _merge(self, slot: _Slot, into: _States, states: _States) -> None:
+        plan, index = slot
+        step = plan[index].step
+        try:
+            for key, state in states.items():
+                into[key] = step.merge(into[key], state) if key in into else state
+        except Exception as e:
+            step.logger.fatal(f"{e}", exc_info=True)
+
+    def _send(self, tasks: List[Task]) -> None:
+        # вызывается под self._lock: иначе Runtime может не увидеть задачи ни в очереди, ни здесь
+        self._put(tasks)
+        self._flushes += 1
+
+    def _pane_of(self, window: _TimeWindow, now: float) -> int:
+        return int((now - self._origin) // window.every)
+
+    def _close_due(self) -> Optional[float]:
+        """
+        Закрывает окна по времени, которые уже закончились.
+
+        Returns:
+            Через сколько секунд закончится ближайшее из открытых окон (None - шагов с окнами по времени ещё не было).
+        """
+        now = perf_counter()
+        nearest = None
+        with self._lock:
+            currents = {
+                slot: self._pane_of(window, now)
+                for slot, window in self._windows.items()
+            }
+            self._collect(currents)
+            tasks = []
+            for slot, current in currents.items():
+                tasks.extend(self._close(slot, current))
+                deadline = self._origin + (current + 1) * self._windows[slot].every
+                if nearest is None or deadline < nearest:
+                    nearest = deadline
+            if tasks:
+                self._send(tasks)
+        return None if nearest is None else max(0.0, nearest - perf_counter())
+
+    def _run(self) -> None:
+        while not self._stopped.is_set():
+            wait = self._close_due()
+            self._wakeup.wait(_IDLE_INTERVAL if wait is None else wait)
+            self._wakeup.clear()
@@ -0,0 +1,187 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import AsyncIterable, Callable, Optional, TypeVar
+
+from fiber.logging import get_kernel_logger
+from fiber.pipeline.runtime.deque.aio import AsyncDequeEnviroment
+from fiber.pipeline.runtime.worker import AsyncTaskWorker
+from fiber.pipeline.runtime.config import RuntimeConfig
+from fiber.pipeline.runtime.metrics import MetricsSnapshot, RuntimeMetrics
+from fiber.pipeline.runtime.seeding import Seeds, is_lazy
+from fiber.pipeline.runtime.tracing import Tracer
+from fiber.pipeline.task import Task
+from fiber.pipeline.runtime.scheduling import FifoPolicy
+from fiber.pipeline.runtime.tasks_provider import ITaskProvider
+
+T = TypeVar("T")
+
+
+class AsyncRuntime:
+    """
+    Исполняющее ядро на одном event loop-е. Предназначено для шагов, которые в основном ждут ввода-вывода:
+    вместо потока на каждый Task - CONCURRENCY корутин-обработчиков.
+
+    Шаги с `async def start()` исполняются прямо в event loop-е,
+    синхронные - в пуле из WORKERS потоков, поэтому смешанные цепочки тоже работают.
+    """
+
+    def __init__(self, tasks_provider: ITaskProvider, config: RuntimeConfig):
+        """
+        Args:
+            tasks_provider: Поставщик стартовых Task-ов.
+            config: Объект конфигурации (см. подробнее в его доках).
+
+        Raises:
+            ValueError: если в конфигурации задана политика планирования, отличная от FifoPolicy,
+                или в цепочках есть шаги-агрегаты (AggregateStep).
+        """
+        self._logger = get_kernel_logger().getChild("dispatcher")
+        self._config = config
+
+        if not isinstance(self._config.SCHEDULING, FifoPolicy):
+            raise ValueError("AsyncRuntime поддерживает только FifoPolicy.")
+        self._deque_environ = AsyncDequeEnviroment(
+            deque_limit=self._config.TASK_LIMIT,
+            max_tasks_per_iter=self._config.TASKS_PER_ITER,
+            strict_limit=self._config.STRICT_TASK_LIMIT,
+        )
+
+        tasks = tasks_provider.get_tasks()
+        # итератор задач подаётся лениво во время run() (см. Runtime)
+        self._lazy: Optional[Seeds] = tasks if is_lazy(tasks) else None
+        if self._lazy is None:
+            for task in tasks:  # type: ignore[union-attr]
+                self._deque_environ.seed(self._prepare_seed(task))
+
+        self._metrics = RuntimeMetrics() if self._config.METRICS else None
+        self._tracer: Optional[Tracer] = None
+        if self._config.TRACE_FILE is not None:
+            self._tracer = Tracer(
+                self._config.TRACE_FILE, self._config.TRACE_SAMPLE_RATIO
+            )
+        self._workers = 0
+
+        self._logger.debug("Создан AsyncDispatcher.")
+
+    async def run(self) -> None:
+        """
+        Запускает обработку шагов в текущем event loop-е.
+        """
+        loop = asyncio.get_running_loop()
+
+        with ThreadPoolExecutor(max_workers=self._config.WORKERS) as executor:
+
+            def offload(callable: Callable[[], T]) -> "asyncio.Future[T]":
+                return loop.run_in_executor(executor, callable)
+
+            self._logger.info("Создание Worker-ов...")
+            workers = [
+                asyncio.create_task(
+                    AsyncTaskWorker(
+                        self._deque_environ,
+                        offload,
+                        metrics=(
+                            self._metrics.create_recorder()
+                            if self._metrics is not None
+                            else None
+                        ),
+                        tracer=self._tracer,
+                    ).run()
+                )
+                for _ in range(self._config.CONCURRENCY)
+            ]
+            self._workers = len(workers)
+            self._logger.debug("Все воркеры успешно созданы и запущены.")
+
+            deque = self._deque_environ.get_deque()
+            feeder = (
+                asyncio.create_task(self._feed(self._lazy))
+                if self._lazy is not None
+                else None
+            )
+            if feeder is not None:
+                # очередь может опустеть раньше, чем поставщик выдаст все задачи
+                await asyncio.wait([feeder])
+            await deque.join()
+            self._logger.info("Все Task-и выполнены. Очередь пуста.")
+
+            self._logger.info("Остановка Worker-ов...")
+            for _ in range(len(workers)):
+                deque.put(None)
+
+            await asyncio.gather(*workers)
+            self._workers = 0
+            self._logger.info("Worker-ы остановлены.")
+
+        if self._tracer is not None:
+            self._tracer.close()
+            self._logger.info(f"Записано span-ов: {self._tracer.get_written()}.")
+
+        if self._config.STRICT_TASK_LIMIT:
+            self._logger.info(
+                f"Ожидание места в очереди: {self.get_full_wait_time():.3f} с."
+            )
+
+        if feeder is not None and feeder.exception() is not None:
+            raise feeder.exception()  # type: ignore[misc]
+
+    async def _feed(self, tasks: Seeds) -> None:
+        """
+        Лениво подаёт стартовые задачи: следующая берётся у поставщика, только когда в очереди есть место.
+        Синхронный итератор исполняется прямо в event loop-е, поэтому медленному поставщику
+        лучше быть асинхронным итератором.
+        """
+        seeded = 0
+        try:
+            if isinstance(tasks, AsyncIterable):
+                async for task in tasks:
+                    await self._feed_one(task)
+                    seeded += 1
+            else:
+                for task in tasks:
+                    await self._feed_one(task)
+                    seeded += 1
+        except Exception as e:
+            self._logger.fatal(f"Подача стартовых задач прервана: {e}", exc_info=True)
+            raise
+        finally:
+            self._logger.info(f"Подано стартовых задач: {seeded}.")
+
+    async def _feed_one(self, task: Task) -> None:
+        await self._deque_environ.aseed_when_room(self._prepare_seed(task))
+
+    def _prepare_seed(self, task: Task) -> Task:
+        """
+        Raises:
+            ValueError: если в цепочке задачи есть шаги-агрегаты (AggregateStep) или шаги с Step.ordered.
+        """
+        plan = task.get_plan()
+        if plan.has_aggregate_steps():
+            raise ValueError(
+                "AsyncRuntime не поддерживает шаги-агрегаты (AggregateStep)."
+            )
+        if plan.has_ordered_steps():
+            raise ValueError("AsyncRuntime не поддерживает шаги с Step.ordered.")
+        if self._config.TASK_FREE_LIST:
+            plan.enable_recycling(self._config.TASK_FREE_LIST)
+        return task
+
+    def get_metrics(self) -> MetricsSnapshot:
+        """
+        Returns:
+            Снимок метрик (можно запрашивать и во время исполнения). Метрики шагов - только с RuntimeConfig.METRICS.
+        """
+        metrics = self._metrics or RuntimeMetrics()
+        return metrics.snapshot(
+            queue_size=len(self._deque_environ.get_deque()),
+            generation_limit=self._deque_environ.get_generation_limit(),
+            workers=self._workers,
+            full_wait_time=self.get_full_wait_time(),
+        )
+
+    def get_full_wait_time(self) -> float:
+        """
+        Returns:
+            Суммарное время ожидания места в заполненной очереди (см. RuntimeConfig.STRICT_TASK_LIMIT).
+        """
+        return self._deque_environ.get_full_wait_time()
@@ -0,0 +1,188 @@
+import os
+import sys
+from threading import Event, Lock, Thread
+from time import perf_counter
+from typing import Callable, Optional, Tuple
+
+from fiber.logging import get_kernel_logger
+
+# доля времени, которую воркеры заняты шагами: выше - воркеров не хватает, ниже - они простаивают
+_BUSY_RATIO = 0.75
+_IDLE_RATIO = 0.25
+# доля времени шага, проведённая не на CPU (I/O, sleep, ожидание ответа) - потоки помогут
+_BLOCKING_RATIO = 0.5
+# доля доступных ядер, при которой CPU считается насыщенным - новые потоки только мешают друг другу
+_SATURATION = 0.9
+
+
+def _cpu_capacity() -> int:
+    """
+    Сколько ядер могут одновременно исполнять Python-код потоков (1 при GIL).
+    """
+    is_gil_enabled = getattr(sys, "_is_gil_enabled", None)
+    if is_gil_enabled is None or is_gil_enabled():
+        return 1
+    return os.cpu_count() or 1
+
+
+class WorkerStats:
+    """
+    Общий для воркеров-потоков счётчик времени исполнения шагов.
+    """
+
+    def __init__(self):
+        self._lock = Lock()
+        self._busy = 0.0
+        self._cpu = 0.0
+
+    def record(self, wall: float, cpu: float) -> None:
+        """
+        Учитывает один ход воркера.
+
+        Args:
+            wall: Сколько времени (по часам) воркер исполнял шаги.
+            cpu: Сколько из него поток провёл на CPU (time.thread_time()).
+        """
+        with self._lock:
+            self._busy += wall
+            self._cpu += cpu
+
+    def collect(self) -> Tuple[float, float]:
+        """
+        Returns:
+            Время исполнения шагов и CPU-время с прошлого вызова (счётчики обнуляются).
+        """
+        with self._lock:
+            busy, cpu = self._busy, self._cpu
+            self._busy = self._cpu = 0.0
+        return busy, cpu
+
+
+class Autoscaler:
+    """
+    Следит за очередью и воркерами Runtime и раз в интервал добавляет или отправляет на покой один воркер.
+
+    Воркер добавляется, если очередь длиннее числа воркеров, воркеры почти всё время заняты,
+    а шаги большую часть времени блокируются (I/O) при ненасыщенном CPU.
+    Воркер убирается, если воркеры простаивают или CPU насыщен (потоки только конкурируют за GIL).
+    """
+
+    def __init__(
+        self,
+        min_workers: int,
+        max_workers: int,
+        interval: float,
+        stats: WorkerStats,
+        queued: Callable[[], int],
+        spawn: Callable[[], None],
+        retire: Callable[[], None],
+    ):
+        """
+        Args:
+            min_workers, max_workers: Границы количества воркеров.
+            interval: Период (в секундах) между решениями.
+            stats: Счётчик времени исполнения шагов, который пополняют воркеры.
+            queued: Возвращает текущую длину очереди.
+            spawn: Запускает нового воркера.
+            retire: Отправляет сигнал остановки одному воркеру.
+        """
+        self._logger = get_kernel_logger().getChild("autoscaler")
+        self._min_workers = min_workers
+        self._max_workers = max_workers
+        self._interval = interval
+        self._stats = stats
+        self._queued = queued
+        self._spawn = spawn
+        self._retire = retire
+        self._capacity = _cpu_capacity()
+
+        self._lock = Lock()
+        self._stopped = Event()
+        self._thread: Optional[Thread] = None
+        self._workers = 0
+        self._peak_workers = 0
+
+    def start(self, workers: int) -> None:
+        """
+        Запускает наблюдение (workers - сколько воркеров Runtime уже запустил).
+        """
+        self._workers = self._peak_workers = workers
+        self._thread = Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self) -> int:
+        """
+        Останавливает наблюдение. После возврата количество воркеров больше не меняется.
+
+        Returns:
+            Сколько воркеров осталось работать (столько сигналов остановки нужно отправить).
+        """
+        with self._lock:
+            self._stopped.set()
+        if self._thread is not None:
+            self._thread.join()
+        return self._workers
+
+    def get_peak_workers(self) -> int:
+        return self._peak_workers
+
+    def decide(
+        self, workers: int, queued: int, busy: float, cpu: float, elapsed: float
+    ) -> int:
+        """
+        Решение за один интервал.
+
+        Args:
+            workers: Текущее количество воркеров.
+            queued: Длина очереди.
+            busy: Суммарное время исполнения шагов всеми воркерами за интервал.
+            cpu: Суммарное CPU-время воркеров за интервал.
+            elapsed: Длина интервала.
+
+        Returns:
+            1 - добавить воркера, -1 - убрать, 0 - оставить как есть.
+        """
+        if elapsed <= 0 or workers <= 0:
+            return 0
+
+        utilization = busy / (elapsed * workers)
+        blocking = (busy - cpu) / busy if busy > 0 else 0.0
+        saturated = cpu / elapsed >= _SATURATION * self._capacity
+
+        if (
+            workers < self._max_workers
+            and queued > workers
+            and utilization >= _BUSY_RATIO
+            and blocking >= _BLOCKING_RATIO
+            and not saturated
+        ):
+            return 1
+
+        if workers > self._min_workers and (utilization < _IDLE_RATIO or saturated):
+            return -1
+
+        return 0
+
+    def _run(self) -> None:
+        last = perf_counter()
+        while not self._stopped.wait(self._interval):
+            now = perf_counter()
+            busy, cpu = self._stats.collect()
+
+            with self._lock:
+                if self._stopped.is_set():
+                    break
+
+                decision = self.decide(
+                    self._workers, self._queued(), busy, cpu, now - last
+                )
+                if decision > 0:
+                    self._spawn()
+                    self._workers += 1
+                    self._peak_workers = max(self._peak_workers, self._workers)
+                    self._logger.debug("Добавлен Worker. Всего: %s.", self._workers)
+                elif decision < 0:
+                    self._retire()
+                    self._workers -= 1
+                    self._logger.debug("Убран Worker. Всего: %s.", self._workers)
+            last = now
@@ -0,0 +1,148 @@
+from threading import Event, Lock, Thread
+from time import perf_counter
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from fiber.logging import get_kernel_logger
+from fiber.pipeline.task import BatchTask, Task
+
+# как часто поток сброса просыпается, если ни одна пачка не копится
+_IDLE_INTERVAL = 0.05
+
+
+def has_batch_steps(tasks: Iterable[Task]) -> bool:
+    """
+    Проверяет, есть ли в цепочках задач шаги с start_batch().
+    """
+    return any(task.get_plan().has_batch_steps() for task in tasks)
+
+
+class Batcher:
+    """
+    Стадия пакетной обработки: задачи шагов с start_batch() не кладутся в очередь по одной,
+    а копятся по шагам плана и уходят в очередь одним BatchTask, когда пачка наберёт
+    Step.max_batch_size задач или первая задача в ней прождёт Step.max_batch_delay секунд.
+
+    Сбросы по времени делает собственный поток (см. start()).
+    """
+
+    def __init__(
+        self,
+        put: Callable[[BatchTask], None],
+        on_flush: Optional[Callable[[int], None]] = None,
+    ):
+        """
+        Args:
+            put: Кладёт готовую пачку в очередь.
+            on_flush: Вызывается с размером пачки при каждом сбросе (например для учёта мест жёсткого предела).
+        """
+        self._logger = get_kernel_logger().getChild("batcher")
+        self._put = put
+        self._on_flush = on_flush
+        self._lock = Lock()
+        # (id плана, индекс шага) -> (время первой задачи, задачи)
+        self._batches: Dict[Tuple[int, int], Tuple[float, List[Task]]] = {}
+        self._flushes = 0
+        self._stopped = Event()
+        self._wakeup = Event()
+        self._thread: Optional[Thread] = None
+
+    def absorb(self, tasks: Sequence[Task]) -> List[Task]:
+        """
+        Забирает в пачки задачи шагов с start_batch().
+
+        Returns:
+            Остальные задачи (их нужно положить в очередь как обычно).
+        """
+        rest = []
+        for task in tasks:
+            if task.get_plan()[task.get_index()].is_batch:
+                self._add(task)
+            else:
+                rest.append(task)
+        return rest
+
+    def get_flushes(self) -> int:
+        """
+        Returns:
+            Сколько пачек ушло в очередь (меняется при каждом сбросе).
+        """
+        return self._flushes
+
+    def settle(self, flushes: int) -> bool:
+        """
+        Вызывается Runtime-ом после того, как очередь опустела. Отправляет в очередь все недобранные пачки.
+
+        Args:
+            flushes: get_flushes() до ожидания очереди.
+
+        Returns:
+            True - очередь действительно пуста, и пачек больше не будет (поток сброса остановлен);
+            False - в очередь ушли новые пачки, её нужно дождаться ещё раз.
+        """
+        with self._lock:
+            if self._batches:
+                for key in list(self._batches):
+                    self._flush(key)
+                return False
+
+            if self._flushes != flushes:
+                return False
+
+            self._stopped.set()
+            self._wakeup.set()
+            return True
+
+    def start(self) -> None:
+        self._thread = Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stopped.set()
+        self._wakeup.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def _add(self, task: Task) -> None:
+        step = task.get_step()
+        key = (id(task.get_plan()), task.get_index())
+        with self._lock:
+            batch = self._batches.get(key)
+            if batch is None:
+                batch = self._batches[key] = (perf_counter(), [])
+                self._wakeup.set()
+            batch[1].append(task)
+            if len(batch[1]) >= step.max_batch_size:
+                self._flush(key)
+
+    def _flush(self, key: Tuple[int, int]) -> None:
+        # вызывается под self._lock: иначе Runtime может не увидеть пачку ни в очереди, ни здесь
+        _, tasks = self._batches.pop(key)
+        if self._on_flush is not None:
+            self._on_flush(len(tasks))
+        self._put(BatchTask(tasks))
+        self._flushes += 1
+        self._logger.debug("Пачка из %s задач отправлена в очередь.", len(tasks))
+
+    def _flush_due(self) -> Optional[float]:
+        """
+        Сбрасывает пачки, время ожидания которых истекло.
+
+        Returns:
+            Через сколько секунд истечёт время ближайшей из оставшихся пачек (None - пачек нет).
+        """
+        now = perf_counter()
+        nearest = None
+        with self._lock:
+            for key, (started, tasks) in list(self._batches.items()):
+                deadline = started + tasks[0].get_step().max_batch_delay
+                if deadline <= now:
+                    self._flush(key)
+                elif nearest is None or deadline < nearest:
+                    nearest = deadline
+        return None if nearest is None else nearest - now
+
+    def _run(self) -> None:
+        while not self._stopped.is_set():
+            wait = self._flush_due()
+            self._wakeup.wait(_IDLE_INTERVAL if wait is None else wait)
+            self._wakeup.clear()
@@ -1,4 +1,11 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from typing import Dict, Literal, Optional
+
+from fiber.pipeline.runtime.scheduling import (
+    DepthPriorityPolicy,
+    FifoPolicy,
+    SchedulingPolicy,
+)
 
 
 @dataclass
@@ -10,8 +17,154 @@ class RuntimeConfig:
         TASK_LIMIT: Максимально допустимое количество активных задач.
         WORKERS: Количество обработчиков (потоков). (Если в цепочке не надо ничего параллелить, то рекомендуется поставить 1.
         TASKS_PER_ITER: Максимум генерируемых Worker-ом задач, за одно обращение к очереди.
+        STRICT_TASK_LIMIT: Сделать TASK_LIMIT жёстким пределом задач (в очереди и в работе).
+            Если места нет, генератор шага не продвигается: Task паркуется и возобновляется,
+            когда очередь разгрузится. Время ожидания - Runtime.get_full_wait_time(). Требует TASK_LIMIT >= 2 и не меньше длины цепочки шагов.
+        BACKEND: На чём исполняются обработчики: "thread" - потоки (по умолчанию),
+            "process" - процессы ОС (для CPU-нагруженных шагов, обходит GIL).
+            В режиме "process" шаги должны быть объявлены на уровне модуля, а данные между шагами - сериализуемы (pickle).
+        WORK_STEALING: У каждого воркера-потока своя очередь, порождённые задачи кладутся в неё,
+            а задачи соседей крадутся только при простое. Снимает конкуренцию за общую очередь при большом WORKERS.
+            Только для BACKEND="thread".
+        SCHEDULING: Политика планирования задач: FifoPolicy (по умолчанию, обход в ширину),
+            LifoPolicy (обход в глубину - меньше промежуточных данных в очереди) или DepthPriorityPolicy
+            (первыми исполняются задачи, ближайшие к концу цепочки). Только для BACKEND="thread".
+        MIN_WORKERS, MAX_WORKERS: Границы автомасштабирования. Если задана хотя бы одна, Runtime начинает с WORKERS
+            воркеров и раз в SCALE_INTERVAL секунд добавляет или убирает по одному, глядя на длину очереди,
+            простой воркеров и долю времени, которую шаги проводят в блокировках (I/O). Незаданная граница равна WORKERS.
+            Только для BACKEND="thread" без WORK_STEALING.
+        SCALE_INTERVAL: Период (в секундах) между решениями автомасштабирования.
+        POOLS: Отдельные пулы воркеров-потоков: имя пула -> количество воркеров. Задача исполняется пулом своего шага (Step.pool),
+            шаги без пула или с пулом не из POOLS - общим пулом из WORKERS воркеров. Так медленные I/O-шаги и CPU-шаги
+            исполняются одновременно, а не конкурируют за одних и тех же воркеров.
+            Только для BACKEND="thread" без WORK_STEALING, автомасштабирования и STRICT_TASK_LIMIT
+            (припаркованные задачи общие для всех пулов, а возобновить задачу может только воркер её пула).
+        CONCURRENCY: Количество одновременно исполняемых Task-ов (корутин-обработчиков) в AsyncRuntime.
+            WORKERS в AsyncRuntime задаёт размер пула потоков для синхронных шагов.
+        TASK_FREE_LIST: Сколько завершённых Task каждой цепочки хранить для переиспользования вместо создания новых
+            (снижает нагрузку на аллокатор и сборщик мусора при большом потоке задач). 0 - не переиспользовать.
+            Только для BACKEND="thread".
+        METRICS: Вести счётчики и гистограммы длительностей по шагам (вызовы, значения, ошибки, время в start() / next(),
+            время ожидания в очереди) - см. Runtime.get_metrics(). Только для BACKEND="thread".
+        TRACE_FILE: Файл, в который пишутся трассы значений по шагам (span на каждый вызов шага) в формате OTLP JSON.
+            Каждое значение шага-источника начинает свою трассу (см. Tracer). None - трассировка выключена.
+            Только для BACKEND="thread".
+        TRACE_SAMPLE_RATIO: Доля трассируемых значений шагов-источников (0.0 - 1.0).
+        PROFILE_PATH: Префикс путей файлов профиля: пока идёт Runtime.run(), стеки всех воркеров снимаются
+            каждые PROFILE_INTERVAL секунд и относятся к исполняемому шагу (см. SamplingProfiler).
+            Пишутся <PROFILE_PATH>.collapsed и <PROFILE_PATH>.speedscope.json, сводка по шагам - Runtime.get_profile().
+            None - профилирование выключено. Только для Runtime с BACKEND="thread".
+        PROFILE_INTERVAL: Период (в секундах) снятия стеков.
+        REORDER_LIMIT: Сколько значений может ждать в буфере шага с Step.ordered, пока не придут предыдущие
+            по порядку. Если буфер полон, генераторы, выдающие более поздние значения, не продвигаются
+            (задача возвращается в очередь), пока буфер не разгрузится.
     """
 
     TASK_LIMIT: int
     WORKERS: int
     TASKS_PER_ITER: int
+    STRICT_TASK_LIMIT: bool = False
+    BACKEND: Literal["thread", "process"] = "thread"
+    WORK_STEALING: bool = False
+    SCHEDULING: SchedulingPolicy = field(default_factory=FifoPolicy)
+    MIN_WORKERS: Optional[int] = None
+    MAX_WORKERS: Optional[int] = None
+    SCALE_INTERVAL: float = 0.1
+    POOLS: Dict[str, int] = field(default_factory=dict)
+    CONCURRENCY: int = 1000
+    TASK_FREE_LIST: int = 0
+    METRICS: bool = False
+    TRACE_FILE: Optional[str] = None
+    TRACE_SAMPLE_RATIO: float = 1.0
+    PROFILE_PATH: Optional[str] = None
+    PROFILE_INTERVAL: float = 0.005
+    REORDER_LIMIT: int = 1024
+
+    def __post_init__(self) -> None:
+        if self.BACKEND not in ("thread", "process"):
+            raise ValueError(
+                f'BACKEND должен быть "thread" или "process", а не {self.BACKEND!r}.'
+            )
+
+        if self.STRICT_TASK_LIMIT:
+            if self.BACKEND != "thread":
+                raise ValueError(
+                    'STRICT_TASK_LIMIT поддерживается только с BACKEND="thread".'
+                )
+            if self.TASK_LIMIT < 2:
+                raise ValueError("STRICT_TASK_LIMIT требует TASK_LIMIT >= 2.")
+
+        if self.WORK_STEALING and self.BACKEND != "thread":
+            raise ValueError('WORK_STEALING поддерживается только с BACKEND="thread".')
+
+        if not isinstance(self.SCHEDULING, FifoPolicy) and self.BACKEND != "thread":
+            raise ValueError('SCHEDULING поддерживается только с BACKEND="thread".')
+
+        if self.WORK_STEALING and isinstance(self.SCHEDULING, DepthPriorityPolicy):
+            raise ValueError("WORK_STEALING несовместим с DepthPriorityPolicy.")
+
+        if self.is_autoscaling():
+            if self.BACKEND != "thread" or self.WORK_STEALING:
+                raise ValueError(
+                    'MIN_WORKERS/MAX_WORKERS поддерживаются только с BACKEND="thread" без WORK_STEALING.'
+                )
+            if (
+                not 1
+                <= self.get_min_workers()
+                <= self.WORKERS
+                <= self.get_max_workers()
+            ):
+                raise ValueError(
+                    "Должно выполняться 1 <= MIN_WORKERS <= WORKERS <= MAX_WORKERS."
+                )
+            if self.SCALE_INTERVAL <= 0:
+                raise ValueError("SCALE_INTERVAL должен быть больше 0.")
+
+        if self.POOLS:
+            if self.BACKEND != "thread" or self.WORK_STEALING or self.is_autoscaling():
+                raise ValueError(
+                    'POOLS поддерживаются только с BACKEND="thread" без WORK_STEALING и MIN_WORKERS/MAX_WORKERS.'
+                )
+            if self.STRICT_TASK_LIMIT:
+                raise ValueError("POOLS несовместимы с STRICT_TASK_LIMIT.")
+            for pool, workers in self.POOLS.items():
+                if workers < 1:
+                    raise ValueError(
+                        f"В пуле {pool!r} должен быть хотя бы один воркер, а не {workers}."
+                    )
+
+        if self.TASK_FREE_LIST < 0:
+            raise ValueError(
+                f"TASK_FREE_LIST не может быть отрицательным, а не {self.TASK_FREE_LIST}."
+            )
+        if self.TASK_FREE_LIST and self.BACKEND != "thread":
+            raise ValueError('TASK_FREE_LIST поддерживается только с BACKEND="thread".')
+
+        if self.METRICS and self.BACKEND != "thread":
+            raise ValueError('METRICS поддерживается только с BACKEND="thread".')
+
+        if self.TRACE_FILE is not None and self.BACKEND != "thread":
+            raise ValueError('TRACE_FILE поддерживается только с BACKEND="thread".')
+        if not 0.0 <= self.TRACE_SAMPLE_RATIO <= 1.0:
+            raise ValueError(
+                f"TRACE_SAMPLE_RATIO должен быть от 0.0 до 1.0, а не {self.TRACE_SAMPLE_RATIO}."
+            )
+
+        if self.PROFILE_PATH is not None and self.BACKEND != "thread":
+            raise ValueError('PROFILE_PATH поддерживается только с BACKEND="thread".')
+        if self.PROFILE_INTERVAL <= 0:
+            raise ValueError("PROFILE_INTERVAL должен быть больше 0.")
+
+        if self.REORDER_LIMIT < 1:
+            raise ValueError(
+                f"REORDER_LIMIT должен быть больше 0, а не {self.REORDER_LIMIT}."
+            )
+
+    def is_autoscaling(self) -> bool:
+        return self.MIN_WORKERS is not None or self.MAX_WORKERS is not None
+
+    def get_min_workers(self) -> int:
+        return self.MIN_WORKERS if self.MIN_WORKERS is not None else self.WORKERS
+
+    def get_max_workers(self) -> int:
+        return self.MAX_WORKERS if self.MAX_WORKERS is not None else self.WORKERS
@@ -1,9 +1,24 @@
+import multiprocessing
+from multiprocessing.process import BaseProcess
 from threading import Thread
+from typing import List, Optional, Union
 
 from fiber.logging import get_kernel_logger
+from fiber.pipeline.task import ExecutionPlan, Task, TaskDescriptor
+from fiber.pipeline.runtime.aggregation import Aggregator, has_aggregate_steps
+from fiber.pipeline.runtime.autoscaling import Autoscaler, WorkerStats
+from fiber.pipeline.runtime.batching import Batcher, has_batch_steps
 from fiber.pipeline.runtime.deque.enviroment import DequeEnviroment
-from fiber.pipeline.runtime.worker import TaskWorker
+from fiber.pipeline.runtime.deque.pools import PooledDequeEnviroment
+from fiber.pipeline.runtime.deque.process import ProcessDequeEnviroment
+from fiber.pipeline.runtime.deque.stealing import StealingDequeEnviroment
+from fiber.pipeline.runtime.worker import TaskWorker, run_process_worker
 from fiber.pipeline.runtime.config import RuntimeConfig
+from fiber.pipeline.runtime.metrics import MetricsSnapshot, RuntimeMetrics
+from fiber.pipeline.runtime.ordering import Reorderer, has_ordered_steps
+from fiber.pipeline.runtime.profiling import ProfileSummary, SamplingProfiler
+from fiber.pipeline.runtime.seeding import Seeder, is_lazy
+from fiber.pipeline.runtime.tracing import Tracer
 from fiber.pipeline.runtime.tasks_provider import ITaskProvider
 
 
@@ -20,18 +35,127 @@ class Runtime:
         Args:
             step_puls: Последовательность с последовательностями из шагов.
             config: Объект конфигурации (см. подробнее в его доках).
+
+        Стартовые задачи-коллекция (list, tuple, set ...) кладутся в очередь сразу. Итератор или асинхронный
+        итератор задач подаётся лениво во время run() (см. Seeder): задачи берутся из него, только когда
+        в очереди есть место.
+
+        Raises:
+            TaskDescriptorError: если BACKEND="process", а стартовый Task нельзя передать в процесс.
+            ValueError: если BACKEND="process", а в цепочках есть шаги-агрегаты (AggregateStep) или шаги с Step.ordered;
+                если start_batch() или AggregateStep стоят на пути значений к шагу с Step.ordered.
         """
 
         self._logger = get_kernel_logger().getChild("dispatcher")
         self._config = config
-        self._deque_environ = DequeEnviroment(
-            deque_limit=self._config.TASK_LIMIT,
-            max_tasks_per_iter=self._config.TASKS_PER_ITER,
-        )
 
-        for task in tasks_provider.get_tasks():
-            deque = self._deque_environ.get_deque()
-            deque.put(task)
+        tasks = tasks_provider.get_tasks()
+        lazy = is_lazy(tasks)
+        if not lazy:
+            tasks = list(tasks)  # type: ignore[arg-type]
+        self._seeder: Optional[Seeder] = None
+        self._watched: Optional[ExecutionPlan] = None
+
+        if self._config.BACKEND == "process":
+            self._mp_context = multiprocessing.get_context()
+            self._deque_environ = ProcessDequeEnviroment(
+                deque_limit=self._config.TASK_LIMIT,
+                max_tasks_per_iter=self._config.TASKS_PER_ITER,
+                ctx=self._mp_context,
+            )
+            # дескрипторы кладутся в очередь уже после запуска процессов:
+            # put() поднимает фоновый поток очереди, а fork() многопоточного процесса небезопасен
+            self._seeds = []
+            if lazy:
+                self._seeder = Seeder(
+                    tasks,
+                    put=self._deque_environ.seed_when_room,
+                    wake=self._deque_environ.notify_room,
+                    prepare=self._to_descriptor,
+                )
+            else:
+                self._seeds = [self._to_descriptor(task) for task in tasks]  # type: ignore[union-attr]
+        elif self._config.POOLS:
+            self._deque_environ = PooledDequeEnviroment(
+                deque_limit=self._config.TASK_LIMIT,
+                max_tasks_per_iter=self._config.TASKS_PER_ITER,
+                pools=self._config.POOLS,
+                policy=self._config.SCHEDULING,
+                strict_limit=self._config.STRICT_TASK_LIMIT,
+            )
+        else:
+            environ_cls = (
+                StealingDequeEnviroment
+                if self._config.WORK_STEALING
+                else DequeEnviroment
+            )
+            self._deque_environ = environ_cls(
+                deque_limit=self._config.TASK_LIMIT,
+                max_tasks_per_iter=self._config.TASKS_PER_ITER,
+                policy=self._config.SCHEDULING,
+                strict_limit=self._config.STRICT_TASK_LIMIT,
+            )
+
+        self._profiler: Optional[SamplingProfiler] = None
+        self._profile: Optional[ProfileSummary] = None
+        if self._config.PROFILE_PATH is not None:
+            self._profiler = SamplingProfiler(
+                self._config.PROFILE_PATH, self._config.PROFILE_INTERVAL
+            )
+
+        self._batcher: Optional[Batcher] = None
+        self._aggregator: Optional[Aggregator] = None
+        self._reorderer: Optional[Reorderer] = None
+        if self._config.BACKEND == "thread":
+            # цепочки лениво подаваемых задач заранее неизвестны: стадии подключаются на случай,
+            # если в них встретятся шаги с start_batch() или агрегаты
+            if lazy or has_batch_steps(tasks):  # type: ignore[arg-type]
+                self._batcher = Batcher(
+                    put=self._deque_environ.get_deque().put,
+                    on_flush=self._on_batch_flush,
+                )
+            if lazy or has_aggregate_steps(tasks):  # type: ignore[arg-type]
+                self._aggregator = Aggregator(
+                    put=self._put_from_stage,
+                    on_absorb=self._on_stage_absorb,
+                )
+            if lazy or has_ordered_steps(tasks):  # type: ignore[arg-type]
+                self._reorderer = Reorderer(
+                    limit=self._config.REORDER_LIMIT,
+                    put=self._put_from_stage,
+                    on_absorb=self._on_stage_absorb,
+                )
+            if lazy:
+                self._seeder = Seeder(
+                    tasks,
+                    put=self._deque_environ.seed_when_room,
+                    wake=self._deque_environ.notify_room,
+                    prepare=self._prepare_seed,
+                )
+            else:
+                for task in tasks:  # type: ignore[union-attr]
+                    self._deque_environ.seed(self._prepare_seed(task))
+
+        self._metrics = RuntimeMetrics() if self._config.METRICS else None
+        self._tracer: Optional[Tracer] = None
+        if self._config.TRACE_FILE is not None:
+            self._tracer = Tracer(
+                self._config.TRACE_FILE, self._config.TRACE_SAMPLE_RATIO
+            )
+        self._workers: List[Union[Thread, BaseProcess]] = []
+        self._stats: Optional[WorkerStats] = None
+        self._autoscaler: Optional[Autoscaler] = None
+        if self._config.is_autoscaling():
+            self._stats = WorkerStats()
+            self._autoscaler = Autoscaler(
+                min_workers=self._config.get_min_workers(),
+                max_workers=self._config.get_max_workers(),
+                interval=self._config.SCALE_INTERVAL,
+                stats=self._stats,
+                queued=lambda: len(self._deque_environ.get_deque()),
+                spawn=self._start_worker,
+                retire=self._retire_worker,
+            )
 
         self._logger.debug("Создан Dispatcher.")
 
@@ -39,25 +163,200 @@ class Runtime:
         """
         Запускает обработку шагов.
         """
-        threads = []
+        if self._profiler is not None:
+            self._profiler.start()
 
-        workers = self._config.WORKERS
         self._logger.info("Создание Worker-ов...")
-        for _ in range(workers):
-            worker = TaskWorker(self._deque_environ)
-            thread = Thread(target=worker.run)
-            thread.start()
-            threads.append(thread)
+        for _ in range(self._config.WORKERS):
+            self._start_worker()
+        for pool, size in self._config.POOLS.items():
+            for _ in range(size):
+                self._start_worker(pool)
         self._logger.debug("Все воркеры успешно созданы и запущены.")
 
-        self._deque_environ.get_deque().join()
+        if self._config.BACKEND == "process":
+            for descriptor in self._seeds:
+                self._deque_environ.get_deque().put(descriptor)
+
+        active = self._config.WORKERS
+        if self._autoscaler is not None:
+            self._autoscaler.start(active)
+
+        self._wait_tasks()
         self._logger.info("Все Task-и выполнены. Очередь пуста.")
 
+        # после остановки автомасштабирования количество воркеров больше не меняется
+        if self._autoscaler is not None:
+            active = self._autoscaler.stop()
+            self._logger.info(f"Пик воркеров: {self._autoscaler.get_peak_workers()}.")
+
         self._logger.info("Остановка Worker-ов...")
         deque = self._deque_environ.get_deque()
-        for _ in range(len(threads)):
+        for _ in range(active):
             deque.put(None)
+        for pool, size in self._config.POOLS.items():
+            for _ in range(size):
+                deque.put_to(pool, None)  # type: ignore[union-attr]
 
-        for thread in threads:
-            thread.join()
+        for worker in self._workers:
+            worker.join()
         self._logger.info("Worker-ы остановлены.")
+
+        if self._tracer is not None:
+            self._tracer.close()
+            self._logger.info(f"Записано span-ов: {self._tracer.get_written()}.")
+
+        if self._profiler is not None:
+            self._profile = self._profiler.stop()
+
+        if self._seeder is not None and self._seeder.get_error() is not None:
+            raise self._seeder.get_error()  # type: ignore[misc]
+
+        if self._config.STRICT_TASK_LIMIT:
+            self._logger.info(
+                f"Ожидание места в очереди: {self.get_full_wait_time():.3f} с."
+            )
+
+    def get_metrics(self) -> MetricsSnapshot:
+        """
+        Returns:
+            Снимок метрик (можно запрашивать и во время исполнения, в том числе из другого потока).
+            Метрики шагов - только с RuntimeConfig.METRICS, показатели очереди и воркеров - всегда.
+        """
+        metrics = self._metrics or RuntimeMetrics()
+        return metrics.snapshot(
+            queue_size=len(self._deque_environ.get_deque()),
+            generation_limit=self._deque_environ.get_generation_limit(),
+            workers=sum(worker.is_alive() for worker in list(self._workers)),
+            full_wait_time=self.get_full_wait_time(),
+        )
+
+    def get_profile(self) -> Optional[ProfileSummary]:
+        """
+        Returns:
+            Сводка профиля по шагам после Runtime.run() (None - RuntimeConfig.PROFILE_PATH не задан
+            или run() ещё не завершился).
+        """
+        return self._profile
+
+    def get_full_wait_time(self) -> float:
+        """
+        Returns:
+            Суммарное время, которое задачи провели припаркованными из-за заполненной очереди
+            (см. RuntimeConfig.STRICT_TASK_LIMIT).
+        """
+        return self._deque_environ.get_full_wait_time()
+
+    def _wait_tasks(self) -> None:
+        """
+        Ждёт, пока очередь опустеет. Лениво подаваемые стартовые задачи (см. Seeder), недобранные пачки
+        (см. Batcher) и результаты открытых окон (см. Aggregator) отправляются в очередь и дожидаются тоже.
+        """
+        deque = self._deque_environ.get_deque()
+        stages = [
+            stage
+            for stage in (self._seeder, self._aggregator, self._batcher)
+            if stage is not None
+        ]
+        if not stages:
+            deque.join()
+            return
+
+        for stage in stages:
+            stage.start()
+        while True:
+            flushes = [stage.get_flushes() for stage in stages]
+            deque.join()
+            # окна закрываются раньше пачек: их результаты могут уйти в пачки
+            settled = [stage.settle(count) for stage, count in zip(stages, flushes)]
+            if all(settled):
+                break
+        for stage in stages:
+            stage.stop()
+
+    def _on_batch_flush(self, size: int) -> None:
+        # при жёстком пределе пачка занимает одно место вместо size
+        if self._config.STRICT_TASK_LIMIT:
+            self._deque_environ.release_slots(size - 1)
+
+    def _prepare_seed(self, task: Task) -> Task:
+        plan = task.get_plan()
+        if self._config.TASK_FREE_LIST:
+            plan.enable_recycling(self._config.TASK_FREE_LIST)
+        if self._reorderer is not None:
+            self._reorderer.seed(task)
+        # стартовые задачи обычно идут подряд из одной цепочки - её шаги не перебираются повторно
+        if self._profiler is not None and plan is not self._watched:
+            self._profiler.watch(plan.get_steps())
+            self._watched = plan
+        return task
+
+    def _to_descriptor(self, task: Task) -> TaskDescriptor:
+        if task.get_plan().has_aggregate_steps():
+            raise ValueError(
+                'Шаги-агрегаты (AggregateStep) поддерживаются только с BACKEND="thread".'
+            )
+        if task.get_plan().has_ordered_steps():
+            raise ValueError(
+                'Шаги с Step.ordered поддерживаются только с BACKEND="thread".'
+            )
+        return task.to_descriptor()
+
+    def _put_from_stage(self, tasks: List[Task]) -> None:
+        # задачи результатов окон и упорядоченных шагов создаются вне хода воркера:
+        # при жёстком пределе они занимают места сверх него
+        if self._config.STRICT_TASK_LIMIT:
+            self._deque_environ.occupy_slots(len(tasks))
+        if self._batcher is not None:
+            tasks = self._batcher.absorb(tasks)
+        deque = self._deque_environ.get_deque()
+        for task in tasks:
+            deque.put(task)
+
+    def _on_stage_absorb(self, count: int) -> None:
+        # забранные задачи агрегатов и упорядоченных шагов не лежат в очереди (count < 0 - результатов окон больше, чем забранных задач)
+        if self._config.STRICT_TASK_LIMIT:
+            self._deque_environ.release_slots(count)
+
+    def get_peak_workers(self) -> int:
+        """
+        Returns:
+            Наибольшее количество одновременно работавших воркеров.
+        """
+        if self._autoscaler is not None:
+            return self._autoscaler.get_peak_workers()
+        return self._config.WORKERS
+
+    def _start_worker(self, pool: Optional[str] = None) -> None:
+        worker = self._spawn_worker(pool)
+        worker.start()
+        self._workers.append(worker)
+
+    def _retire_worker(self) -> None:
+        # воркер, забравший сигнал, завершает текущий ход и выходит
+        self._config.SCHEDULING.stop(self._deque_environ.get_deque())
+
+    def _spawn_worker(self, pool: Optional[str] = None) -> Union[Thread, BaseProcess]:
+        """
+        Создаёт (но не запускает) поток или процесс воркера в зависимости от BACKEND.
+        """
+        if self._config.BACKEND == "process":
+            return self._mp_context.Process(  # type: ignore[attr-defined]
+                target=run_process_worker,
+                args=(self._deque_environ,),
+            )
+
+        worker = TaskWorker(
+            self._deque_environ,
+            stats=self._stats,
+            pool=pool,
+            batcher=self._batcher,
+            metrics=(
+                self._metrics.create_recorder() if self._metrics is not None else None
+            ),
+            tracer=self._tracer,
+            aggregator=self._aggregator,
+            reorderer=self._reorderer,
+            profiler=self._profiler,
+        )
+        return Thread(target=worker.run)
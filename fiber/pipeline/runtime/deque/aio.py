@@ -0,0 +1,62 @@
+import asyncio
+from typing import Any, Generic, TypeVar
+
+from fiber.pipeline.runtime.deque.enviroment import DequeEnviroment
+
+T = TypeVar("T")
+
+
+class AsyncDeque(Generic[T]):
+    """
+    Очередь для корутин-обработчиков с тем же интерфейсом, что Runtime использует
+    у ThreadSafeDeque (put / getleft / task_done / join / len), но с await-ожиданием.
+    Не потокобезопасна: все обращения должны идти из одного event loop-а.
+    """
+
+    def __init__(self):
+        self._queue: asyncio.Queue[T] = asyncio.Queue()
+
+    def put(self, item: T) -> None:
+        self._queue.put_nowait(item)
+
+    async def getleft(self) -> T:
+        return await self._queue.get()
+
+    def task_done(self) -> None:
+        self._queue.task_done()
+
+    async def join(self) -> None:
+        await self._queue.join()
+
+    def __len__(self) -> int:
+        return self._queue.qsize()
+
+
+class AsyncDequeEnviroment(DequeEnviroment):
+    """
+    Среда очереди для AsyncRuntime. Политика генерации та же, что у DequeEnviroment.
+    """
+
+    def __init__(
+        self, deque_limit: int, max_tasks_per_iter: int, strict_limit: bool = False
+    ):
+        super().__init__(deque_limit, max_tasks_per_iter, strict_limit=strict_limit)
+        self._deque = AsyncDeque()
+        self._room_freed = asyncio.Event()
+
+    def get_deque(self) -> AsyncDeque:  # type: ignore[override]
+        return self._deque
+
+    async def aseed_when_room(self, task: Any) -> None:
+        """
+        Кладёт в очередь стартовую задачу, дождавшись для неё места (см. DequeEnviroment.seed_when_room()).
+
+        Raises:
+            ValueError: если при жёстком пределе цепочка задачи длиннее предела.
+        """
+        while not self.try_seed(task):
+            self._room_freed.clear()
+            await self._room_freed.wait()
+
+    def notify_room(self) -> None:
+        self._room_freed.set()
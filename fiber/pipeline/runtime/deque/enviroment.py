@@ -1,6 +1,13 @@
+import heapq
+from itertools import count
+from threading import Condition, Event, Lock
+from time import perf_counter
+from typing import Any, List, Optional, Tuple
+
 from tsdeque import ThreadSafeDeque
 
 from fiber.pipeline.runtime.deque.utils.math import roundu
+from fiber.pipeline.runtime.scheduling import FifoPolicy, SchedulingPolicy
 
 
 class DequeEnviroment:
@@ -8,6 +15,8 @@ class DequeEnviroment:
         self,
         deque_limit: int,
         max_tasks_per_iter: int,
+        policy: Optional[SchedulingPolicy] = None,
+        strict_limit: bool = False,
     ):
         """
         Создает среду для очереди.
@@ -16,14 +25,122 @@ class DequeEnviroment:
             deque: Двустороння очередь.
             deque_limit: Предел к которому стремиться размер очереди (при приближении к нему генерация замедляется).
             max_task_per_iter: Максимальное колиство задач которые воркер может сгенерировать за одно обращение к очереди.
+            policy: Политика планирования задач (по умолчанию FifoPolicy).
+            strict_limit: Сделать deque_limit жёстким пределом (см. reserve_slots()).
         """
-        self._deque = ThreadSafeDeque()
+        self._policy = policy if policy is not None else FifoPolicy()
+        self._deque = self._policy.create_deque()
         self._deque_limit = deque_limit
         self._max_tasks_per_iter = max_tasks_per_iter
 
+        # учёт мест для жёсткого предела: задачи в очереди + задачи в работе у воркеров
+        self._strict_limit = strict_limit
+        self._slots_lock = Lock()
+        self._occupied = 0
+        self._parked: List[Tuple[int, int, float, Any]] = []
+        self._parked_order = count()
+        self._full_wait_time = 0.0
+
+        # ожидание места для стартовых задач (см. seed_when_room())
+        self._room = Condition()
+        self._room_waiters = 0
+
     def get_deque(self) -> ThreadSafeDeque:
         return self._deque
 
+    def seed(self, task: Any) -> None:
+        """
+        Кладёт в очередь стартовую задачу (стартовые задачи могут превысить жёсткий предел).
+
+        Raises:
+            ValueError: если при жёстком пределе цепочка задачи длиннее предела
+                (её задачам не хватит мест, чтобы дойти до конца цепочки).
+        """
+        if self._strict_limit and task.steps_left() > self._deque_limit:
+            raise ValueError(
+                f"Цепочка из {task.steps_left()} шагов не помещается в жёсткий предел {self._deque_limit}."
+            )
+        with self._slots_lock:
+            self._occupied += 1
+        self._deque.put(task)
+
+    def try_seed(self, task: Any) -> bool:
+        """
+        Кладёт в очередь стартовую задачу, если для неё есть место (ленивая подача, см. Seeder):
+        при жёстком пределе - с запасом мест на её цепочку, иначе - пока очередь меньше предела.
+
+        Returns:
+            Положена ли задача.
+
+        Raises:
+            ValueError: если при жёстком пределе цепочка задачи длиннее предела.
+        """
+        if not self._strict_limit:
+            if len(self._deque) >= self._deque_limit:
+                return False
+            self._deque.put(task)
+            return True
+
+        steps_left = task.steps_left()
+        if steps_left > self._deque_limit:
+            raise ValueError(
+                f"Цепочка из {steps_left} шагов не помещается в жёсткий предел {self._deque_limit}."
+            )
+        with self._slots_lock:
+            # запас на шаг больше, чем у порождённых задач (см. reserve_slots()): иначе стартовые задачи
+            # могут занять все места, и ни одной из них не хватит места на порождённую задачу
+            if self._deque_limit - self._occupied - max(0, steps_left - 1) < 1:
+                return False
+            self._occupied += 1
+        self._deque.put(task)
+        return True
+
+    def seed_when_room(self, task: Any, stop: Optional[Event] = None) -> bool:
+        """
+        Кладёт в очередь стартовую задачу, дождавшись для неё места (см. try_seed()).
+        Ожидание будят воркеры, когда забирают задачи из очереди или освобождают места (см. notify_room()).
+
+        Args:
+            stop: Прерывает ожидание (после stop.set() нужно вызвать notify_room()).
+
+        Returns:
+            Положена ли задача (False - ожидание прервано).
+
+        Raises:
+            ValueError: если при жёстком пределе цепочка задачи длиннее предела.
+        """
+        with self._room:
+            self._room_waiters += 1
+            try:
+                while not self.try_seed(task):
+                    if stop is not None and stop.is_set():
+                        return False
+                    self._room.wait()
+                return True
+            finally:
+                self._room_waiters -= 1
+
+    def notify_room(self) -> None:
+        """
+        Будит ожидающих места (см. seed_when_room()): задача покинула очередь или освободила место.
+        """
+        if not self._room_waiters:
+            return
+        with self._room:
+            self._room.notify_all()
+
+    def get_policy(self) -> SchedulingPolicy:
+        return self._policy
+
+    def get_worker_deque(self, pool: Optional[str] = None) -> ThreadSafeDeque:
+        """
+        Возвращает очередь, с которой работает конкретный воркер (здесь - общая для всех).
+
+        Args:
+            pool: Пул воркера (учитывается только средой с пулами).
+        """
+        return self._deque
+
     def get_generation_limit(self) -> int:
         """
         Вычисляет количесво задач которые воркер сможет сгенерировать за одно обращение к очереди.
@@ -36,3 +153,78 @@ class DequeEnviroment:
         raw_tasks = roundu(max_task_per_iter * (1 - usage))
 
         return max(1, raw_tasks)
+
+    def is_strict(self) -> bool:
+        return self._strict_limit
+
+    def reserve_slots(self, count: int, steps_left: int) -> int:
+        """
+        Жёсткий предел: место занимает каждая задача в очереди, в работе у воркера и припаркованная.
+        Резервирует до count мест под задачи, порождаемые задачей с steps_left оставшимися шагами.
+
+        После резервирования остаётся запас в steps_left - 2 места - его хватит порождённым задачам,
+        чтобы дойти до конца цепочки, поэтому очередь не может заполниться задачами, которые ждут друг друга.
+
+        Returns:
+            Сколько мест удалось зарезервировать (0 - места нет, задачу нужно припарковать).
+        """
+        headroom = max(0, steps_left - 2)
+        with self._slots_lock:
+            free = self._deque_limit - self._occupied - headroom
+            granted = max(0, min(count, free))
+            self._occupied += granted
+        return granted
+
+    def occupy_slots(self, count: int) -> None:
+        """
+        Занимает места под задачи, созданные вне воркеров (например результаты окон агрегатов).
+        Как и стартовые задачи, они могут превысить жёсткий предел.
+        """
+        with self._slots_lock:
+            self._occupied += count
+
+    def release_slots(self, count: int) -> None:
+        """
+        Освобождает неиспользованные места и места завершённых задач.
+        """
+        with self._slots_lock:
+            self._occupied -= count
+        self.notify_room()
+
+    def park(self, task: Any) -> None:
+        """
+        Паркует задачу, которой не хватило места для порождаемых задач: генератор не продвигается,
+        задача (сохраняя своё место) ждёт в стороне, пока очередь не разгрузится.
+        Первыми возобновляются задачи, ближайшие к концу цепочки - они быстрее освобождают места.
+        """
+        entry = (task.steps_left(), next(self._parked_order), perf_counter(), task)
+        with self._slots_lock:
+            heapq.heappush(self._parked, entry)
+
+    def resume_parked(self) -> Optional[Any]:
+        """
+        Возвращает припаркованную задачу, если для её порождённой задачи есть место.
+        """
+        if not self._parked:
+            return None
+
+        with self._slots_lock:
+            if not self._parked:
+                return None
+
+            steps_left, _, parked_at, task = self._parked[0]
+            headroom = max(0, steps_left - 2)
+            if self._deque_limit - self._occupied - headroom < 1:
+                return None
+
+            heapq.heappop(self._parked)
+            self._full_wait_time += perf_counter() - parked_at
+        return task
+
+    def get_full_wait_time(self) -> float:
+        """
+        Returns:
+            Суммарное время (в секундах), которое задачи провели припаркованными из-за заполненной очереди.
+        """
+        with self._slots_lock:
+            return self._full_wait_time
@@ -0,0 +1,137 @@
+from threading import Condition
+from typing import Any, Dict, Generic, Iterable, Optional, TypeVar
+
+from fiber.pipeline.runtime.deque.enviroment import DequeEnviroment
+from fiber.pipeline.runtime.scheduling import SchedulingPolicy
+
+T = TypeVar("T")
+
+
+class PoolDeque(Generic[T]):
+    """
+    Очередь воркера из пула. Забирает задачи только из очереди своего пула,
+    а кладёт - в очередь пула, которому принадлежит шаг задачи.
+
+    Интерфейс совпадает с тем, что TaskWorker использует у ThreadSafeDeque.
+    """
+
+    def __init__(self, enviroment: "PooledDequeEnviroment", pool: Optional[str]):
+        self._enviroment = enviroment
+        self._own = enviroment._deques[pool]
+
+    def put(self, item: T) -> None:
+        self._enviroment._route(item, left=False)
+
+    def putleft(self, item: T) -> None:
+        self._enviroment._route(item, left=True)
+
+    def getleft(self) -> T:
+        return self._own.getleft()
+
+    def get(self) -> T:
+        return self._own.get()
+
+    def task_done(self) -> None:
+        self._own.task_done()
+        self._enviroment._done()
+
+    def __len__(self) -> int:
+        return self._enviroment._queued()
+
+
+class RoutingDeque(Generic[T]):
+    """
+    Общая точка входа в PooledDequeEnviroment для Runtime: put() стартовых задач с маршрутизацией по пулам,
+    put_to() сигналов остановки в конкретный пул, join() и len() по всем пулам сразу.
+    """
+
+    def __init__(self, enviroment: "PooledDequeEnviroment"):
+        self._enviroment = enviroment
+
+    def put(self, item: T) -> None:
+        self._enviroment._route(item, left=False)
+
+    def putleft(self, item: T) -> None:
+        self._enviroment._route(item, left=True)
+
+    def put_to(self, pool: Optional[str], item: T) -> None:
+        self._enviroment._put_to(pool, item, left=False)
+
+    def join(self) -> None:
+        self._enviroment._join()
+
+    def __len__(self) -> int:
+        return self._enviroment._queued()
+
+
+class PooledDequeEnviroment(DequeEnviroment):
+    """
+    Среда очереди с отдельной очередью на каждый пул воркеров (см. Step.pool и RuntimeConfig.POOLS).
+
+    Задача попадает в очередь пула, которому принадлежит её текущий шаг, поэтому медленные
+    блокирующие шаги не занимают воркеров CPU-шагов, и стадии исполняются одновременно.
+    Учёт незавершённых задач (join()) и размер очереди для лимита генерации общие для всех пулов:
+    задача переходит из пула в пул, пока не дойдёт до конца цепочки.
+    """
+
+    def __init__(
+        self,
+        deque_limit: int,
+        max_tasks_per_iter: int,
+        pools: Iterable[str],
+        policy: Optional[SchedulingPolicy] = None,
+        strict_limit: bool = False,
+    ):
+        """
+        Args:
+            pools: Имена пулов. Задачи шагов без пула (или с пулом не из списка) попадают в общий пул (None).
+        """
+        super().__init__(deque_limit, max_tasks_per_iter, policy, strict_limit)
+        self._deques: Dict[Optional[str], Any] = {None: self._deque}
+        for pool in pools:
+            self._deques[pool] = self._policy.create_deque()
+        self._deque = RoutingDeque(self)
+
+        self._unfinished = 0
+        self._all_done = Condition()
+
+    def get_deque(self) -> RoutingDeque:  # type: ignore[override]
+        return self._deque
+
+    def get_worker_deque(self, pool: Optional[str] = None) -> PoolDeque:  # type: ignore[override]
+        return PoolDeque(self, pool)
+
+    def get_pool(self, task: Any) -> Optional[str]:
+        """
+        Returns:
+            Пул, в очередь которого попадёт задача (None - общий пул).
+        """
+        if task is None:
+            return None
+        pool = task.get_step().pool
+        return pool if pool in self._deques else None
+
+    def _route(self, item: Any, left: bool) -> None:
+        self._put_to(self.get_pool(item), item, left)
+
+    def _put_to(self, pool: Optional[str], item: Any, left: bool) -> None:
+        with self._all_done:
+            self._unfinished += 1
+        deque = self._deques[pool]
+        if left:
+            deque.putleft(item)
+        else:
+            deque.put(item)
+
+    def _done(self) -> None:
+        with self._all_done:
+            self._unfinished -= 1
+            if self._unfinished == 0:
+                self._all_done.notify_all()
+
+    def _join(self) -> None:
+        with self._all_done:
+            self._all_done.wait_for(lambda: self._unfinished == 0)
+
+    def _queued(self) -> int:
+        return sum(len(deque) for deque in self._deques.values())
@@ -0,0 +1,64 @@
+import heapq
+from itertools import count
+from threading import Condition
+from typing import Any, Callable, Generic, List, Optional, Tuple, TypeVar
+
+T = TypeVar("T")
+
+
+class PriorityDeque(Generic[T]):
+    """
+    Потокобезопасная очередь с приоритетом и учётом незавершённых задач.
+    Интерфейс совпадает с тем, что Runtime использует у ThreadSafeDeque
+    (put / getleft / get / task_done / join / len).
+
+    getleft() и get() одинаково возвращают элемент с наименьшим ключом,
+    среди равных - добавленный раньше.
+    """
+
+    def __init__(self, key: Callable[[T], Any]):
+        """
+        Args:
+            key: Функция приоритета элемента (меньше - раньше).
+        """
+        self._key = key
+        self._heap: List[Tuple[Any, int, T]] = []
+        self._order = count()
+        self._unfinished = 0
+        self._mutex = Condition()
+        self._all_done = Condition(self._mutex)
+
+    def put(self, item: T) -> None:
+        entry = (self._key(item), next(self._order), item)
+        with self._mutex:
+            heapq.heappush(self._heap, entry)
+            self._unfinished += 1
+            self._mutex.notify()
+
+    def getleft(self, timeout: Optional[float] = None) -> T:
+        """
+        Raises:
+            TimeoutError: если за timeout в очереди не появилось элементов.
+        """
+        with self._mutex:
+            if not self._mutex.wait_for(lambda: self._heap, timeout):
+                raise TimeoutError("Истекло время ожидания элемента очереди.")
+            return heapq.heappop(self._heap)[2]
+
+    get = getleft
+
+    def task_done(self) -> None:
+        with self._mutex:
+            if self._unfinished <= 0:
+                raise ValueError("Все задачи уже завершены.")
+            self._unfinished -= 1
+            if self._unfinished == 0:
+                self._all_done.notify_all()
+
+    def join(self) -> None:
+        with self._mutex:
+            self._all_done.wait_for(lambda: self._unfinished == 0)
+
+    def __len__(self) -> int:
+        with self._mutex:
+            return len(self._heap)
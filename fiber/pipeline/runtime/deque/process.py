@@ -0,0 +1,117 @@
+import pickle
+from itertools import count
+from multiprocessing.context import BaseContext
+from queue import Empty
+from threading import Condition, Event, Lock
+from time import sleep
+from typing import Any, Dict, Generic, Optional, TypeVar
+
+from fiber.pipeline.runtime.deque.enviroment import DequeEnviroment
+
+T = TypeVar("T")
+
+# как часто подача проверяет, освободилось ли место: задачи забирают другие процессы,
+# и разбудить ожидание они не могут (см. ProcessDequeEnviroment.seed_when_room())
+ROOM_INTERVAL = 0.001
+
+
+class ProcessDeque(Generic[T]):
+    """
+    Межпроцессная очередь с тем же интерфейсом, что использует Runtime у ThreadSafeDeque
+    (put / getleft / task_done / join / len).
+    """
+
+    def __init__(self, ctx: BaseContext):
+        self._queue = ctx.JoinableQueue()
+        self._size = ctx.Value("i", 0)
+
+    def put(self, item: T) -> None:
+        """
+        Raises:
+            pickle.PicklingError: если элемент не сериализуется (проверяется сразу,
+            а не в фоновом потоке очереди, иначе элемент молча потеряется и join() зависнет).
+        """
+        try:
+            data = pickle.dumps(item, protocol=pickle.HIGHEST_PROTOCOL)
+        except Exception as e:
+            raise pickle.PicklingError(f"Не удалось сериализовать {item!r}: {e}") from e
+
+        with self._size.get_lock():
+            self._size.value += 1
+        self._queue.put(data)
+
+    def getleft(self, timeout: Optional[float] = None) -> T:
+        """
+        Raises:
+            TimeoutError: если за timeout в очереди не появилось элементов.
+        """
+        try:
+            item = self._queue.get(timeout=timeout)
+        except Empty:
+            raise TimeoutError("Истекло время ожидания элемента очереди.")
+
+        with self._size.get_lock():
+            self._size.value -= 1
+        return pickle.loads(item)
+
+    def task_done(self) -> None:
+        self._queue.task_done()
+
+    def join(self) -> None:
+        self._queue.join()
+
+    def __len__(self) -> int:
+        return self._size.value
+
+
+class ProcessDequeEnviroment(DequeEnviroment):
+    """
+    Среда очереди для воркеров-процессов. Политика генерации та же, что у DequeEnviroment,
+    но очередь разделяется между процессами и хранит TaskDescriptor-ы.
+    """
+
+    def __init__(
+        self,
+        deque_limit: int,
+        max_tasks_per_iter: int,
+        ctx: BaseContext,
+    ):
+        """
+        Args:
+            deque_limit: Предел к которому стремиться размер очереди (при приближении к нему генерация замедляется).
+            max_task_per_iter: Максимальное колиство задач которые воркер может сгенерировать за одно обращение к очереди.
+            ctx: Контекст multiprocessing, в котором создаются очередь и процессы.
+        """
+        super().__init__(deque_limit, max_tasks_per_iter)
+        self._deque = ProcessDeque(ctx)
+
+    def get_deque(self) -> ProcessDeque:  # type: ignore[override]
+        return self._deque
+
+    def seed_when_room(self, task: Any, stop: Optional[Event] = None) -> bool:
+        """
+        Как DequeEnviroment.seed_when_room(), но место проверяется раз в ROOM_INTERVAL:
+        воркеры-процессы не могут разбудить ожидание.
+        """
+        while not self.try_seed(task):
+            if stop is None:
+                sleep(ROOM_INTERVAL)
+            elif stop.wait(ROOM_INTERVAL):
+                return False
+        return True
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # среда передаётся в процесс-воркер (при spawn/forkserver - через pickle):
+        # блокировка и учёт жёсткого предела принадлежат процессу Runtime и не передаются
+        state = self.__dict__.copy()
+        for name in ("_slots_lock", "_occupied", "_parked", "_parked_order", "_room"):
+            del state[name]
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._slots_lock = Lock()
+        self._occupied = 0
+        self._parked = []
+        self._parked_order = count()
+        self._room = Condition()
@@ -0,0 +1,186 @@
+from collections import deque
+from threading import Condition, Event, Lock
+from typing import Deque, Generic, List, Optional, TypeVar
+
+from fiber.pipeline.runtime.deque.enviroment import DequeEnviroment
+from fiber.pipeline.runtime.scheduling import SchedulingPolicy
+
+T = TypeVar("T")
+
+_NOTHING = object()
+
+# сколько спит простаивающий воркер, если его не разбудили (страховка от гонок)
+_IDLE_TIMEOUT = 0.01
+
+
+class LocalDeque(Generic[T]):
+    """
+    Локальная очередь воркера. Владелец кладёт и забирает задачи со своего конца без блокировок,
+    остальные воркеры крадут задачи с противоположного конца, когда им нечего делать.
+
+    Интерфейс совпадает с тем, что TaskWorker использует у ThreadSafeDeque.
+    """
+
+    def __init__(self, enviroment: "StealingDequeEnviroment", index: int):
+        self._enviroment = enviroment
+        self._index = index
+        self._items: Deque[T] = deque()
+        # счётчики пишет только владелец, поэтому блокировки не нужны
+        self._puts = 0
+        self._dones = 0
+
+    def put(self, item: T) -> None:
+        self._items.append(item)
+        self._puts += 1
+        self._enviroment._notify_work()
+
+    def getleft(self) -> T:
+        """
+        Забирает самую старую задачу: сначала из своей очереди, затем из общей (стартовые задачи и сигналы остановки),
+        затем крадёт у соседей. Если работы нет - ждёт.
+        """
+        while True:
+            try:
+                return self._items.popleft()
+            except IndexError:
+                pass
+
+            item = self._enviroment._steal(self._index)
+            if item is not _NOTHING:
+                return item  # type: ignore[return-value]
+
+            self._enviroment._wait_for_work()
+
+    def get(self) -> T:
+        """
+        Как getleft(), но из своей очереди забирает самую свежую задачу (для LifoPolicy).
+        """
+        while True:
+            try:
+                return self._items.pop()
+            except IndexError:
+                pass
+
+            item = self._enviroment._steal(self._index)
+            if item is not _NOTHING:
+                return item  # type: ignore[return-value]
+
+            self._enviroment._wait_for_work()
+
+    def task_done(self) -> None:
+        self._dones += 1
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+
+class GlobalDeque(Generic[T]):
+    """
+    Общая точка входа в StealingDequeEnviroment для Runtime: put() стартовых задач и сигналов остановки,
+    join() и len() по всем локальным очередям сразу.
+    """
+
+    def __init__(self, enviroment: "StealingDequeEnviroment"):
+        self._enviroment = enviroment
+
+    def put(self, item: T) -> None:
+        self._enviroment._inject(item)
+
+    def join(self) -> None:
+        self._enviroment._join()
+
+    def __len__(self) -> int:
+        return self._enviroment._queued()
+
+
+class StealingDequeEnviroment(DequeEnviroment):
+    """
+    Среда очереди с локальной очередью на каждого воркера и кражей задач (work stealing).
+
+    Воркер кладёт порождённые задачи в свою очередь и не конкурирует за общую блокировку,
+    к соседям обращается только когда своя очередь пуста. Учёт незавершённых задач (join())
+    и размер очереди для лимита генерации считаются по всем очередям сразу.
+    """
+
+    def __init__(
+        self,
+        deque_limit: int,
+        max_tasks_per_iter: int,
+        policy: Optional[SchedulingPolicy] = None,
+        strict_limit: bool = False,
+    ):
+        super().__init__(deque_limit, max_tasks_per_iter, policy, strict_limit)
+        self._deque = GlobalDeque(self)
+        self._locals: List[LocalDeque] = []
+        self._injected: Deque = deque()
+        self._injected_count = 0
+        self._inject_lock = Lock()
+        self._work = Condition()
+        self._sleepers = 0
+        self._idle = Event()
+
+    def get_deque(self) -> GlobalDeque:  # type: ignore[override]
+        return self._deque
+
+    def get_worker_deque(self, pool: Optional[str] = None) -> LocalDeque:  # type: ignore[override]
+        """
+        Регистрирует нового воркера и выдаёт ему локальную очередь.
+        """
+        with self._inject_lock:
+            local = LocalDeque(self, index=len(self._locals))
+            self._locals = self._locals + [local]
+        return local
+
+    def _inject(self, item) -> None:
+        with self._inject_lock:
+            self._injected_count += 1
+            self._injected.append(item)
+        self._notify_work()
+
+    def _steal(self, thief: int):
+        try:
+            return self._injected.popleft()
+        except IndexError:
+            pass
+
+        victims = self._locals
+        count = len(victims)
+        for shift in range(1, count):
+            victim = victims[(thief + shift) % count]
+            try:
+                return victim._items.pop()
+            except IndexError:
+                continue
+
+        return _NOTHING
+
+    def _notify_work(self) -> None:
+        # чтение без блокировки: в худшем случае воркер проснётся по таймауту
+        if self._sleepers:
+            with self._work:
+                self._work.notify()
+
+    def _wait_for_work(self) -> None:
+        self._idle.set()
+        with self._work:
+            self._sleepers += 1
+            self._work.wait(_IDLE_TIMEOUT)
+            self._sleepers -= 1
+
+    def _pending(self) -> int:
+        """
+        Количество незавершённых задач. Сначала читаются счётчики завершений, потом добавлений:
+        задача добавляется только незавершённой задачей, поэтому 0 означает, что работы действительно нет.
+        """
+        locals_ = self._locals
+        dones = sum(local._dones for local in locals_)
+        puts = sum(local._puts for local in locals_) + self._injected_count
+        return puts - dones
+
+    def _join(self) -> None:
+        while self._pending() > 0:
+            self._idle.wait(_IDLE_TIMEOUT)
+            self._idle.clear()
+
+    def _queued(self) -> int:
+        return len(self._injected) + sum(len(local) for local in self._locals)
@@ -0,0 +1,72 @@
+from concurrent.futures import Future
+from threading import Lock
+from typing import Dict, List, Optional
+
+from fiber.pipeline.task import ExecutionPlan, Task
+
+
+class _Job:
+    __slots__ = ("pending", "error", "future")
+
+    def __init__(self, future: "Future[None]") -> None:
+        self.pending = 1
+        self.error: Optional[BaseException] = None
+        self.future = future
+
+
+class JobTracker:
+    """
+    Завершение отправленных конвееров (см. PersistentRuntime.submit()): у каждой отправки свой план,
+    а трекер считает её незавершённые задачи. Когда счётчик доходит до нуля, future отправки завершается -
+    без ожидания всей очереди.
+    """
+
+    def __init__(self) -> None:
+        self._lock = Lock()
+        self._jobs: Dict[ExecutionPlan, _Job] = {}
+
+    def open(self, plan: ExecutionPlan, future: "Future[None]") -> None:
+        """
+        Начинает отслеживать отправку со стартовой задачей плана plan.
+        """
+        with self._lock:
+            self._jobs[plan] = _Job(future)
+
+    def absorb(self, parent: Task, children: List[Task]) -> None:
+        """
+        Учитывает ход воркера: порождённые задачи и завершение родителя
+        (вызывается до того, как порождённые задачи попадут в очередь).
+        """
+        with self._lock:
+            job = self._jobs.get(parent.get_plan())
+            if job is None:
+                return
+            job.pending += len(children) - (1 if parent.is_done() else 0)
+            if job.pending:
+                return
+            del self._jobs[parent.get_plan()]
+
+        if job.error is not None:
+            job.future.set_exception(job.error)
+        else:
+            job.future.set_result(None)
+
+    def discard(self, plan: ExecutionPlan) -> None:
+        """
+        Перестаёт отслеживать отправку (её стартовая задача не попала в очередь).
+        """
+        with self._lock:
+            self._jobs.pop(plan, None)
+
+    def fail(self, task: Task, error: BaseException) -> None:
+        """
+        Запоминает первую ошибку шага отправки: её future завершится этой ошибкой
+        (когда закончатся остальные задачи отправки).
+        """
+        with self._lock:
+            job = self._jobs.get(task.get_plan())
+            if job is not None and job.error is None:
+                job.error = error
+
+    def __len__(self) -> int:
+        return len(self._jobs)
@@ -0,0 +1,384 @@
+import json
+from dataclasses import asdict, dataclass
+from threading import Lock
+from time import perf_counter_ns
+from typing import Any, Dict, List, Optional, Sequence, Type
+
+from fiber.step import Step
+
+# HDR-подобная гистограмма: 2^_SUB_BITS корзин на каждую степень двойки (относительная погрешность <= 12.5%)
+_SUB_BITS = 3
+_SUB = 1 << _SUB_BITS
+# наибольшее учитываемое значение - 2^_MAX_BITS нс (~36 минут), всё длиннее попадает в последнюю корзину
+_MAX_BITS = 41
+_BUCKETS = (_MAX_BITS - _SUB_BITS) * _SUB + 2 * _SUB
+_QUANTILES = (0.5, 0.9, 0.99)
+
+
+def _bucket_index(ns: int) -> int:
+    if ns < 2 * _SUB:
+        return ns if ns > 0 else 0
+    shift = ns.bit_length() - _SUB_BITS - 1
+    index = shift * _SUB + (ns >> shift)
+    return index if index < _BUCKETS else _BUCKETS - 1
+
+
+def _bucket_upper(index: int) -> int:
+    if index < 2 * _SUB:
+        return index + 1
+    shift = index // _SUB - 1
+    return ((index % _SUB + _SUB) + 1) << shift
+
+
+class LatencyHistogram:
+    """
+    Гистограмма длительностей с логарифмическими корзинами (в духе HdrHistogram):
+    запись - один индекс в списке, память не зависит от количества значений.
+    Значения хранятся в наносекундах (time.perf_counter_ns()), в снимке - в секундах.
+    """
+
+    __slots__ = ("_counts", "_sum", "_max")
+
+    def __init__(self):
+        self._counts = [0] * _BUCKETS
+        self._sum = 0
+        self._max = 0
+
+    def record(self, ns: int) -> None:
+        # то же, что _bucket_index(), но без вызова функции: запись стоит на горячем пути воркера
+        if ns < 2 * _SUB:
+            index = ns if ns > 0 else 0
+        else:
+            shift = ns.bit_length() - _SUB_BITS - 1
+            index = shift * _SUB + (ns >> shift)
+            if index >= _BUCKETS:
+                index = _BUCKETS - 1
+        self._counts[index] += 1
+        self._sum += ns
+        if ns > self._max:
+            self._max = ns
+
+    def merge(self, other: "LatencyHistogram") -> None:
+        counts = self._counts
+        for index, count in enumerate(other._counts):
+            if count:
+                counts[index] += count
+        self._sum += other._sum
+        self._max = max(self._max, other._max)
+
+    def count(self) -> int:
+        return sum(self._counts)
+
+    def quantile(self, q: float) -> float:
+        """
+        Returns:
+            Верхняя граница корзины, в которую попадает квантиль q (в секундах; 0.0 - значений нет).
+        """
+        total = self.count()
+        if total == 0:
+            return 0.0
+        rank = q * total
+        seen = 0
+        for index, count in enumerate(self._counts):
+            seen += count
+            if count and seen >= rank:
+                return min(_bucket_upper(index), self._max) / 1e9
+        return self._max / 1e9
+
+    def snapshot(self) -> "LatencySnapshot":
+        return LatencySnapshot(
+            count=self.count(),
+            sum=self._sum / 1e9,
+            max=self._max / 1e9,
+            p50=self.quantile(0.5),
+            p90=self.quantile(0.9),
+            p99=self.quantile(0.99),
+        )
+
+
+class StepMetrics:
+    """
+    Счётчики одного шага.
+
+    Attrs:
+        calls: Вызовы Step.start() (начатые Task и вызовы слитых шагов).
+        items: Значения, выданные шагом (одно на значение, сколько бы ветвей его ни получило).
+        errors: Вызовы, завершившиеся TaskRuntimeError.
+        step_time: Время внутри start() / next() генератора на одно значение.
+        queue_wait: Время, которое Task шага провёл в очереди.
+    """
+
+    __slots__ = ("calls", "items", "errors", "step_time", "queue_wait")
+
+    def __init__(self):
+        self.calls = 0
+        self.items = 0
+        self.errors = 0
+        self.step_time = LatencyHistogram()
+        self.queue_wait = LatencyHistogram()
+
+    def merge(self, other: "StepMetrics") -> None:
+        self.calls += other.calls
+        self.items += other.items
+        self.errors += other.errors
+        self.step_time.merge(other.step_time)
+        self.queue_wait.merge(other.queue_wait)
+
+
+class MetricsRecorder:
+    """
+    Счётчики одного воркера. Пишет в них только сам воркер, поэтому запись обходится без блокировок,
+    а RuntimeMetrics.snapshot() складывает счётчики всех воркеров.
+
+    Значения шагов (и вызовы слитых шагов, см. PlanSlot.fused) воркер получает от задачи:
+    счётчики передаются в Task.step() как StepObserver.
+    """
+
+    __slots__ = ("_steps", "busy")
+
+    def __init__(self):
+        self._steps: Dict[Type[Step], StepMetrics] = {}
+        self.busy = False
+
+    def begin(self, task: Any, fresh: bool, now: int) -> StepMetrics:
+        """
+        Отмечает начало хода воркера над task.
+
+        Args:
+            fresh: Не начата ли задача (ход вызовет Step.start()).
+            now: Текущее time.perf_counter_ns() (воркер отсчитывает от него и время шага).
+
+        Returns:
+            Счётчики шага задачи.
+        """
+        self.busy = True
+        metrics = self._get(task.get_step())
+
+        queued_at = task.get_queued_at()
+        if queued_at:
+            metrics.queue_wait.record(now - queued_at)
+        if fresh:
+            metrics.calls += 1
+        return metrics
+
+    def on_call(self, step: Type[Step]) -> None:
+        self._get(step).calls += 1
+
+    def on_value(self, step: Type[Step], elapsed: int) -> None:
+        metrics = self._get(step)
+        metrics.items += 1
+        metrics.step_time.record(elapsed)
+
+    def on_error(self, step: Type[Step]) -> None:
+        self._get(step).errors += 1
+
+    def finish(self, children: Sequence[Any], parent: Optional[Any] = None) -> None:
+        """
+        Отмечает конец хода воркера (до того, как задачи попадут в очередь).
+
+        Args:
+            children: Порождённые задачи, которые воркер кладёт в очередь.
+            parent: Незавершённая задача, которая возвращается в очередь.
+        """
+        now = perf_counter_ns()
+        for task in children:
+            task.mark_queued(now)
+        if parent is not None:
+            parent.mark_queued(now)
+        self.busy = False
+
+    def get_steps(self) -> Dict[Type[Step], StepMetrics]:
+        return self._steps
+
+    def _get(self, step: Type[Step]) -> StepMetrics:
+        metrics = self._steps.get(step)
+        if metrics is None:
+            metrics = self._steps[step] = StepMetrics()
+        return metrics
+
+
+class RuntimeMetrics:
+    """
+    Метрики Runtime: счётчики шагов всех воркеров (см. MetricsRecorder) и сборка снимка.
+    """
+
+    def __init__(self):
+        self._lock = Lock()
+        self._recorders: List[MetricsRecorder] = []
+
+    def create_recorder(self) -> MetricsRecorder:
+        """
+        Returns:
+            Счётчики для нового воркера.
+        """
+        recorder = MetricsRecorder()
+        with self._lock:
+            self._recorders.append(recorder)
+        return recorder
+
+    def snapshot(
+        self,
+        queue_size: int,
+        generation_limit: int,
+        workers: int,
+        full_wait_time: float,
+    ) -> "MetricsSnapshot":
+        """
+        Складывает счётчики воркеров в снимок (воркеры при этом не останавливаются,
+        поэтому значения разных счётчиков могут расходиться на несколько последних записей).
+        """
+        with self._lock:
+            recorders = list(self._recorders)
+
+        merged: Dict[Type[Step], StepMetrics] = {}
+        for recorder in recorders:
+            for step, metrics in list(recorder.get_steps().items()):
+                total = merged.get(step)
+                if total is None:
+                    total = merged[step] = StepMetrics()
+                total.merge(metrics)
+
+        return MetricsSnapshot(
+            steps={
+                step.__qualname__: StepSnapshot(
+                    calls=metrics.calls,
+                    items=metrics.items,
+                    errors=metrics.errors,
+                    step_time=metrics.step_time.snapshot(),
+                    queue_wait=metrics.queue_wait.snapshot(),
+                )
+                for step, metrics in merged.items()
+            },
+            queue_size=queue_size,
+            generation_limit=generation_limit,
+            busy_workers=sum(recorder.busy for recorder in recorders),
+            workers=workers,
+            full_wait_time=full_wait_time,
+        )
+
+
+@dataclass(frozen=True)
+class LatencySnapshot:
+    """
+    Сводка гистограммы длительностей (в секундах).
+    """
+
+    count: int
+    sum: float
+    max: float
+    p50: float
+    p90: float
+    p99: float
+
+
+@dataclass(frozen=True)
+class StepSnapshot:
+    """
+    Метрики шага (см. StepMetrics).
+    """
+
+    calls: int
+    items: int
+    errors: int
+    step_time: LatencySnapshot
+    queue_wait: LatencySnapshot
+
+
+@dataclass(frozen=True)
+class MetricsSnapshot:
+    """
+    Снимок метрик Runtime (см. Runtime.get_metrics()).
+
+    Attrs:
+        steps: Имя шага (__qualname__) -> его метрики. Пусто, если RuntimeConfig.METRICS выключен.
+        queue_size: Задач в очереди.
+        generation_limit: Текущий лимит генерации задач за ход воркера.
+        busy_workers: Воркеров, исполняющих задачу в момент снимка.
+        workers: Запущенных воркеров.
+        full_wait_time: Суммарное время, которое задачи провели припаркованными (см. RuntimeConfig.STRICT_TASK_LIMIT).
+    """
+
+    steps: Dict[str, StepSnapshot]
+    queue_size: int
+    generation_limit: int
+    busy_workers: int
+    workers: int
+    full_wait_time: float
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+    def to_json(self, indent: Optional[int] = None) -> str:
+        return json.dumps(self.to_dict(), ensure_ascii=False, indent=indent)
+
+    def to_prometheus(self, prefix: str = "fiber") -> str:
+        """
+        Returns:
+            Снимок в текстовом формате Prometheus (гистограммы - как summary с квантилями).
+        """
+        lines: List[str] = []
+
+        def metric(name: str, kind: str, help_text: str) -> str:
+            full_name = f"{prefix}_{name}"
+            lines.append(f"# HELP {full_name} {help_text}")
+            lines.append(f"# TYPE {full_name} {kind}")
+            return full_name
+
+        for attr, name, help_text in (
+            ("calls", "step_calls_total", "Вызовы Step.start()."),
+            ("items", "step_items_total", "Значения, выданные шагом."),
+            ("errors", "step_errors_total", "Вызовы шага, завершившиеся ошибкой."),
+        ):
+            full_name = metric(name, "counter", help_text)
+            for step, snapshot in self.steps.items():
+                lines.append(
+                    f"{full_name}{{step={_label(step)}}} {getattr(snapshot, attr)}"
+                )
+
+        for attr, name, help_text in (
+            (
+                "step_time",
+                "step_duration_seconds",
+                "Время внутри start() / next() на одно значение.",
+            ),
+            ("queue_wait", "step_queue_wait_seconds", "Время Task шага в очереди."),
+        ):
+            full_name = metric(name, "summary", help_text)
+            for step, snapshot in self.steps.items():
+                latency: LatencySnapshot = getattr(snapshot, attr)
+                label = _label(step)
+                for q, value in zip(
+                    _QUANTILES, (latency.p50, latency.p90, latency.p99)
+                ):
+                    lines.append(
+                        f'{full_name}{{step={label},quantile="{q}"}} {value!r}'
+                    )
+                lines.append(f"{full_name}_sum{{step={label}}} {latency.sum!r}")
+                lines.append(f"{full_name}_count{{step={label}}} {latency.count}")
+
+        for attr, name, kind, help_text in (
+            ("queue_size", "queue_size", "gauge", "Задач в очереди."),
+            (
+                "generation_limit",
+                "generation_limit",
+                "gauge",
+                "Лимит генерации задач за ход воркера.",
+            ),
+            ("busy_workers", "busy_workers", "gauge", "Занятые воркеры."),
+            ("workers", "workers", "gauge", "Запущенные воркеры."),
+            (
+                "full_wait_time",
+                "full_wait_seconds_total",
+                "counter",
+                "Время ожидания места в очереди.",
+            ),
+        ):
+            full_name = metric(name, kind, help_text)
+            lines.append(f"{full_name} {getattr(self, attr)!r}")
+
+        return "\n".join(lines) + "\n"
+
+
+def _label(value: str) -> str:
+    escaped = value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+    return f'"{escaped}"'
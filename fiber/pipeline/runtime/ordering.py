@@ -0,0 +1,241 @@
+from bisect import bisect_left, insort
+from heapq import heappop, heappush
+from threading import Lock
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from fiber.logging import get_kernel_logger
+from fiber.pipeline.task import ExecutionPlan, Task, TaskDone, TaskRuntimeError
+
+# путь задачи в порядке исходных данных (см. Task.get_path())
+_Path = Tuple[int, ...]
+# шаг с Step.ordered: (план, индекс шага)
+_Slot = Tuple[ExecutionPlan, int]
+
+
+def has_ordered_steps(tasks: Iterable[Task]) -> bool:
+    """
+    Проверяет, есть ли в цепочках задач шаги с Step.ordered.
+    """
+    return any(task.get_plan().has_ordered_steps() for task in tasks)
+
+
+class _Order:
+    """
+    Порядок одного шага с Step.ordered.
+
+    Attrs:
+        live: Пути незавершённых задач, значения которых ещё могут дойти до шага (отсортированы).
+        buffer: Дошедшие до шага задачи, ждущие предыдущих по порядку (куча по пути).
+    """
+
+    __slots__ = ("live", "live_set", "buffer")
+
+    def __init__(self) -> None:
+        self.live: List[_Path] = []
+        self.live_set: Set[_Path] = set()
+        self.buffer: List[Tuple[_Path, Task]] = []
+
+    def add(self, path: _Path) -> None:
+        insort(self.live, path)
+        self.live_set.add(path)
+
+    def remove(self, path: _Path) -> None:
+        del self.live[bisect_left(self.live, path)]
+        self.live_set.discard(path)
+
+    def is_ready(self) -> bool:
+        """
+        Returns:
+            Может ли первая в буфере задача исполниться: раньше неё по порядку не осталось незавершённых задач,
+            кроме её предков (их следующие значения идут уже после неё).
+        """
+        if not self.buffer:
+            return False
+        path = self.buffer[0][0]
+        ancestors = sum(1 for end in range(1, len(path)) if path[:end] in self.live_set)
+        return bisect_left(self.live, path) == ancestors
+
+
+class Reorderer:
+    """
+    Стадия упорядочивания: задачи шагов с Step.ordered не кладутся в очередь, а ждут в буфере,
+    пока не завершатся все задачи, чьи значения идут раньше них в порядке исходных данных.
+
+    Порядок задаётся путями (см. Task.get_path()): стартовая задача получает номер подачи,
+    а каждая порождённая - путь родителя и номер значения. Для каждого такого шага стадия знает
+    пути незавершённых задач, значения которых до него ещё дойдут (PlanSlot.feeds), поэтому
+    предыдущие шаги исполняются параллельно, а упорядочиваются только значения самого шага.
+
+    Готовые задачи исполняет по одной тот воркер, который их освободил (остальные в это время
+    только пополняют буфер), поэтому шаг получает значения строго по порядку.
+    """
+
+    def __init__(
+        self,
+        limit: int,
+        put: Callable[[List[Task]], None],
+        on_absorb: Optional[Callable[[int], None]] = None,
+    ):
+        """
+        Args:
+            limit: Сколько задач может ждать в буфере шага (см. RuntimeConfig.REORDER_LIMIT).
+            put: Кладёт задачи, порождённые упорядоченными шагами, в очередь.
+            on_absorb: Вызывается воркером с количеством забранных в буфер задач
+                (например для учёта мест жёсткого предела: задачи в буфере места в очереди не занимают).
+        """
+        self._logger = get_kernel_logger().getChild("reorderer")
+        self._limit = limit
+        self._put = put
+        self._on_absorb = on_absorb
+        self._lock = Lock()
+        self._orders: Dict[_Slot, _Order] = {}
+        self._seeded = 0
+        self._draining = False
+
+    def seed(self, task: Task) -> None:
+        """
+        Отмечает стартовую задачу: она получает номер подачи и отслеживается,
+        если её значения доходят до шагов с Step.ordered.
+
+        Raises:
+            ValueError: если шаг с Step.ordered или шаги перед ним обрабатывают значения пачками
+                (start_batch()) или агрегируют: такие задачи теряют место в порядке.
+        """
+        plan = task.get_plan()
+        if not plan.has_ordered_steps():
+            return
+        for slot in plan.slots:
+            if (slot.is_ordered or slot.feeds) and (slot.is_batch or slot.is_aggregate):
+                raise ValueError(
+                    f"Шаг {slot.step.__name__}: start_batch() и AggregateStep несовместимы "
+                    "с упорядочиванием (Step.ordered) на своём пути."
+                )
+
+        with self._lock:
+            path = (self._seeded,)
+            self._seeded += 1
+            task.set_path(path)
+            self._track(task, path)
+
+    def allowance(self, task: Task, limit: int) -> int:
+        """
+        Returns:
+            Сколько значений задача может выдать за ход воркера: 0, если буфер шага, до которого они дойдут,
+            полон, а значения задачи идут позже уже ждущих в нём (иначе limit).
+        """
+        feeds = task.get_plan()[task.get_index()].feeds
+        path = task.get_next_path()
+        if not feeds or path is None:
+            return limit
+        plan = task.get_plan()
+        with self._lock:
+            for index in feeds:
+                order = self._orders.get((plan, index))
+                if (
+                    order is not None
+                    and len(order.buffer) >= self._limit
+                    and path > order.buffer[0][0]
+                ):
+                    return 0
+        return limit
+
+    def absorb(self, parent: Task, children: List[Task]) -> List[Task]:
+        """
+        Отмечает порождённые задачи и завершение родителя, забирает в буфер задачи шагов с Step.ordered
+        и исполняет те, чья очередь подошла.
+
+        Returns:
+            Остальные задачи (их нужно положить в очередь как обычно).
+        """
+        if parent.get_path() is None:
+            return children
+
+        with self._lock:
+            rest = self._take(parent, children)
+            absorbed = len(children) - len(rest)
+            drain = not self._draining and self._is_ready()
+            if drain:
+                self._draining = True
+
+        if absorbed and self._on_absorb is not None:
+            self._on_absorb(absorbed)
+        if drain:
+            self._drain()
+        return rest
+
+    def _take(self, parent: Task, children: List[Task]) -> List[Task]:
+        """
+        Вызывается под self._lock.
+        """
+        plan = parent.get_plan()
+        rest = []
+        for child in children:
+            path = child.get_path()
+            index = child.get_index()
+            if plan[index].is_ordered:
+                heappush(self._get_order(plan, index).buffer, (path, child))  # type: ignore[arg-type]
+            else:
+                rest.append(child)
+            self._track(child, path)  # type: ignore[arg-type]
+        if parent.is_done():
+            for index in plan[parent.get_index()].feeds:
+                self._get_order(plan, index).remove(parent.get_path())  # type: ignore[arg-type]
+        return rest
+
+    def _track(self, task: Task, path: _Path) -> None:
+        plan = task.get_plan()
+        for index in plan[task.get_index()].feeds:
+            self._get_order(plan, index).add(path)
+
+    def _get_order(self, plan: ExecutionPlan, index: int) -> _Order:
+        order = self._orders.get((plan, index))
+        if order is None:
+            order = self._orders[(plan, index)] = _Order()
+        return order
+
+    def _is_ready(self) -> bool:
+        return any(order.is_ready() for order in self._orders.values())
+
+    def _drain(self) -> None:
+        """
+        Исполняет готовые задачи по порядку, пока они есть (пока идёт исполнение, другие воркеры
+        только пополняют буфер).
+        """
+        while True:
+            with self._lock:
+                task = None
+                for order in self._orders.values():
+                    if order.is_ready():
+                        task = heappop(order.buffer)[1]
+                        break
+                if task is None:
+                    self._draining = False
+                    return
+
+            children = self._execute(task)
+            with self._lock:
+                rest = self._take(task, children)
+            if rest:
+                self._put(rest)
+            task.recycle()
+
+    def _execute(self, task: Task) -> List[Task]:
+        """
+        Исполняет задачу до конца.
+
+        Returns:
+            Порождённые задачи.
+        """
+        children = []
+        while True:
+            try:
+                children.append(task.step())
+            except TaskDone:
+                return children
+            except TaskRuntimeError:
+                self._logger.critical(
+                    "Ошибка во время исполнения. Сломаный Task отброшен."
+                )
+                # ошибка слитого шага отбрасывает только значение (см. Task._run_fused())
+                if task.is_done():
+                    return children
@@ -0,0 +1,373 @@
+import json
+import os
+import sys
+import time
+from dataclasses import dataclass
+from threading import Event, Lock, Thread
+from time import perf_counter
+from types import CodeType, FrameType
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, Type
+
+from fiber.logging import get_kernel_logger
+from fiber.step import Step, is_batch_step
+
+# образцы вне шагов (ожидание очереди, планирование, пачки) - накладные расходы самого Runtime
+RUNTIME_FRAME = "[runtime]"
+
+_STEP_METHODS = ("start", "start_batch")
+
+# (функция, файл, строка)
+_Frame = Tuple[str, str, int]
+
+
+# шаг задачи, которую воркер исполняет сейчас (None - между задачами)
+CurrentStep = Callable[[], Optional[Type[Step]]]
+
+
+class _ThreadProfile:
+    __slots__ = ("name", "cpu_clock", "last_cpu", "last_sample", "current", "stacks")
+
+    def __init__(
+        self,
+        name: str,
+        cpu_clock: Optional[int],
+        now: float,
+        current: Optional[CurrentStep],
+    ):
+        self.name = name
+        self.cpu_clock = cpu_clock
+        self.last_cpu = _thread_cpu(cpu_clock)
+        self.last_sample = now
+        self.current = current
+        # индексы кадров стека (от внешнего к внутреннему) -> [образцов, время, которое они представляют]:
+        # память растёт с числом разных стеков, а не с длительностью профилирования
+        self.stacks: Dict[Tuple[int, ...], List[float]] = {}
+
+
+class SamplingProfiler:
+    """
+    Сэмплирующий профилировщик воркеров-потоков Runtime: раз в interval секунд снимает стеки
+    всех зарегистрированных потоков (sys._current_frames()) и относит каждый образец к шагу,
+    чей start() / start_batch() исполняется в потоке. Шаги не нужно изменять.
+
+    CPU-время потока между образцами (clock потока, где он доступен) относится к шагу образца,
+    поэтому шаг, ждущий I/O, набирает образцы (время по часам), но не CPU-время.
+
+    Шаг определяется по коду кадра. Унаследованный start() общий у нескольких шагов - тогда шаг
+    берётся из задачи, которую исполняет воркер (см. register()): кадры чужих потоков не читаются.
+
+    Результат (см. stop()):
+        - <path>.collapsed - свёрнутые стеки (flamegraph.pl, inferno, speedscope);
+        - <path>.speedscope.json - профиль по потокам в формате speedscope (образцы с одинаковым стеком
+          сложены в один, поэтому профиль показывает доли времени, а не порядок во времени);
+        - ProfileSummary - образцы, время и CPU-время по шагам.
+    """
+
+    def __init__(self, path: str, interval: float = 0.005):
+        """
+        Args:
+            path: Префикс путей файлов профиля.
+            interval: Период снятия стеков (в секундах).
+        """
+        if interval <= 0:
+            raise ValueError(f"interval должен быть больше 0, а не {interval}.")
+
+        self._path = path
+        self._interval = interval
+        self._logger = get_kernel_logger().getChild("profiler")
+
+        self._lock = Lock()
+        self._threads: Dict[int, _ThreadProfile] = {}
+        # код start() / start_batch() -> шаги, которые его исполняют (несколько - код унаследован)
+        self._codes: Dict[CodeType, Tuple[Type[Step], ...]] = {}
+        self._frames: Dict[_Frame, int] = {}
+        self._stacks: Dict[Tuple[_Frame, ...], Tuple[int, ...]] = {}
+        self._steps: Dict[str, List[float]] = {}
+        self._stop = Event()
+        self._thread: Optional[Thread] = None
+        self._started = 0.0
+        self._elapsed = 0.0
+
+    def watch(self, steps: Iterable[Type[Step]]) -> None:
+        """
+        Запоминает код start() / start_batch() шагов: по нему образец относится к шагу.
+        """
+        with self._lock:
+            for step in steps:
+                for method in _STEP_METHODS:
+                    if method == "start_batch" and not is_batch_step(step):
+                        continue
+                    code = _code_of(getattr(step, method, None))
+                    if code is None:
+                        continue
+                    owners = self._codes.get(code, ())
+                    if step not in owners:
+                        self._codes[code] = owners + (step,)
+
+    def register(
+        self, ident: int, name: str, current: Optional[CurrentStep] = None
+    ) -> None:
+        """
+        Добавляет поток воркера к сэмплируемым (вызывается из запущенного потока или после его запуска).
+
+        Args:
+            current: Шаг задачи, которую сейчас исполняет воркер (по нему различаются шаги
+                с унаследованным start(); None - берётся первый из таких шагов).
+        """
+        cpu_clock = None
+        if hasattr(time, "pthread_getcpuclockid"):
+            try:
+                cpu_clock = time.pthread_getcpuclockid(ident)
+            except OSError:
+                cpu_clock = None
+        with self._lock:
+            self._threads[ident] = _ThreadProfile(
+                name, cpu_clock, perf_counter(), current
+            )
+
+    def start(self) -> None:
+        self._started = perf_counter()
+        self._thread = Thread(target=self._run, name="fiber-profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> "ProfileSummary":
+        """
+        Останавливает сэмплирование и записывает файлы профиля.
+
+        Returns:
+            Сводка по шагам.
+        """
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        self._elapsed = perf_counter() - self._started
+
+        with self._lock:
+            self._write_collapsed()
+            self._write_speedscope()
+            summary = self.get_summary()
+        self._logger.info(f"Профиль записан в {self._path}.*:\n{summary.to_text()}")
+        return summary
+
+    def get_summary(self) -> "ProfileSummary":
+        steps = {
+            name: StepProfile(
+                samples=int(stats[0]), wall_time=stats[1], cpu_time=stats[2]
+            )
+            for name, stats in self._steps.items()
+        }
+        return ProfileSummary(
+            steps=steps,
+            samples=sum(step.samples for step in steps.values()),
+            interval=self._interval,
+            elapsed=self._elapsed,
+        )
+
+    def _run(self) -> None:
+        while not self._stop.wait(self._interval):
+            self._sample()
+
+    def _sample(self) -> None:
+        frames = sys._current_frames()
+        now = perf_counter()
+        with self._lock:
+            for ident, profile in self._threads.items():
+                frame = frames.get(ident)
+                if frame is None:
+                    # поток воркера завершился
+                    continue
+
+                cpu = _thread_cpu(profile.cpu_clock)
+                wall = now - profile.last_sample
+                spent = max(0.0, cpu - profile.last_cpu)
+                profile.last_sample, profile.last_cpu = now, cpu
+
+                step_name, stack = self._unwind(frame, profile.current)
+                stats = self._steps.get(step_name)
+                if stats is None:
+                    stats = self._steps[step_name] = [0, 0.0, 0.0]
+                stats[0] += 1
+                stats[1] += wall
+                stats[2] += spent
+
+                indexes = self._intern(stack)
+                sample = profile.stacks.get(indexes)
+                if sample is None:
+                    sample = profile.stacks[indexes] = [0, 0.0]
+                sample[0] += 1
+                sample[1] += wall
+            del frames
+
+    def _unwind(
+        self, frame: Optional[FrameType], current: Optional[CurrentStep]
+    ) -> Tuple[str, Tuple[_Frame, ...]]:
+        """
+        Returns:
+            Имя шага образца и стек от кадра шага (или от корня потока, если шаг не исполняется)
+            до текущего кадра. Корень стека - имя шага.
+        """
+        stack: List[_Frame] = []
+        step: Optional[Type[Step]] = None
+        depth = 0
+        while frame is not None:
+            code = frame.f_code
+            stack.append(
+                (
+                    getattr(code, "co_qualname", code.co_name),
+                    code.co_filename,
+                    frame.f_lineno,
+                )
+            )
+            owners = self._codes.get(code)
+            if owners is not None:
+                # внешний кадр шага - шаг, который исполняет воркер
+                step = _find_step(owners, current)
+                depth = len(stack)
+            frame = frame.f_back
+
+        if step is None:
+            root = RUNTIME_FRAME
+        else:
+            root = step.__qualname__
+            del stack[depth:]
+        stack.append((root, "", 0))
+        stack.reverse()
+        return root, tuple(stack)
+
+    def _intern(self, stack: Tuple[_Frame, ...]) -> Tuple[int, ...]:
+        indexes = self._stacks.get(stack)
+        if indexes is None:
+            frames = self._frames
+            indexes = self._stacks[stack] = tuple(
+                frames.setdefault(frame, len(frames)) for frame in stack
+            )
+        return indexes
+
+    def _write_collapsed(self) -> None:
+        names = [_frame_name(frame) for frame in self._frames]
+        counts: Dict[Tuple[int, ...], int] = {}
+        for profile in self._threads.values():
+            for indexes, (count, _) in profile.stacks.items():
+                counts[indexes] = counts.get(indexes, 0) + int(count)
+
+        with open(f"{self._path}.collapsed", "w", encoding="utf-8") as file:
+            for sample, count in sorted(counts.items(), key=lambda item: -item[1]):
+                file.write(f"{';'.join(names[i] for i in sample)} {count}\n")
+
+    def _write_speedscope(self) -> None:
+        profiles = []
+        for ident, profile in self._threads.items():
+            if not profile.stacks:
+                continue
+            weights = [weight for _, weight in profile.stacks.values()]
+            profiles.append(
+                {
+                    "type": "sampled",
+                    "name": f"{profile.name} ({ident})",
+                    "unit": "seconds",
+                    "startValue": 0,
+                    "endValue": sum(weights),
+                    "samples": list(profile.stacks),
+                    "weights": weights,
+                }
+            )
+
+        document = {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "exporter": "fiber",
+            "name": os.path.basename(self._path),
+            "activeProfileIndex": 0,
+            "shared": {"frames": [_speedscope_frame(frame) for frame in self._frames]},
+            "profiles": profiles,
+        }
+        with open(f"{self._path}.speedscope.json", "w", encoding="utf-8") as file:
+            json.dump(document, file, ensure_ascii=False)
+
+
+@dataclass(frozen=True)
+class StepProfile:
+    """
+    Attrs:
+        samples: Образцы, в которых исполнялся шаг.
+        wall_time: Время (по часам) между этими образцами и предыдущими образцами потоков.
+        cpu_time: CPU-время потоков за это же время (0.0, если clock потока недоступен).
+    """
+
+    samples: int
+    wall_time: float
+    cpu_time: float
+
+
+@dataclass(frozen=True)
+class ProfileSummary:
+    """
+    Сводка профиля (см. SamplingProfiler).
+
+    Attrs:
+        steps: Имя шага (__qualname__) или RUNTIME_FRAME -> его профиль.
+        samples: Всего образцов (по всем потокам).
+        interval: Период снятия стеков.
+        elapsed: Длительность профилирования.
+    """
+
+    steps: Dict[str, StepProfile]
+    samples: int
+    interval: float
+    elapsed: float
+
+    def to_text(self) -> str:
+        """
+        Returns:
+            Таблица шагов по убыванию CPU-времени.
+        """
+        total_cpu = sum(step.cpu_time for step in self.steps.values()) or 1.0
+        lines = [
+            f"{'step':<32} | {'samples':>8} | {'wall, s':>9} | {'cpu, s':>9} | cpu %"
+        ]
+        for name, step in sorted(
+            self.steps.items(), key=lambda item: (-item[1].cpu_time, -item[1].samples)
+        ):
+            lines.append(
+                f"{name:<32} | {step.samples:>8} | {step.wall_time:>9.3f} | "
+                f"{step.cpu_time:>9.3f} | {step.cpu_time / total_cpu:>5.1%}"
+            )
+        return "\n".join(lines)
+
+
+def _code_of(method: Optional[Callable[..., Any]]) -> Optional[CodeType]:
+    func = getattr(method, "__func__", method)
+    return getattr(func, "__code__", None)
+
+
+def _find_step(
+    owners: Tuple[Type[Step], ...], current: Optional[CurrentStep]
+) -> Type[Step]:
+    if len(owners) == 1 or current is None:
+        return owners[0]
+    # код унаследован несколькими шагами - шаг задачи воркера (если исполняется один из них)
+    step = current()
+    return step if step in owners else owners[0]
+
+
+def _thread_cpu(cpu_clock: Optional[int]) -> float:
+    if cpu_clock is None:
+        return 0.0
+    try:
+        return time.clock_gettime(cpu_clock)
+    except OSError:
+        # поток завершился
+        return 0.0
+
+
+def _frame_name(frame: _Frame) -> str:
+    name, file, line = frame
+    if not file:
+        return name
+    return f"{name} ({os.path.basename(file)}:{line})"
+
+
+def _speedscope_frame(frame: _Frame) -> Dict[str, Any]:
+    name, file, line = frame
+    if not file:
+        return {"name": name}
+    return {"name": name, "file": file, "line": line}
@@ -0,0 +1,106 @@
+from abc import ABC, abstractmethod
+from typing import Any, Optional, Sequence
+
+from tsdeque import ThreadSafeDeque
+
+from fiber.pipeline.task import Task
+from fiber.pipeline.runtime.deque.priority import PriorityDeque
+
+
+class SchedulingPolicy(ABC):
+    """
+    Политика планирования: в каком порядке воркеры берут задачи из очереди
+    и куда кладут порождённые задачи и недоделанного родителя.
+    """
+
+    def create_deque(self) -> Any:
+        """
+        Создаёт очередь, с которой умеет работать политика.
+        """
+        return ThreadSafeDeque()
+
+    @abstractmethod
+    def take(self, deque: Any) -> Optional[Task]:
+        """
+        Забирает следующую задачу из очереди (блокируется, если очередь пуста).
+        """
+
+    @abstractmethod
+    def schedule(
+        self, deque: Any, parent: Optional[Task], children: Sequence[Task]
+    ) -> None:
+        """
+        Кладёт в очередь порождённые задачи и родителя (если он ещё не завершён).
+        """
+
+    def stop(self, deque: Any) -> None:
+        """
+        Кладёт сигнал остановки одного воркера (None) так, чтобы его забрали раньше задач.
+        """
+        deque.put(None)
+
+
+class FifoPolicy(SchedulingPolicy):
+    """
+    Очередь (по умолчанию): задачи исполняются в порядке появления,
+    генератор-источник разворачивается в ширину.
+    """
+
+    def take(self, deque: Any) -> Optional[Task]:
+        return deque.getleft()
+
+    def schedule(
+        self, deque: Any, parent: Optional[Task], children: Sequence[Task]
+    ) -> None:
+        for child in children:
+            deque.put(child)
+        if parent is not None:
+            deque.put(parent)
+
+    def stop(self, deque: Any) -> None:
+        deque.putleft(None)
+
+
+class LifoPolicy(SchedulingPolicy):
+    """
+    Стек (обход в глубину): порождённые задачи доводятся до последнего шага раньше,
+    чем родитель выдаст следующее значение. Держит в очереди минимум промежуточных данных
+    и быстрее выдаёт первый результат. Лучше всего работает с TASKS_PER_ITER=1.
+    """
+
+    def take(self, deque: Any) -> Optional[Task]:
+        return deque.get()
+
+    def schedule(
+        self, deque: Any, parent: Optional[Task], children: Sequence[Task]
+    ) -> None:
+        # родитель под детьми, первый ребёнок - на вершине
+        if parent is not None:
+            deque.put(parent)
+        for child in reversed(children):
+            deque.put(child)
+
+
+class DepthPriorityPolicy(SchedulingPolicy):
+    """
+    Приоритет по глубине: первой берётся задача, которой осталось меньше всего шагов до конца цепочки.
+    """
+
+    def create_deque(self) -> PriorityDeque:
+        return PriorityDeque(key=self._priority)
+
+    def take(self, deque: Any) -> Optional[Task]:
+        return deque.getleft()
+
+    def schedule(
+        self, deque: Any, parent: Optional[Task], children: Sequence[Task]
+    ) -> None:
+        for child in children:
+            deque.put(child)
+        if parent is not None:
+            deque.put(parent)
+
+    @staticmethod
+    def _priority(item: Optional[Task]) -> int:
+        # сигнал остановки (None) забирается раньше задач
+        return item.steps_left() if item is not None else 0
@@ -0,0 +1,128 @@
+import asyncio
+from threading import Condition, Event, Thread
+from typing import Any, AsyncIterable, Callable, Iterable, Iterator, Optional, Union
+
+from fiber.logging import get_kernel_logger
+from fiber.pipeline.task import Task
+
+Seeds = Union[Iterable[Task], AsyncIterable[Task]]
+
+
+def is_lazy(tasks: Seeds) -> bool:
+    """
+    Проверяет, подаются ли стартовые задачи лениво: итератор (например генератор) или асинхронный
+    источник - поток задач, который нельзя (или дорого) собрать целиком. Остальные конечные наборы
+    (list, tuple, set, dict.values() ...) собираются в список и кладутся в очередь сразу.
+    """
+    return isinstance(tasks, (Iterator, AsyncIterable))
+
+
+class Seeder:
+    """
+    Ленивая подача стартовых задач: собственный поток (см. start()) берёт задачи из итератора
+    (или асинхронного итератора) поставщика по одной и кладёт в очередь, только когда в ней есть место -
+    под тем же пределом, что и порождённые задачи. Воркеры начинают работу сразу,
+    а в памяти не держится больше стартовых задач, чем помещается в очередь.
+    """
+
+    def __init__(
+        self,
+        tasks: Seeds,
+        put: Callable[[Any, Event], bool],
+        wake: Callable[[], None],
+        prepare: Optional[Callable[[Task], Any]] = None,
+    ):
+        """
+        Args:
+            tasks: Итератор или асинхронный итератор стартовых задач.
+            put: Кладёт элемент в очередь, дождавшись для него места (см. DequeEnviroment.seed_when_room());
+                ожидание прерывает установленное событие (False - элемент не положен).
+            wake: Будит ожидание в put() (см. DequeEnviroment.notify_room()).
+            prepare: Преобразует задачу в элемент очереди (например в дескриптор) перед подачей.
+        """
+        self._logger = get_kernel_logger().getChild("seeder")
+        self._tasks = tasks
+        self._put = put
+        self._wake = wake
+        self._prepare = prepare
+        self._changed = Condition()
+        self._seeded = 0
+        self._done = False
+        self._error: Optional[BaseException] = None
+        self._stopped = Event()
+        self._thread: Optional[Thread] = None
+
+    def get_flushes(self) -> int:
+        """
+        Returns:
+            Сколько стартовых задач подано в очередь.
+        """
+        return self._seeded
+
+    def get_error(self) -> Optional[BaseException]:
+        """
+        Returns:
+            Ошибка, которой завершилась подача (ошибка поставщика или неподходящая задача).
+        """
+        return self._error
+
+    def settle(self, flushes: int) -> bool:
+        """
+        Вызывается Runtime-ом после того, как очередь опустела. Ждёт, пока поставщик выдаст
+        следующую задачу или закончится.
+
+        Args:
+            flushes: get_flushes() до ожидания очереди.
+
+        Returns:
+            True - поставщик закончился, и все его задачи уже в очереди;
+            False - в очередь ушли новые задачи, её нужно дождаться ещё раз.
+        """
+        with self._changed:
+            self._changed.wait_for(lambda: self._done or self._seeded != flushes)
+            return self._done and self._seeded == flushes
+
+    def start(self) -> None:
+        self._thread = Thread(target=self._run, name="fiber-seeder", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stopped.set()
+        self._wake()
+        if self._thread is not None:
+            self._thread.join()
+
+    def _run(self) -> None:
+        try:
+            if isinstance(self._tasks, AsyncIterable):
+                asyncio.run(self._feed_async(self._tasks))
+            else:
+                for task in self._tasks:
+                    if not self._feed(task):
+                        break
+        except Exception as e:
+            self._error = e
+            self._logger.fatal(f"Подача стартовых задач прервана: {e}", exc_info=True)
+        finally:
+            with self._changed:
+                self._done = True
+                self._changed.notify_all()
+            self._logger.info(f"Подано стартовых задач: {self._seeded}.")
+
+    async def _feed_async(self, tasks: AsyncIterable[Task]) -> None:
+        async for task in tasks:
+            if not self._feed(task):
+                break
+
+    def _feed(self, task: Task) -> bool:
+        """
+        Returns:
+            False - подача остановлена (см. stop()).
+        """
+        item = task if self._prepare is None else self._prepare(task)
+        if not self._put(item, self._stopped):
+            return False
+        with self._changed:
+            self._seeded += 1
+            self._changed.notify_all()
+        return True
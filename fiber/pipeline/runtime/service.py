@@ -0,0 +1,228 @@
+from concurrent.futures import Future
+from threading import Lock, Thread
+from typing import Any, Dict, Hashable, List, Optional, Tuple, Union
+
+from fiber.logging import get_kernel_logger
+from fiber.pipeline.task import ExecutionPlan, Task, TaskBuilder
+from fiber.pipeline.task.plan import PipelineSteps
+from fiber.pipeline.runtime.config import RuntimeConfig
+from fiber.pipeline.runtime.deque.enviroment import DequeEnviroment
+from fiber.pipeline.runtime.deque.pools import PooledDequeEnviroment
+from fiber.pipeline.runtime.deque.stealing import StealingDequeEnviroment
+from fiber.pipeline.runtime.jobs import JobTracker
+from fiber.pipeline.runtime.metrics import MetricsSnapshot, RuntimeMetrics
+from fiber.pipeline.runtime.tracing import Tracer
+from fiber.pipeline.runtime.worker import TaskWorker
+
+
+class PersistentRuntime:
+    """
+    Долгоживущее ядро для множества небольших конвееров: воркеры запускаются один раз (см. start())
+    и ждут работы, а каждый конвеер отправляется отдельно (см. submit()) и завершается своим future.
+    Так не нужно создавать и останавливать потоки на каждый конвеер, как при Runtime.run().
+
+    Цепочка проверяется и компилируется один раз на набор шагов: повторные отправки тех же шагов
+    получают свой план (для подсчёта задач) с общими PlanSlot.
+
+    Пример:
+        >>> with PersistentRuntime(config) as runtime:
+        >>>     futures = [runtime.submit([Parse, Store], line) for line in lines]
+        >>>     wait(futures)
+    """
+
+    def __init__(self, config: RuntimeConfig):
+        """
+        Raises:
+            ValueError: если BACKEND="process" или заданы MIN_WORKERS/MAX_WORKERS или PROFILE_PATH.
+        """
+        if config.BACKEND != "thread":
+            raise ValueError('PersistentRuntime поддерживает только BACKEND="thread".')
+        if config.is_autoscaling() or config.PROFILE_PATH is not None:
+            raise ValueError(
+                "PersistentRuntime не поддерживает MIN_WORKERS/MAX_WORKERS и PROFILE_PATH."
+            )
+
+        self._logger = get_kernel_logger().getChild("service")
+        self._config = config
+        self._deque_environ: DequeEnviroment
+        if config.POOLS:
+            self._deque_environ = PooledDequeEnviroment(
+                deque_limit=config.TASK_LIMIT,
+                max_tasks_per_iter=config.TASKS_PER_ITER,
+                pools=config.POOLS,
+                policy=config.SCHEDULING,
+                strict_limit=config.STRICT_TASK_LIMIT,
+            )
+        else:
+            environ_cls = (
+                StealingDequeEnviroment if config.WORK_STEALING else DequeEnviroment
+            )
+            self._deque_environ = environ_cls(
+                deque_limit=config.TASK_LIMIT,
+                max_tasks_per_iter=config.TASKS_PER_ITER,
+                policy=config.SCHEDULING,
+                strict_limit=config.STRICT_TASK_LIMIT,
+            )
+
+        self._jobs = JobTracker()
+        self._metrics = RuntimeMetrics() if config.METRICS else None
+        self._tracer: Optional[Tracer] = None
+        if config.TRACE_FILE is not None:
+            self._tracer = Tracer(config.TRACE_FILE, config.TRACE_SAMPLE_RATIO)
+
+        self._plans_lock = Lock()
+        self._plans: Dict[Tuple[Hashable, bool, bool], ExecutionPlan] = {}
+        self._workers: List[Thread] = []
+        self._running = False
+
+    def start(self) -> "PersistentRuntime":
+        """
+        Запускает воркеров (повторный вызов ничего не меняет).
+        """
+        if self._running:
+            return self
+        self._logger.info("Создание Worker-ов...")
+        for _ in range(self._config.WORKERS):
+            self._start_worker()
+        for pool, size in self._config.POOLS.items():
+            for _ in range(size):
+                self._start_worker(pool)
+        self._running = True
+        self._logger.debug("Все воркеры успешно созданы и запущены.")
+        return self
+
+    def submit(
+        self, steps: PipelineSteps, payload: Any = None, fuse: bool = False
+    ) -> "Future[None]":
+        """
+        Отправляет конвеер на исполнение. Если в очереди нет места (TASK_LIMIT, см. DequeEnviroment.try_seed()),
+        ждёт его - так отправители не уходят вперёд воркеров.
+
+        Args:
+            steps: Шаги конвеера (как в PipelineBuilder.add_pipeline()).
+            payload: Входные данные первого шага. None - первый шаг принимает None, как в обычном конвеере.
+            fuse: Слить идущие подряд 1:1 шаги (см. TaskBuilder.build_from()).
+
+        Returns:
+            Future, который завершается, когда исполнены все задачи этой отправки, -
+            ошибкой первого упавшего шага, если такой был (задачи после ошибки доисполняются).
+
+        Raises:
+            TaskBuildError: если цепочка не прошла проверку.
+            ValueError: если Runtime не запущен, цепочка не помещается в жёсткий предел (STRICT_TASK_LIMIT), или в цепочке есть шаги с start_batch(), шаги-агрегаты
+                или шаги с Step.ordered (их задачи собираются вне очереди, и завершение отправки не отследить).
+        """
+        if not self._running:
+            raise ValueError("PersistentRuntime не запущен (см. start()).")
+
+        plan = self._get_plan(steps, payload is not None, fuse)
+        task = Task(plan, payload)
+        future: "Future[None]" = Future()
+        future.set_running_or_notify_cancel()
+        # отправка отслеживается до постановки в очередь: задачу сразу может забрать воркер
+        self._jobs.open(plan, future)
+        try:
+            self._deque_environ.seed_when_room(task)
+        except ValueError:
+            self._jobs.discard(plan)
+            raise
+        return future
+
+    def shutdown(self) -> None:
+        """
+        Дожидается всех отправленных конвееров и останавливает воркеров.
+        """
+        if not self._running:
+            return
+        deque = self._deque_environ.get_deque()
+        deque.join()
+        self._running = False
+
+        self._logger.info("Остановка Worker-ов...")
+        for _ in range(self._config.WORKERS):
+            deque.put(None)
+        for pool, size in self._config.POOLS.items():
+            for _ in range(size):
+                deque.put_to(pool, None)  # type: ignore[attr-defined]
+        for worker in self._workers:
+            worker.join()
+        self._workers.clear()
+        self._logger.info("Worker-ы остановлены.")
+
+        if self._tracer is not None:
+            self._tracer.close()
+
+    def get_metrics(self) -> MetricsSnapshot:
+        """
+        Returns:
+            Снимок метрик (см. Runtime.get_metrics()).
+        """
+        metrics = self._metrics or RuntimeMetrics()
+        return metrics.snapshot(
+            queue_size=len(self._deque_environ.get_deque()),
+            generation_limit=self._deque_environ.get_generation_limit(),
+            workers=sum(worker.is_alive() for worker in self._workers),
+            full_wait_time=self._deque_environ.get_full_wait_time(),
+        )
+
+    def __enter__(self) -> "PersistentRuntime":
+        return self.start()
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.shutdown()
+
+    def _get_plan(
+        self, steps: PipelineSteps, with_input: bool, fuse: bool
+    ) -> ExecutionPlan:
+        """
+        Returns:
+            Новый план отправки с общими для одинаковых шагов PlanSlot (и списком переиспользования задач).
+        """
+        key = (_freeze(steps), with_input, fuse)
+        with self._plans_lock:
+            compiled = self._plans.get(key)
+        if compiled is None:
+            compiled = TaskBuilder.build_plan(
+                steps,
+                strict_building_types=True,
+                strict_runtime_types=False,
+                fuse=fuse,
+                with_input=with_input,
+            )
+            if (
+                compiled.has_batch_steps()
+                or compiled.has_aggregate_steps()
+                or compiled.has_ordered_steps()
+            ):
+                raise ValueError(
+                    "PersistentRuntime не поддерживает шаги с start_batch(), шаги-агрегаты (AggregateStep) "
+                    "и шаги с Step.ordered."
+                )
+            if self._config.TASK_FREE_LIST:
+                compiled.enable_recycling(self._config.TASK_FREE_LIST)
+            with self._plans_lock:
+                compiled = self._plans.setdefault(key, compiled)
+
+        plan = ExecutionPlan(compiled.slots, compiled.is_strict())
+        plan.free_list = compiled.free_list
+        return plan
+
+    def _start_worker(self, pool: Optional[str] = None) -> None:
+        worker = TaskWorker(
+            self._deque_environ,
+            pool=pool,
+            metrics=(
+                self._metrics.create_recorder() if self._metrics is not None else None
+            ),
+            tracer=self._tracer,
+            jobs=self._jobs,
+        )
+        thread = Thread(target=worker.run, daemon=True)
+        thread.start()
+        self._workers.append(thread)
+
+
+def _freeze(steps: Union[PipelineSteps, Any]) -> Hashable:
+    if isinstance(steps, (list, tuple)):
+        return tuple(_freeze(item) for item in steps)
+    return steps
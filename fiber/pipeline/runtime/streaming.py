@@ -0,0 +1,128 @@
+from queue import Empty, Full, Queue
+from threading import Lock
+from typing import Any, Dict, Iterator, Optional, Tuple, Type
+
+from fiber.step import Step
+
+# как часто заблокированный на полном буфере шаг проверяет, не закрыт ли поток результатов
+PUT_INTERVAL = 0.05
+
+_END = object()
+
+
+class ResultStream:
+    """
+    Поток результатов конвееров: значения последних шагов (см. create_sink()) через ограниченный буфер
+    уходят вызывающему коду, который читает их итератором, пока конвееры ещё исполняются.
+
+    Пока поток не открыт (см. open()) или уже закрыт (см. close()), значения отбрасываются.
+    Полный буфер останавливает шаг-приёмник, а с ним и воркер: конвееры не уходят вперёд читателя
+    больше чем на размер буфера.
+    """
+
+    def __init__(self) -> None:
+        self._lock = Lock()
+        self._buffer: Optional[Queue] = None
+        self._closed = True
+
+    def open(self, maxsize: int) -> None:
+        """
+        Открывает поток с новым буфером.
+
+        Args:
+            maxsize: Сколько значений может ждать чтения (больше 0).
+
+        Raises:
+            ValueError: если maxsize меньше 1.
+        """
+        if maxsize < 1:
+            raise ValueError(f"maxsize должен быть больше 0, а не {maxsize}.")
+        with self._lock:
+            self._buffer = Queue(maxsize)
+            self._closed = False
+
+    def put(self, value: Any) -> None:
+        """
+        Кладёт значение в буфер (ждёт, пока в нём освободится место или поток закроется).
+        """
+        buffer = self._buffer
+        while not self._closed and buffer is not None:
+            try:
+                buffer.put(value, timeout=PUT_INTERVAL)
+                return
+            except Full:
+                continue
+
+    def finish(self) -> None:
+        """
+        Отмечает конец потока: читатель получит все значения из буфера, и итерация завершится.
+        """
+        buffer = self._buffer
+        while not self._closed and buffer is not None:
+            try:
+                buffer.put(_END, timeout=PUT_INTERVAL)
+                return
+            except Full:
+                continue
+
+    def close(self) -> None:
+        """
+        Закрывает поток (читатель больше не читает): непрочитанные и следующие значения отбрасываются.
+        """
+        with self._lock:
+            self._closed = True
+            buffer, self._buffer = self._buffer, None
+        if buffer is None:
+            return
+        while True:
+            try:
+                buffer.get_nowait()
+            except Empty:
+                return
+
+    def __iter__(self) -> Iterator[Any]:
+        buffer = self._buffer
+        if buffer is None:
+            return
+        while True:
+            value = buffer.get()
+            if value is _END:
+                return
+            yield value
+
+
+def create_sink(stream: ResultStream, inp_t: Any, ordered: bool = False) -> Type[Step]:
+    """
+    Создаёт последний шаг, отдающий значения типа inp_t в поток результатов.
+    Шаг нельзя импортировать по пути, поэтому он не исполняется с BACKEND="process".
+
+    Args:
+        ordered: Отдавать значения в порядке исходных данных (см. Step.ordered).
+    """
+
+    class ResultSink(Step[inp_t, None]):  # type: ignore[valid-type]
+        @classmethod
+        def start(cls, data: Any) -> None:
+            stream.put(data)
+
+    ResultSink.ordered = ordered
+    return ResultSink
+
+
+class SinkRegistry:
+    """
+    Шаги-приёмники потока результатов: по одному на тип значений и порядок (проверка типов цепочки
+    требует точного совпадения выхода последнего шага со входом приёмника).
+    """
+
+    def __init__(self, stream: ResultStream) -> None:
+        self._stream = stream
+        self._sinks: Dict[Tuple[Any, bool], Type[Step]] = {}
+
+    def get(self, inp_t: Any, ordered: bool = False) -> Type[Step]:
+        sink = self._sinks.get((inp_t, ordered))
+        if sink is None:
+            sink = self._sinks[(inp_t, ordered)] = create_sink(
+                self._stream, inp_t, ordered
+            )
+        return sink
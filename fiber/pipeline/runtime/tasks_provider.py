@@ -1,12 +1,17 @@
 from abc import ABC, abstractmethod
-from typing import List, Protocol, Sequence, override
+from typing import AsyncIterable, Iterable, List, Protocol, Union, override
 
 from fiber.pipeline.task.core import Task
 
 
 class ITaskProvider(ABC):
     @abstractmethod
-    def get_tasks(self) -> Sequence[Task]: ...
+    def get_tasks(self) -> Union[Iterable[Task], AsyncIterable[Task]]:
+        """
+        Returns:
+            Стартовые задачи. Коллекция (list, tuple, set ...) кладётся в очередь целиком до запуска воркеров,
+            итератор (например генератор) или асинхронный итератор - лениво, по мере освобождения очереди.
+        """
 
 
 class _HasTasks(Protocol):
@@ -18,5 +23,5 @@ class TaskProvider(ITaskProvider):
         self._has_tasks = has_tasks
 
     @override
-    def get_tasks(self) -> List[Task]:
+    def get_tasks(self) -> Iterable[Task]:
         return self._has_tasks.__tasks_for_provider__
@@ -0,0 +1,174 @@
+import json
+import random
+from threading import Lock
+from time import time_ns
+from typing import Any, Dict, List, Optional, Tuple
+
+from fiber.pipeline.task import Task, TraceContext
+
+# сколько span-ов копится в памяти до записи в файл
+_FLUSH_EVERY = 1024
+# коды статуса и вида span-а из OpenTelemetry
+_STATUS_ERROR = 2
+_SPAN_KIND_INTERNAL = 1
+
+# (trace_id, span_id, parent_span_id, шаг, индекс шага, начало, конец, ошибка)
+_Span = Tuple[int, int, int, str, int, int, int, Optional[str]]
+
+
+class Tracer:
+    """
+    Трассировка значений по шагам цепочки: каждый вызов Task.step() записывается span-ом,
+    а порождённая им задача получает контекст (TraceContext), чтобы её span-ы были потомками этого.
+    Каждое значение шага-источника начинает свою трассу, поэтому медленный или упавший вызов
+    конечного шага можно связать с исходным значением.
+
+    Span-ы пишутся в файл в формате OTLP JSON (по одному ExportTraceServiceRequest на строку,
+    как у file exporter-а OpenTelemetry Collector), пачками по мере накопления.
+
+    Слитые шаги (см. fuse_steps()) входят в span вызова, который их исполнил. Пачки (BatchTask)
+    объединяют значения разных трасс, поэтому трасса на шаге с start_batch() обрывается.
+    """
+
+    def __init__(
+        self, path: str, sample_ratio: float = 1.0, service_name: str = "fiber"
+    ):
+        """
+        Args:
+            path: Файл, в который пишутся span-ы (перезаписывается).
+            sample_ratio: Доля трассируемых значений источника (0.0 - 1.0). Решение принимается
+                один раз для значения, поэтому трассы не обрываются на середине.
+            service_name: service.name в ресурсе OTLP.
+        """
+        if not 0.0 <= sample_ratio <= 1.0:
+            raise ValueError(
+                f"sample_ratio должен быть от 0.0 до 1.0, а не {sample_ratio}."
+            )
+
+        self._path = path
+        self._sample_ratio = sample_ratio
+        self._service_name = service_name
+        self._lock = Lock()
+        self._spans: List[_Span] = []
+        self._written = 0
+        open(self._path, "w").close()
+
+    def is_traced(self, task: Task) -> bool:
+        """
+        Returns:
+            Нужно ли записывать span-ы вызовов задачи: у неё есть контекст,
+            или это шаг-источник, значения которого ещё могут попасть в выборку.
+        """
+        return task.get_trace() is not None or task.get_index() == 0
+
+    def record(
+        self,
+        task: Task,
+        started: int,
+        child: Optional[Task] = None,
+        error: Optional[BaseException] = None,
+    ) -> None:
+        """
+        Записывает span одного вызова Task.step() и передаёт контекст порождённой задаче.
+
+        Args:
+            started: Начало вызова (time.time_ns()).
+            child: Задача, которую вернул вызов.
+            error: Ошибка, которой завершился вызов.
+        """
+        ended = time_ns()
+        trace = task.get_trace()
+        if trace is None:
+            # значение источника начинает новую трассу
+            if self._sample_ratio < 1.0 and random.random() >= self._sample_ratio:
+                return
+            trace_id, parent_span_id = random.getrandbits(128) or 1, 0
+        else:
+            trace_id, parent_span_id = trace
+
+        span_id = random.getrandbits(64) or 1
+        if child is not None:
+            child.set_trace(TraceContext(trace_id, span_id))
+
+        span = (
+            trace_id,
+            span_id,
+            parent_span_id,
+            task.get_step().__qualname__,
+            task.get_index(),
+            started,
+            ended,
+            None if error is None else f"{error}",
+        )
+        with self._lock:
+            self._spans.append(span)
+            if len(self._spans) >= _FLUSH_EVERY:
+                self._flush()
+
+    def close(self) -> None:
+        """
+        Дописывает в файл накопленные span-ы.
+        """
+        with self._lock:
+            self._flush()
+
+    def get_written(self) -> int:
+        """
+        Returns:
+            Сколько span-ов записано в файл.
+        """
+        return self._written
+
+    def _flush(self) -> None:
+        # вызывается под self._lock
+        if not self._spans:
+            return
+        spans, self._spans = self._spans, []
+        with open(self._path, "a", encoding="utf-8") as file:
+            file.write(json.dumps(self._to_otlp(spans), ensure_ascii=False))
+            file.write("\n")
+        self._written += len(spans)
+
+    def _to_otlp(self, spans: List[_Span]) -> Dict[str, Any]:
+        return {
+            "resourceSpans": [
+                {
+                    "resource": {
+                        "attributes": [
+                            {
+                                "key": "service.name",
+                                "value": {"stringValue": self._service_name},
+                            }
+                        ]
+                    },
+                    "scopeSpans": [
+                        {
+                            "scope": {"name": "fiber"},
+                            "spans": [_span_to_otlp(span) for span in spans],
+                        }
+                    ],
+                }
+            ]
+        }
+
+
+def _span_to_otlp(span: _Span) -> Dict[str, Any]:
+    trace_id, span_id, parent_span_id, step, index, started, ended, error = span
+    otlp: Dict[str, Any] = {
+        "traceId": f"{trace_id:032x}",
+        "spanId": f"{span_id:016x}",
+        "name": step,
+        "kind": _SPAN_KIND_INTERNAL,
+        "startTimeUnixNano": str(started),
+        "endTimeUnixNano": str(ended),
+        "attributes": [
+            {"key": "fiber.step", "value": {"stringValue": step}},
+            {"key": "fiber.step.index", "value": {"intValue": str(index)}},
+        ],
+        "status": {},
+    }
+    if parent_span_id:
+        otlp["parentSpanId"] = f"{parent_span_id:016x}"
+    if error is not None:
+        otlp["status"] = {"code": _STATUS_ERROR, "message": error}
+    return otlp
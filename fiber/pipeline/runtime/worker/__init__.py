@@ -1,3 +1,8 @@
 from fiber.pipeline.runtime.worker.core import TaskWorker
+from fiber.pipeline.runtime.worker.aio import AsyncTaskWorker
+from fiber.pipeline.runtime.worker.process import (
+    ProcessTaskWorker,
+    run_process_worker,
+)
 
-__all__ = ["TaskWorker"]
+__all__ = ["TaskWorker", "AsyncTaskWorker", "ProcessTaskWorker", "run_process_worker"]
@@ -0,0 +1,132 @@
+from logging import DEBUG
+from time import perf_counter_ns, time_ns
+from typing import Optional
+
+from fiber.pipeline.task import TaskDone, TaskRuntimeError
+from fiber.pipeline.task.utils.functools import Offload
+from fiber.pipeline.runtime.deque.aio import AsyncDequeEnviroment
+from fiber.pipeline.runtime.metrics import MetricsRecorder
+from fiber.pipeline.runtime.tracing import Tracer
+from fiber.pipeline.runtime.worker.logging import get_worker_logger
+
+
+class AsyncTaskWorker:
+    """
+    Корутина-обработчик Task() для AsyncRuntime.
+    """
+
+    def __init__(
+        self,
+        deque_environ: AsyncDequeEnviroment,
+        offload: Offload,
+        metrics: Optional[MetricsRecorder] = None,
+        tracer: Optional[Tracer] = None,
+    ):
+        """
+        Args:
+            deque_environ: Среда очереди, в которой будет работать обработчик.
+            offload: Функция выноса синхронных шагов из event loop-а (см. Task.astep()).
+            metrics: Счётчики обработчика (см. RuntimeConfig.METRICS).
+            tracer: Трассировка вызовов шагов (см. RuntimeConfig.TRACE_FILE).
+        """
+        self._deque_enviroment = deque_environ
+        self._deque = deque_environ.get_deque()
+        self._offload = offload
+        self._strict = deque_environ.is_strict()
+        self._metrics = metrics
+        self._tracer = tracer
+        self._logger = get_worker_logger()
+
+    async def run(self) -> None:
+        """
+        Запускает обработчика (придназнаено для запуска в asyncio.create_task()).
+        """
+        self._logger.debug("Запущен.")
+        while True:
+            item = self._deque_enviroment.resume_parked() if self._strict else None
+            if item is None:
+                item = await self._deque.getleft()
+                # в очереди освободилось место для стартовых задач (см. AsyncDequeEnviroment.aseed_when_room())
+                self._deque_enviroment.notify_room()
+
+            if item is None:
+                self._logger.debug("Остановлен.")
+                break
+
+            task = item
+            debug = self._logger.isEnabledFor(DEBUG)
+
+            generation_lim = self._deque_enviroment.get_generation_limit()
+            reserved = 0
+            steps_left = task.steps_left() if self._strict else 0
+            if steps_left > 1:
+                generation_lim = reserved = self._deque_enviroment.reserve_slots(
+                    generation_lim, steps_left
+                )
+                if reserved == 0:
+                    self._deque_enviroment.park(task)
+                    if debug:
+                        self._logger.debug("Очередь заполнена. Припарковал Task.")
+                    continue
+
+            if debug:
+                self._logger.debug(
+                    "Начал выполнение Task. Лимит генерации: %s", generation_lim
+                )
+
+            fresh = not task.is_started()
+            traced = self._tracer is not None and self._tracer.is_traced(task)
+
+            step_metrics = None
+            if self._metrics is not None:
+                # значения шагов (и слитые шаги) задача сообщает счётчикам сама, см. Task.step()
+                step_metrics = self._metrics.begin(task, fresh, perf_counter_ns())
+
+            produced = 0
+            for _ in range(generation_lim):
+                if traced:
+                    span_started = time_ns()
+                try:
+                    next_task = await task.astep(self._offload, self._metrics)
+                except TaskDone:
+                    # вызов исполнил сам шаг (последний в цепочке), а не просто обнаружил исчерпанный генератор
+                    if traced and fresh and produced == 0:
+                        self._tracer.record(task, span_started)  # type: ignore[union-attr]
+                    if debug:
+                        self._logger.debug("Завершил выполнение Task.")
+                    break
+                except TaskRuntimeError as e:
+                    # ошибку слитого шага задача уже учла, а сама продолжает работу (см. Task._run_fused())
+                    if step_metrics is not None and task.is_done():
+                        step_metrics.errors += 1
+                    if traced:
+                        self._tracer.record(task, span_started, error=e)  # type: ignore[union-attr]
+                    self._logger.critical(
+                        "Ошибка во время исполнения. Сломаный Task отброшен."
+                    )
+                    break
+
+                if step_metrics is not None:
+                    next_task.mark_queued(perf_counter_ns())
+                if traced:
+                    self._tracer.record(task, span_started, child=next_task)  # type: ignore[union-attr]
+                self._deque.put(next_task)
+                produced += 1
+                if debug:
+                    self._logger.debug("Добавил в очередь новый Task.")
+
+            if self._metrics is not None:
+                self._metrics.finish((), None if task.is_done() else task)
+
+            if not task.is_done():
+                self._deque.put(task)
+                if debug:
+                    self._logger.debug("Вернул Task в очередь.")
+
+            if self._strict:
+                unused = reserved - produced + (1 if task.is_done() else 0)
+                self._deque_enviroment.release_slots(unused)
+
+            if task.is_done():
+                task.recycle()
+            self._deque.task_done()
@@ -1,5 +1,19 @@
-from fiber.pipeline.task import TaskDone, TaskRuntimeError
+from logging import DEBUG
+from threading import current_thread, get_ident
+from time import perf_counter, perf_counter_ns, thread_time, time_ns
+from typing import Optional, Type
+
+from fiber.step import Step
+from fiber.pipeline.task import Task, TaskDone, TaskRuntimeError
+from fiber.pipeline.runtime.aggregation import Aggregator
+from fiber.pipeline.runtime.autoscaling import WorkerStats
+from fiber.pipeline.runtime.batching import Batcher
 from fiber.pipeline.runtime.deque.enviroment import DequeEnviroment
+from fiber.pipeline.runtime.metrics import MetricsRecorder
+from fiber.pipeline.runtime.ordering import Reorderer
+from fiber.pipeline.runtime.profiling import SamplingProfiler
+from fiber.pipeline.runtime.jobs import JobTracker
+from fiber.pipeline.runtime.tracing import Tracer
 from fiber.pipeline.runtime.worker.logging import get_worker_logger
 
 
@@ -8,15 +22,50 @@ class TaskWorker:
     Воркер для многопоточной обработки Task().
     """
 
-    def __init__(self, deque_environ: DequeEnviroment):
+    def __init__(
+        self,
+        deque_environ: DequeEnviroment,
+        stats: Optional[WorkerStats] = None,
+        pool: Optional[str] = None,
+        batcher: Optional[Batcher] = None,
+        metrics: Optional[MetricsRecorder] = None,
+        tracer: Optional[Tracer] = None,
+        aggregator: Optional[Aggregator] = None,
+        reorderer: Optional[Reorderer] = None,
+        jobs: Optional[JobTracker] = None,
+        profiler: Optional[SamplingProfiler] = None,
+    ):
         """
         Создает воркера для многопоточной обработки Task().
 
         Args:
             deque_environ: Контекст управляющий очередью в котором будет работать воркер (см. подробнее в доках к DequeContext).
+            stats: Счётчик времени исполнения шагов для автомасштабирования (см. RuntimeConfig.MIN_WORKERS).
+            pool: Пул, задачи которого исполняет воркер (см. RuntimeConfig.POOLS, None - общий пул).
+            batcher: Стадия пакетной обработки, которая забирает задачи шагов с start_batch().
+            metrics: Счётчики воркера (см. RuntimeConfig.METRICS).
+            tracer: Трассировка вызовов шагов (см. RuntimeConfig.TRACE_FILE).
+            aggregator: Стадия агрегации, которая забирает задачи шагов-агрегатов (AggregateStep).
+            reorderer: Стадия упорядочивания, которая забирает задачи шагов с Step.ordered.
+            jobs: Учёт завершения отправленных конвееров (см. PersistentRuntime.submit()).
+            profiler: Профилировщик, к которому воркер добавляет свой поток (см. RuntimeConfig.PROFILE_PATH).
         """
         self._deque_enviroment = deque_environ
-        self._deque = deque_environ.get_deque()
+        self._deque = deque_environ.get_worker_deque(pool)
+        self._policy = deque_environ.get_policy()
+        self._strict = deque_environ.is_strict()
+        self._stats = stats
+        self._batcher = batcher
+        self._metrics = metrics
+        self._tracer = tracer
+        self._aggregator = aggregator
+        self._reorderer = reorderer
+        self._jobs = jobs
+        self._profiler = profiler
+        self._task: Optional[Task] = None
+        self._aggregates = (
+            aggregator.create_partial() if aggregator is not None else None
+        )
         self._logger = get_worker_logger()
 
     def run(self) -> None:
@@ -24,37 +73,132 @@ class TaskWorker:
         Запускает воркера (придназнаено для запуска в Thread(target=)).
         """
         self._logger.debug("Запущен.")
+        if self._profiler is not None:
+            self._profiler.register(
+                get_ident(), current_thread().name, self.get_current_step
+            )
         while True:
-            item = self._deque.getleft()
+            item = self._deque_enviroment.resume_parked() if self._strict else None
+            if item is None:
+                item = self._policy.take(self._deque)
+                # в очереди освободилось место для стартовых задач (см. DequeEnviroment.seed_when_room())
+                self._deque_enviroment.notify_room()
 
             if item is None:
+                # сигнал остановки учитывается очередью как задача (воркеров останавливают и посреди работы)
+                self._deque.task_done()
                 self._logger.debug("Остановлен.")
                 break
 
             task = item
+            # одна проверка уровня на ход вместо проверки в каждом вызове логгера
+            debug = self._logger.isEnabledFor(DEBUG)
 
             generation_lim = self._deque_enviroment.get_generation_limit()
-            self._logger.debug(
-                f"Начал выполнение Task. Лимит генерации: {generation_lim}"
-            )
+            reserved = 0
+            steps_left = task.steps_left() if self._strict else 0
+            if steps_left > 1:
+                generation_lim = reserved = self._deque_enviroment.reserve_slots(
+                    generation_lim, steps_left
+                )
+                if reserved == 0:
+                    self._deque_enviroment.park(task)
+                    if debug:
+                        self._logger.debug("Очередь заполнена. Припарковал Task.")
+                    continue
+
+            if self._reorderer is not None:
+                generation_lim = self._reorderer.allowance(task, generation_lim)
+
+            self._task = task
+
+            if debug:
+                self._logger.debug(
+                    "Начал выполнение Task. Лимит генерации: %s", generation_lim
+                )
+
+            if self._stats is not None:
+                started, started_cpu = perf_counter(), thread_time()
 
+            fresh = not task.is_started()
+            traced = self._tracer is not None and self._tracer.is_traced(task)
+
+            step_metrics = None
+            if self._metrics is not None:
+                # значения шагов (и слитые шаги) задача сообщает счётчикам сама, см. Task.step()
+                step_metrics = self._metrics.begin(task, fresh, perf_counter_ns())
+
+            children = []
             for _ in range(generation_lim):
+                if traced:
+                    span_started = time_ns()
                 try:
-                    next_task = task.step()
+                    next_task = task.step(self._metrics)
                 except TaskDone:
-                    self._logger.debug("Завершил выполнение Task.")
+                    # вызов исполнил сам шаг (последний в цепочке), а не просто обнаружил исчерпанный генератор
+                    if traced and fresh and not children:
+                        self._tracer.record(task, span_started)  # type: ignore[union-attr]
+                    if debug:
+                        self._logger.debug("Завершил выполнение Task.")
                     break
-                except TaskRuntimeError:
+                except TaskRuntimeError as e:
+                    # ошибку слитого шага задача уже учла, а сама продолжает работу (см. Task._run_fused())
+                    if step_metrics is not None and task.is_done():
+                        step_metrics.errors += 1
+                    if traced:
+                        self._tracer.record(task, span_started, error=e)  # type: ignore[union-attr]
+                    if self._jobs is not None:
+                        self._jobs.fail(task, e)
                     self._logger.critical(
                         "Ошибка во время исполнения. Сломаный Task отброшен."
                     )
                     break
 
-                self._deque.put(next_task)
-                self._logger.debug("Добавил в очередь новый Task.")
+                if traced:
+                    self._tracer.record(task, span_started, child=next_task)  # type: ignore[union-attr]
+                children.append(next_task)
+
+            if self._stats is not None:
+                self._stats.record(
+                    perf_counter() - started, thread_time() - started_cpu
+                )
+
+            produced = len(children)
+            if self._reorderer is not None:
+                children = self._reorderer.absorb(task, children)
+            if self._aggregator is not None:
+                children = self._aggregator.absorb(children, self._aggregates)  # type: ignore[arg-type]
+            if self._batcher is not None:
+                children = self._batcher.absorb(children)
+            if self._jobs is not None:
+                self._jobs.absorb(task, children)
 
-            if not task.is_done():
-                self._deque.put(task)
-                self._logger.debug("Вернул Task в очередь.")
+            parent = None if task.is_done() else task
+            if self._metrics is not None:
+                # отметка до постановки в очередь: задачу сразу может забрать другой воркер
+                self._metrics.finish(children, parent)
+            self._policy.schedule(self._deque, parent, children)
+            if debug:
+                self._logger.debug(
+                    "Добавил в очередь новых Task-ов: %s.", len(children)
+                )
+                if parent is not None:
+                    self._logger.debug("Вернул Task в очередь.")
 
+            if self._strict:
+                # неиспользованные места и место самой задачи, если она завершена
+                unused = reserved - produced + (1 if parent is None else 0)
+                self._deque_enviroment.release_slots(unused)
+
+            self._task = None
+            if parent is None:
+                task.recycle()
             self._deque.task_done()
+
+    def get_current_step(self) -> Optional[Type[Step]]:
+        """
+        Returns:
+            Шаг задачи, которую воркер исполняет сейчас (None - между задачами).
+        """
+        task = self._task
+        return task.get_step() if task is not None else None
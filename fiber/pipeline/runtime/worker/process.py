@@ -0,0 +1,111 @@
+import pickle
+from collections import deque
+from logging import DEBUG
+from typing import Deque
+
+from fiber.pipeline.task import Task, TaskDone, TaskRuntimeError, TaskDescriptorError
+from fiber.pipeline.runtime.deque.process import ProcessDequeEnviroment
+from fiber.pipeline.runtime.worker.logging import get_worker_logger
+
+
+class ProcessTaskWorker:
+    """
+    Воркер для обработки Task() в отдельном процессе.
+
+    Между процессами передаются только TaskDescriptor-ы ещё не начатых задач.
+    Начатый Task (с живым генератором) сериализовать нельзя, поэтому он остаётся
+    "припаркованным" в процессе, который его начал, и продолжается им же по очереди
+    с задачами из общей очереди.
+    """
+
+    def __init__(self, deque_environ: ProcessDequeEnviroment):
+        """
+        Args:
+            deque_environ: Межпроцессная среда очереди (см. ProcessDequeEnviroment).
+        """
+        self._deque_enviroment = deque_environ
+        self._deque = deque_environ.get_deque()
+        self._parked: Deque[Task] = deque()
+        self._logger = get_worker_logger()
+
+    def run(self) -> None:
+        """
+        Запускает воркера (придназнаено для запуска в Process(target=)).
+        """
+        self._logger.debug("Запущен.")
+        resume_parked = False
+
+        while True:
+            if self._parked and resume_parked:
+                task = self._parked.popleft()
+            else:
+                try:
+                    # пока есть припаркованные задачи - не блокируемся на общей очереди
+                    item = self._deque.getleft(timeout=0 if self._parked else None)
+                except TimeoutError:
+                    task = self._parked.popleft()
+                else:
+                    if item is None:
+                        self._logger.debug("Остановлен.")
+                        break
+
+                    try:
+                        task = item.to_task()
+                    except TaskDescriptorError as e:
+                        self._logger.critical(f"{e} Task отброшен.")
+                        self._deque.task_done()
+                        continue
+                    except TaskRuntimeError:
+                        # например входные данные не прошли строгую проверку типов
+                        self._logger.critical(
+                            "Ошибка во время исполнения. Сломаный Task отброшен."
+                        )
+                        self._deque.task_done()
+                        continue
+
+            resume_parked = not resume_parked
+            self._process(task)
+
+    def _process(self, task: Task) -> None:
+        generation_lim = self._deque_enviroment.get_generation_limit()
+        debug = self._logger.isEnabledFor(DEBUG)
+        if debug:
+            self._logger.debug(
+                "Начал выполнение Task. Лимит генерации: %s", generation_lim
+            )
+
+        for _ in range(generation_lim):
+            try:
+                next_task = task.step()
+            except TaskDone:
+                if debug:
+                    self._logger.debug("Завершил выполнение Task.")
+                break
+            except TaskRuntimeError:
+                self._logger.critical(
+                    "Ошибка во время исполнения. Сломаный Task отброшен."
+                )
+                break
+
+            try:
+                self._deque.put(next_task.to_descriptor())
+            except (TaskDescriptorError, pickle.PicklingError) as e:
+                self._logger.critical(f"{e} Task отброшен.")
+                continue
+            if debug:
+                self._logger.debug("Добавил в очередь новый Task.")
+
+        if not task.is_done():
+            self._parked.append(task)
+            if debug:
+                self._logger.debug("Припарковал Task.")
+            return
+
+        self._deque.task_done()
+
+
+def run_process_worker(deque_environ: ProcessDequeEnviroment) -> None:
+    """
+    Точка входа процесса-воркера (для Process(target=)).
+    """
+    ProcessTaskWorker(deque_environ).run()
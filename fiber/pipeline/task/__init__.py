@@ -1,5 +1,27 @@
 from fiber.pipeline.task.builder import TaskBuilder, TaskBuildError
 from fiber.pipeline.task.core import Task
-from fiber.pipeline.task.exceptions import TaskDone, TaskRuntimeError
+from fiber.pipeline.task.batch import BatchTask
+from fiber.pipeline.task.descriptor import TaskDescriptor
+from fiber.pipeline.task.observer import StepObserver
+from fiber.pipeline.task.plan import ExecutionPlan, PlanSlot
+from fiber.pipeline.task.trace import TraceContext
+from fiber.pipeline.task.exceptions import (
+    TaskDone,
+    TaskDescriptorError,
+    TaskRuntimeError,
+)
 
-__all__ = ["Task", "TaskDone", "TaskBuilder", "TaskBuildError", "TaskRuntimeError"]
+__all__ = [
+    "Task",
+    "BatchTask",
+    "ExecutionPlan",
+    "PlanSlot",
+    "TraceContext",
+    "StepObserver",
+    "TaskDone",
+    "TaskBuilder",
+    "TaskBuildError",
+    "TaskRuntimeError",
+    "TaskDescriptor",
+    "TaskDescriptorError",
+]
@@ -0,0 +1,64 @@
+from typing import Any, List, Sequence
+
+from fiber.pipeline.task.core import Task
+from fiber.pipeline.task.descriptor import TaskDescriptor
+from fiber.pipeline.task.exceptions import TaskDescriptorError
+from fiber.pipeline.task.utils.functools import (
+    Offload,
+    invoke_as_async_generator,
+    invoke_batch,
+)
+
+
+class BatchTask(Task):
+    """
+    Задача, исполняющая Step.start_batch() для пачки входных данных, накопленных из задач одного шага плана.
+    Каждый результат start_batch() порождает Task следующего шага, как результаты обычного start().
+    """
+
+    __slots__ = ("_size",)
+
+    def __init__(self, tasks: Sequence[Task]):
+        """
+        Args:
+            tasks: Ещё не начатые задачи одного шага плана (их входные данные уже проверены при создании).
+        """
+        head = tasks[0]
+        super().__init__(
+            plan=head.get_plan(),
+            payload=[task._payload for task in tasks],
+            index=head.get_index(),
+        )
+        self._size = len(tasks)
+
+    def size(self) -> int:
+        return self._size
+
+    def recycle(self) -> None:
+        # пачки создаются Batcher-ом, а не из списка переиспользования
+        pass
+
+    def to_descriptor(self) -> TaskDescriptor:
+        raise TaskDescriptorError(
+            "Пачка задач не может быть передана в другой процесс."
+        )
+
+    def _check_input(self) -> None:
+        # входные данные задач пачки проверены при их создании
+        pass
+
+    def _invoke(self):
+        items: List[Any] = self._payload
+        return invoke_batch(self.get_step().start_batch, items)
+
+    def _invoke_async(self, offload: Offload):
+        items: List[Any] = self._payload
+        step = self.get_step()
+        return invoke_as_async_generator(
+            lambda: invoke_batch(step.start_batch, items), offload
+        )
+
+    def _log_start(self) -> None:
+        logger = self._plan.slots[self._index].logger
+        logger.info("Вызван метод start_batch()!")
+        logger.debug("Размер пачки: %s.", self._size)
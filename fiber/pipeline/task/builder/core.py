@@ -1,8 +1,5 @@
-from typing import Sequence, Type
-
-from fiber.step import Step
 from fiber.pipeline.task.core import Task
-from fiber.pipeline.task.utils.datastructs import get_linked_list_from
+from fiber.pipeline.task.plan import ExecutionPlan, PipelineSteps
 from fiber.pipeline.task.builder.validation import (
     StepSequenceValidator,
     StepSequenceValidationError,
@@ -13,21 +10,52 @@ from fiber.pipeline.task.builder.exceptions import TaskBuildError
 class TaskBuilder:
     @staticmethod
     def build_from(
-        steps: Sequence[Type[Step]],
+        steps: PipelineSteps,
         strict_building_types: bool,
         strict_runtime_types: bool,
+        fuse: bool = False,
     ) -> Task:
+        """
+        Собирает стартовый Task из цепочки шагов.
+        Цепочка компилируется в ExecutionPlan один раз - все задачи цепочки разделяют его.
+
+        Args:
+            steps: Шаги цепочки. Последним элементом может быть список ветвей - цепочек того же вида:
+                каждое значение последнего шага перед ветвями уходит в каждую ветвь.
+                Например [Read, Parse, [[Count, Report], [Store]]].
+            fuse: Слить идущие подряд 1:1 шаги (см. Step.one_to_one): они исполняются за один ход воркера,
+                без создания Task и возврата в очередь на каждый шаг.
+        """
+        plan = TaskBuilder.build_plan(
+            steps, strict_building_types, strict_runtime_types, fuse=fuse
+        )
+        task = Task(plan=plan, payload=None)
+
+        return task
+
+    @staticmethod
+    def build_plan(
+        steps: PipelineSteps,
+        strict_building_types: bool,
+        strict_runtime_types: bool,
+        fuse: bool = False,
+        with_input: bool = False,
+    ) -> ExecutionPlan:
+        """
+        Проверяет и компилирует цепочку шагов (см. build_from()), не создавая стартовый Task:
+        по одному плану можно создать сколько угодно стартовых задач - Task(plan, payload).
+
+        Args:
+            with_input: Первый шаг получает входные данные (payload стартовых задач),
+                поэтому может принимать не только None.
+
+        Raises:
+            TaskBuildError: если цепочка не прошла проверку.
+        """
         if strict_building_types:
             try:
-                StepSequenceValidator.validate(steps)
+                StepSequenceValidator.validate(steps, with_input=with_input)
             except StepSequenceValidationError as e:
                 raise TaskBuildError(str(e)) from e
 
-        call_linked_list_head = get_linked_list_from(steps)
-        task = Task(
-            call_node=call_linked_list_head,
-            payload=None,
-            strict_types=strict_runtime_types,
-        )
-
-        return task
+        return ExecutionPlan.from_steps(steps, strict_runtime_types, fuse=fuse)
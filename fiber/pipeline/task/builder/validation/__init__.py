@@ -3,6 +3,8 @@ from fiber.pipeline.task.builder.validation.rules import (
     StepSequenceValidationError,
     IncompatibleStepTypesError,
     EmptySequenceError,
+    InvalidAggregatePositionError,
+    InvalidBranchesError,
     InvalidPipelineEndpointsError,
     NotAStepError,
 )
@@ -10,6 +12,8 @@ from fiber.pipeline.task.builder.validation.rules import (
 _rules_exceptions = [
     "IncompatibleStepTypesError",
     "EmptySequenceError",
+    "InvalidAggregatePositionError",
+    "InvalidBranchesError",
     "InvalidPipelineEndpointsError",
     "NotAStepError",
 ]
@@ -1,10 +1,12 @@
-from typing import Sequence, Type
-
-from fiber.step import Step
+from fiber.pipeline.task.plan import PipelineSteps
+from fiber.pipeline.task.utils.datastructs import get_graph_from, iter_paths
 from fiber.pipeline.task.builder.validation.rules import (
+    AggregatePositionRule,
+    BranchesRule,
     StepTypeCompatibilityRule,
     OnlyStepSubclassesRule,
     EndPointsRule,
+    FinalStepRule,
     NotEmptySequenceRule,
 )
 
@@ -15,13 +17,24 @@ class StepSequenceValidator:
     """
 
     @staticmethod
-    def validate(steps: Sequence[Type[Step]]) -> None:
-        validation_rules = (
-            NotEmptySequenceRule,
+    def validate(steps: PipelineSteps, with_input: bool = False) -> None:
+        """
+        Цепочка с ветвями проверяется по каждому пути от первого шага до конца ветви:
+        так проверяется каждое ребро (совместимость типов) и каждый конечный шаг.
+
+        Args:
+            with_input: Первый шаг получает входные данные извне (и может принимать не только None).
+        """
+        for rule in (NotEmptySequenceRule, BranchesRule):
+            rule.check(steps)
+
+        path_rules = (
             OnlyStepSubclassesRule,
+            AggregatePositionRule,
             StepTypeCompatibilityRule,
-            EndPointsRule,
+            FinalStepRule if with_input else EndPointsRule,
         )
 
-        for rule in validation_rules:
-            rule.check(steps)
+        for path in iter_paths(get_graph_from(steps)):
+            for rule in path_rules:
+                rule.check(path)
@@ -2,8 +2,17 @@ from fiber.pipeline.task.builder.validation.rules.base import (
     StepSequenceValidationRule,
     StepSequenceValidationError,
 )
+from fiber.pipeline.task.builder.validation.rules.aggregates import (
+    AggregatePositionRule,
+    InvalidAggregatePositionError,
+)
+from fiber.pipeline.task.builder.validation.rules.branches import (
+    BranchesRule,
+    InvalidBranchesError,
+)
 from fiber.pipeline.task.builder.validation.rules.end_points import (
     EndPointsRule,
+    FinalStepRule,
     InvalidPipelineEndpointsError,
 )
 from fiber.pipeline.task.builder.validation.rules.not_empty import (
@@ -26,13 +35,18 @@ _base = [
 
 _exceptions = [
     "EmptySequenceError",
+    "InvalidAggregatePositionError",
+    "InvalidBranchesError",
     "InvalidPipelineEndpointsError",
     "IncompatibleStepTypesError",
     "NotAStepError",
 ]
 
 _rules = [
+    "AggregatePositionRule",
+    "BranchesRule",
     "EndPointsRule",
+    "FinalStepRule",
     "NotEmptySequenceRule",
     "StepTypeCompatibilityRule",
     "OnlyStepSubclassesRule",
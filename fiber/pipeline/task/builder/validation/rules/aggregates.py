@@ -0,0 +1,25 @@
+from typing import Sequence, Type
+
+from fiber.step import Step, is_aggregate_step
+from fiber.pipeline.task.builder.validation.rules.base import (
+    StepSequenceValidationRule,
+    StepSequenceValidationError,
+)
+
+
+class InvalidAggregatePositionError(StepSequenceValidationError):
+    """Шаг-агрегат не может быть первым: его значения приходят от предыдущих шагов."""
+
+
+class AggregatePositionRule(StepSequenceValidationRule):
+    @classmethod
+    def check(cls, steps: Sequence[Type[Step]]) -> None:
+        """
+        Проверяет, что первый шаг - не агрегат (AggregateStep): значения агрегата собирает Runtime
+        из задач предыдущих шагов, а стартовую задачу исполнить нечем.
+        """
+        start_step = steps[0]
+        if is_aggregate_step(start_step):
+            raise InvalidAggregatePositionError(
+                f"Нарушен контракт: шаг-агрегат {start_step.__name__} не может быть первым."
+            )
@@ -0,0 +1,38 @@
+from typing import Any, Sequence
+
+from fiber.pipeline.task.utils.datastructs import split_branches
+from fiber.pipeline.task.builder.validation.rules.base import (
+    StepSequenceValidationRule,
+    StepSequenceValidationError,
+)
+
+
+class InvalidBranchesError(StepSequenceValidationError):
+    """Ветви должны быть непустым списком непустых цепочек в конце цепочки."""
+
+
+class BranchesRule(StepSequenceValidationRule):
+    @classmethod
+    def check(cls, steps: Sequence[Any]) -> None:
+        """
+        Проверяет, что ветви (см. split_branches()) стоят только в конце цепочки,
+        их список не пуст и каждая ветвь - непустая цепочка того же вида.
+        """
+        items, branches = split_branches(steps)
+        if len(items) == 0:
+            raise InvalidBranchesError("Ветви должны продолжать хотя бы один шаг.")
+        if any(isinstance(item, (list, tuple)) for item in items):
+            raise InvalidBranchesError(
+                "Ветви могут быть только последним элементом цепочки."
+            )
+        if len(items) == len(steps):
+            return
+        if len(branches) == 0:
+            raise InvalidBranchesError("Список ветвей пуст.")
+
+        for branch in branches:
+            if not isinstance(branch, (list, tuple)) or len(branch) == 0:
+                raise InvalidBranchesError(
+                    f"Ветвь должна быть непустой цепочкой шагов, а не {branch!r}."
+                )
+            cls.check(branch)
@@ -19,7 +19,7 @@ class EndPointsRule(StepSequenceValidationRule):
         Проверяет что первый шаг принимает None, а последний возвращает.
         """
         magic_type = NoneType
-        start_step, final_step = steps[0], steps[-1]
+        start_step = steps[0]
 
         # первый шаг
         start_in, _ = get_step_types(start_step)
@@ -29,6 +29,19 @@ class EndPointsRule(StepSequenceValidationRule):
             )
 
         # последний шаг
+        FinalStepRule.check(steps)
+
+
+class FinalStepRule(StepSequenceValidationRule):
+    @classmethod
+    def check(cls, steps: Sequence[Type[Step]]) -> None:
+        """
+        Проверяет что последний шаг возвращает None (для цепочек, первый шаг которых получает
+        входные данные извне, см. TaskBuilder.build_plan(with_input=True)).
+        """
+        magic_type = NoneType
+        final_step = steps[-1]
+
         _, final_out = get_step_types(final_step)
         if final_out is not magic_type:
             raise InvalidPipelineEndpointsError(
@@ -1,6 +1,7 @@
 from typing import Sequence, Type
 
 from fiber.step import Step, get_step_types
+from fiber.pipeline.task.utils.types import is_type_compatible
 from fiber.pipeline.task.builder.validation.rules.base import (
     StepSequenceValidationRule,
     StepSequenceValidationError,
@@ -21,12 +22,13 @@ class StepTypeCompatibilityRule(StepSequenceValidationRule):
     @classmethod
     def _check_step_pair(cls, f_step: Type[Step], s_step: Type[Step]) -> None:
         """
-        Проверяет совместимость выходного типа одного шага и входного типа следующего.
+        Проверяет совместимость выходного типа одного шага и входного типа следующего
+        (см. is_type_compatible(): для NumPy-массивов учитываются dtype и размерность).
         """
         _, f_out = get_step_types(f_step)
         s_in, _ = get_step_types(s_step)
 
-        if f_out != s_in:
+        if not is_type_compatible(f_out, s_in):
             err_msg = (
                 f"Шаги {f_step.__name__} и {s_step.__name__} не совместимы. "
                 f"Тип вывода: {f_out}, тип входа следующего шага: {s_in}"
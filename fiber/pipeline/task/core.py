@@ -1,50 +1,104 @@
-from typing import Generic, NoReturn, Type
+from collections.abc import AsyncGenerator as AsyncGenABC, Coroutine as CoroABC
+from collections.abc import Generator as GenABC
+from functools import partial
+from time import perf_counter_ns
+from typing import Any, Generic, NoReturn, Optional, Tuple, Type
 
-from fiber.logging import get_kernel_logger
-from fiber.step import Step, I, O, get_step_types
+from fiber.step import Step, I, O
 from fiber.pipeline.task.exceptions import (
     TaskDone,
+    TaskDescriptorError,
     TaskRuntimeError,
     TaskTypeRuntimeError,
 )
-from fiber.pipeline.task.utils.types import impr_isinstance
-from fiber.pipeline.task.utils.datastructs import Node
-from fiber.pipeline.task.utils.functools import invoke_as_generator
+from fiber.pipeline.task.descriptor import TaskDescriptor, get_step_path
+from fiber.pipeline.task.observer import StepObserver
+from fiber.pipeline.task.plan import ExecutionPlan, PlanSlot
+from fiber.pipeline.task.trace import TraceContext
+from fiber.pipeline.task.utils.functools import (
+    Offload,
+    invoke_as_generator,
+    invoke_as_async_generator,
+    invoke_batch,
+)
 
 
 class Task(Generic[I, O]):
     """
     Представляет собой универсальную и самодостаточную единицу исполнения.
-    Связывает шаг (Step), его входные данные и следующую вершину вызова (Node).
+    Связывает шаг (Step) скомпилированной цепочки (ExecutionPlan) и его входные данные.
 
     Отвечает за поэтапное выполнение метода Step.start(), включая генерацию
-    следующих Task-ов и завершение цепочки.
+    следующих Task-ов и завершение цепочки. Если за шагом цепочка ветвится,
+    каждое значение шага порождает по Task на каждую ветвь (по одному за вызов step()).
+
+    Хранится в __slots__ (без __dict__): в очереди могут лежать миллионы задач.
     """
 
-    def __init__(
-        self, call_node: Node[Type[Step[I, O]]], payload: I, strict_types: bool
-    ):
+    __slots__ = (
+        "_plan",
+        "_index",
+        "_payload",
+        "_is_done",
+        "_generator",
+        "_queued_at",
+        "_trace",
+        "_pending",
+        "_path",
+        "_emitted",
+    )
+
+    def __init__(self, plan: ExecutionPlan, payload: I, index: int = 0):
         """
         Инициализация задачи.
 
         Args:
-            call_node (Node): Текущая вершина вызова, содержащая Step и ссылку на следующую.
+            plan (ExecutionPlan): Скомпилированная цепочка вызовов (общая для всех её задач).
             payload (I): Входные данные, передаваемые в Step.start().
+            index (int): Индекс текущего шага в плане.
         """
-        self._call_node = call_node
+        self._plan = plan
+        self._index = index
         self._payload = payload
-        self._kernel_logger = get_kernel_logger()
-        self._strict_types = strict_types
         self._is_done = False
         self._generator = None  # отложенно инициализируемый генератор
-        inp_t, self._out_t = get_step_types(self._call_node.item)
+        self._queued_at = 0
+        self._trace: Optional[TraceContext] = None
+        # значение и индексы ветвей, для которых Task ещё не создан (см. _fork())
+        self._pending: Optional[Tuple[Any, Tuple[int, ...]]] = None
+        # место в порядке исходных данных (None - не отслеживается, см. set_path())
+        self._path: Optional[Tuple[int, ...]] = None
+        self._emitted = 0
+
+        self._check_input()
+
+    def get_step(self) -> Type[Step[I, O]]:
+        """
+        Returns:
+            Шаг, который исполняет задача.
+        """
+        return self._plan.slots[self._index].step
+
+    def get_plan(self) -> ExecutionPlan:
+        """
+        Returns:
+            План цепочки, которую исполняет задача.
+        """
+        return self._plan
 
-        if self._strict_types:
-            if not impr_isinstance(data=self._payload, expected_type=inp_t):
-                self._is_done = True
-                err_msg = f"{inp_t} - ожидаемый тип входных данных. Не совпал с типом полученных данных - {type(self._payload)}"
-                self._call_node.item.logger.critical(err_msg)
-                raise TaskTypeRuntimeError(err_msg)
+    def get_index(self) -> int:
+        """
+        Returns:
+            Индекс текущего шага в плане.
+        """
+        return self._index
+
+    def get_payload(self) -> I:
+        """
+        Returns:
+            Входные данные шага.
+        """
+        return self._payload
 
     def is_done(self) -> bool:
         """
@@ -53,11 +107,75 @@ class Task(Generic[I, O]):
         """
         return self._is_done
 
-    def step(self) -> "Task":
+    def is_started(self) -> bool:
+        """
+        Returns:
+            bool: Вызван ли уже Step.start() (создан генератор).
+        """
+        return self._generator is not None
+
+    def mark_queued(self, at: int) -> None:
+        """
+        Запоминает момент постановки в очередь (time.perf_counter_ns(), для метрик времени ожидания).
+        """
+        self._queued_at = at
+
+    def get_queued_at(self) -> int:
+        """
+        Returns:
+            Момент постановки в очередь (0 - не отмечен, см. mark_queued()).
+        """
+        return self._queued_at
+
+    def get_trace(self) -> Optional[TraceContext]:
+        """
+        Returns:
+            Контекст трассировки (None - задача не трассируется).
+        """
+        return self._trace
+
+    def set_trace(self, trace: Optional[TraceContext]) -> None:
+        self._trace = trace
+
+    def get_path(self) -> Optional[Tuple[int, ...]]:
+        """
+        Returns:
+            Место задачи в порядке исходных данных: путь номеров значений от стартовой задачи
+            (None - порядок не отслеживается).
+        """
+        return self._path
+
+    def set_path(self, path: Optional[Tuple[int, ...]]) -> None:
+        """
+        Задаёт место задачи в порядке исходных данных: порождённые ею задачи получают
+        path + (номер значения,), так что порядок путей совпадает с порядком обхода генераторов.
+        """
+        self._path = path
+
+    def get_next_path(self) -> Optional[Tuple[int, ...]]:
+        """
+        Returns:
+            Путь следующей порождённой задачи (None - порядок не отслеживается).
+        """
+        if self._path is None:
+            return None
+        return self._path + (self._emitted,)
+
+    def steps_left(self) -> int:
+        """
+        Returns:
+            int: Сколько шагов цепочки осталось, включая текущий.
+        """
+        return self._plan.slots[self._index].steps_left
+
+    def step(self, observer: Optional[StepObserver] = None) -> "Task":
         """
         Выполняет один шаг исполнения. Получает следующее значение от Step.start(),
         проверяет его тип и возвращает новый Task.
 
+        Args:
+            observer: Получатель событий исполнения шагов (например счётчики воркера, см. StepObserver).
+
         Returns:
             Task - Новый Task с выходными данными.
 
@@ -68,45 +186,331 @@ class Task(Generic[I, O]):
         if self._is_done:
             raise TaskDone()
 
+        # Значение прошлого вызова ещё не роздано всем ветвям
+        if self._pending is not None:
+            return self._next_branch()
+
         # Инициализация генератора
         if self._generator is None:
-            self._call_node.item.logger.info("Вызван метод start()!")
-            self._call_node.item.logger.debug(f"Стартовые данные: {self._payload}.")
+            self._log_start()
+            self._generator = self._invoke()
 
-            self._generator = invoke_as_generator(
-                lambda: self._call_node.item.start(self._payload)
-            )
+        # Обработка значения с генератора (слитые шаги могут довести значение до конца цепочки - тогда берём следующее)
+        while True:
+            if observer is not None:
+                started = perf_counter_ns()
+            try:
+                data = next(self._generator)
+            except StopIteration:
+                self._plan.slots[self._index].logger.info(
+                    "Метод start() успешно завершён."
+                )
+                self._raise_done()
+            except Exception as e:
+                self._raise_runtime_error(e)
+            if observer is not None:
+                observer.on_value(self.get_step(), perf_counter_ns() - started)
 
-        # Обработка значения с генератора
-        try:
-            data = next(self._generator)
-        except StopIteration:
-            self._call_node.item.logger.info("Метод start() успешно завершён.")
-            self._raise_done()
-        except Exception as e:
-            self._is_done = True
-            self._call_node.item.logger.fatal(f"{e}", exc_info=True)
-            raise TaskRuntimeError(f"{e}") from e
-
-        if self._strict_types:
-            if not impr_isinstance(data=data, expected_type=self._out_t):
-                self._is_done = True
-                err_msg = (
-                    f"{self._out_t} - ожидаемый тип выходных данных. Не совпал с типом полученных данных - {type(data)}",
+            next_task = self._next_task(data, observer)
+            if next_task is not None:
+                return next_task
+
+    async def astep(
+        self,
+        offload: Optional[Offload] = None,
+        observer: Optional[StepObserver] = None,
+    ) -> "Task":
+        """
+        Асинхронный аналог step(). Поддерживает шаги с `async def start()`
+        и асинхронными генераторами.
+
+        Args:
+            offload: Функция для выноса синхронного кода из event loop-а (например в пул потоков).
+                Применяется только к синхронным шагам, async-шаги исполняются прямо в event loop-е.
+            observer: Получатель событий исполнения шагов (см. step()).
+
+        Returns:
+            Task - Новый Task с выходными данными.
+
+        Raises:
+            TaskDone: если генератор исчерпан или текущая вершина последняя.
+        """
+        if self._is_done:
+            raise TaskDone()
+
+        if self._pending is not None:
+            return self._next_branch()
+
+        if self._generator is None:
+            self._log_start()
+            self._generator = self._invoke_async(offload)
+
+        while True:
+            if observer is not None:
+                started = perf_counter_ns()
+            try:
+                data = await anext(self._generator)  # type: ignore[arg-type]
+            except StopAsyncIteration:
+                self._plan.slots[self._index].logger.info(
+                    "Метод start() успешно завершён."
                 )
-                self._call_node.item.logger.critical(err_msg, exc_info=True)
-                raise TaskTypeRuntimeError(err_msg)
+                self._raise_done()
+            except Exception as e:
+                self._raise_runtime_error(e)
+            if observer is not None:
+                observer.on_value(self.get_step(), perf_counter_ns() - started)
+
+            next_indexes = self._plan.slots[self._index].next
+            if (
+                offload is not None
+                and len(next_indexes) == 1
+                and self._plan.slots[next_indexes[0]].fused
+            ):
+                next_task = await offload(partial(self._next_task, data, observer))
+            else:
+                next_task = self._next_task(data, observer)
+            if next_task is not None:
+                return next_task
+
+    def recycle(self) -> None:
+        """
+        Возвращает завершённый Task в список переиспользования плана (если он включён, см. ExecutionPlan.enable_recycling()).
+        После вызова задачей пользоваться нельзя: объект достанется другой задаче цепочки.
+        """
+        free_list = self._plan.free_list
+        if free_list is None or not self._is_done:
+            return
+        # не держим данные и генератор до переиспользования
+        self._payload = None
+        self._generator = None
+        self._pending = None
+        free_list.release(self)
+
+    def to_descriptor(self) -> TaskDescriptor:
+        """
+        Преобразует ещё не начатый Task в сериализуемый дескриптор
+        (для передачи в другой процесс).
+
+        Исключения:
+            TaskDescriptorError: если Task уже начат (генератор нельзя сериализовать)
+            или какой-либо шаг нельзя импортировать по пути.
+        """
+        if self._generator is not None or self._is_done:
+            raise TaskDescriptorError(
+                "Начатый Task не может быть преобразован в дескриптор."
+            )
+
+        # шаги пронумерованы обходом в глубину: ветви шага идут после него, поэтому хвост плана
+        # с индексами, сдвинутыми на self._index, содержит всё, что осталось исполнить
+        slots = self._plan.slots[self._index :]
+        edges: Tuple[Tuple[int, ...], ...] = ()
+        if self._plan.is_branched():
+            edges = tuple(
+                tuple(index - self._index for index in slot.next) for slot in slots
+            )
+        return TaskDescriptor(
+            steps=tuple(get_step_path(slot.step) for slot in slots),
+            payload=self._payload,
+            strict_types=self._plan.is_strict(),
+            fused=any(slot.fused for slot in slots),
+            edges=edges,
+        )
+
+    def _check_input(self) -> None:
+        """
+        Проверяет тип входных данных (если включена строгая типизация).
+
+        Raises:
+            TaskTypeRuntimeError: если тип не совпал.
+        """
+        slot = self._plan.slots[self._index]
+        if slot.check_input is not None and not slot.check_input(self._payload):
+            self._raise_type_error(
+                slot,
+                f"{slot.inp_t} - ожидаемый тип входных данных. Не совпал с типом полученных данных - {type(self._payload)}",
+            )
+
+    def _invoke(self):
+        """
+        Создаёт генератор результатов шага (шаг с start_batch() получает пачку из одного значения).
+        """
+        slot = self._plan.slots[self._index]
+        if slot.is_batch:
+            return invoke_batch(slot.step.start_batch, [self._payload])
+        return invoke_as_generator(lambda: slot.step.start(self._payload))
+
+    def _invoke_async(self, offload: Optional[Offload]):
+        """
+        Асинхронный аналог _invoke().
+        """
+        slot = self._plan.slots[self._index]
+        if slot.is_batch:
+            return invoke_as_async_generator(
+                lambda: invoke_batch(slot.step.start_batch, [self._payload]), offload
+            )
+        return invoke_as_async_generator(
+            lambda: slot.step.start(self._payload),
+            offload=None if slot.is_async else offload,
+        )
+
+    def _log_start(self) -> None:
+        logger = self._plan.slots[self._index].logger
+        logger.info("Вызван метод start()!")
+        logger.debug("Стартовые данные: %s.", self._payload)
+
+    def _next_task(
+        self, data: O, observer: Optional[StepObserver] = None
+    ) -> Optional["Task"]:
+        """
+        Проверяет тип полученного от шага значения и создаёт из него Task для следующей вершины
+        (слитые вершины исполняются сразу, см. _run_fused(); на развилке - Task первой ветви, см. _fork()).
+
+        Returns:
+            Task или None, если слитые шаги довели значение до конца цепочки.
+
+        Raises:
+            TaskTypeRuntimeError: если включена строгая типизация и тип не совпал.
+            TaskDone: если текущая вершина последняя.
+        """
+        slot = self._plan.slots[self._index]
+        if slot.check_output is not None and not slot.check_output(data):
+            self._raise_type_error(
+                slot,
+                f"{slot.out_t} - ожидаемый тип выходных данных. Не совпал с типом полученных данных - {type(data)}",
+            )
 
         # Последний Step доходит до первого return / yeild и завершается
-        if self._call_node.next is None:
-            self._call_node.item.logger.info("Метод start() успешно завершён.")
+        next_indexes = slot.next
+        if not next_indexes:
+            slot.logger.info("Метод start() успешно завершён.")
             self._raise_done()
 
-        return Task(
-            call_node=self._call_node.next,
-            payload=data,  # type: ignore (линтер воспринимает Generic слишком буквально.)
-            strict_types=self._strict_types,
-        )
+        if len(next_indexes) > 1:
+            return self._fork(data, next_indexes)
+
+        index = next_indexes[0]
+        if self._plan.slots[index].fused:
+            return self._run_fused(index, data, observer)
+
+        return self._spawn(data, index)
+
+    def _run_fused(
+        self, index: int, data: Any, observer: Optional[StepObserver] = None
+    ) -> Optional["Task"]:
+        """
+        Исполняет слитые шаги (PlanSlot.fused) подряд, без создания Task и возврата в очередь.
+        Логи, проверка типов и ошибки - как если бы каждый шаг исполнялся своей задачей:
+        при ошибке слитого шага отбрасывается только это значение, а Task продолжает работу.
+        О каждом вызове слитого шага узнаёт observer (вызов, значение и время, ошибка).
+
+        Returns:
+            Task первого неслитого шага (первой ветви, если слитые шаги дошли до развилки)
+            или None, если цепочка закончилась.
+        """
+        slots = self._plan.slots
+        slot = slots[index]
+        while slot.fused:
+            if slot.check_input is not None and not slot.check_input(data):
+                if observer is not None:
+                    observer.on_error(slot.step)
+                self._raise_type_error(
+                    slot,
+                    f"{slot.inp_t} - ожидаемый тип входных данных. Не совпал с типом полученных данных - {type(data)}",
+                    drop_task=False,
+                )
+
+            slot.logger.info("Вызван метод start()!")
+            slot.logger.debug("Стартовые данные: %s.", data)
+            if observer is not None:
+                observer.on_call(slot.step)
+                started = perf_counter_ns()
+            try:
+                output = slot.step.start(data)
+            except Exception as e:
+                if observer is not None:
+                    observer.on_error(slot.step)
+                self._raise_runtime_error(e, slot, drop_task=False)
+
+            if isinstance(output, (GenABC, AsyncGenABC, CoroABC)):
+                # шаг оказался не 1:1 - дальше он исполняется своей задачей
+                task = self._spawn(data, index)
+                task._generator = invoke_as_generator(lambda: output)
+                return task
+
+            slot.logger.info("Метод start() успешно завершён.")
+            if observer is not None:
+                observer.on_value(slot.step, perf_counter_ns() - started)
+
+            if slot.check_output is not None and not slot.check_output(output):
+                if observer is not None:
+                    observer.on_error(slot.step)
+                self._raise_type_error(
+                    slot,
+                    f"{slot.out_t} - ожидаемый тип выходных данных. Не совпал с типом полученных данных - {type(output)}",
+                    drop_task=False,
+                )
+
+            if not slot.next:
+                return None
+            if len(slot.next) > 1:
+                return self._fork(output, slot.next)
+
+            index, data = slot.next[0], output
+            slot = slots[index]
+
+        return self._spawn(data, index)
+
+    def _fork(self, data: Any, indexes: Tuple[int, ...]) -> "Task":
+        """
+        Раздаёт значение ветвям: возвращает Task первой ветви, а Task-и остальных
+        возвращают следующие вызовы step() (до того, как генератор шага продвинется дальше).
+        """
+        self._pending = (data, indexes[1:])
+        return self._spawn(data, indexes[0])
+
+    def _next_branch(self) -> "Task":
+        data, indexes = self._pending  # type: ignore[misc]
+        self._pending = (data, indexes[1:]) if len(indexes) > 1 else None
+        return self._spawn(data, indexes[0])
+
+    def _spawn(self, payload: Any, index: int) -> "Task":
+        """
+        Создаёт Task шага index той же цепочки (по возможности переиспользуя завершённый объект).
+        """
+        free_list = self._plan.free_list
+        task = free_list.acquire() if free_list is not None else None
+        if task is None:
+            task = Task(self._plan, payload, index)
+        else:
+            task.__init__(self._plan, payload, index)  # type: ignore[misc]
+        if self._path is not None:
+            task._path = self._path + (self._emitted,)
+            self._emitted += 1
+        return task
+
+    def _raise_type_error(
+        self, slot: PlanSlot, err_msg: str, drop_task: bool = True
+    ) -> NoReturn:
+        """
+        Отмечает Task завершённым и сообщает об ошибке типов шага
+        (drop_task=False - ошибка слитого шага: Task продолжает работу, см. _run_fused()).
+        """
+        if drop_task:
+            self._is_done = True
+        slot.logger.critical(err_msg)
+        raise TaskTypeRuntimeError(err_msg)
+
+    def _raise_runtime_error(
+        self, e: Exception, slot: Optional[PlanSlot] = None, drop_task: bool = True
+    ) -> NoReturn:
+        """
+        Отмечает Task завершённым и пробрасывает ошибку шага как TaskRuntimeError
+        (drop_task=False - ошибка слитого шага: Task продолжает работу, см. _run_fused()).
+        """
+        if drop_task:
+            self._is_done = True
+        (slot or self._plan.slots[self._index]).logger.fatal(f"{e}", exc_info=True)
+        raise TaskRuntimeError(f"{e}") from e
 
     def _raise_done(self) -> NoReturn:
         """Сигнализирует об остановкке таска."""
@@ -0,0 +1,111 @@
+from dataclasses import dataclass
+from functools import lru_cache
+from importlib import import_module
+from typing import TYPE_CHECKING, Any, Tuple, Type
+
+from fiber.step import Step
+from fiber.pipeline.task.exceptions import TaskDescriptorError
+from fiber.pipeline.task.plan import ExecutionPlan
+from fiber.pipeline.task.utils.datastructs import get_graph_from_edges
+from fiber.pipeline.task.utils.fusion import fuse_steps
+
+if TYPE_CHECKING:
+    from fiber.pipeline.task.core import Task
+
+
+@dataclass(frozen=True)
+class TaskDescriptor:
+    """
+    Сериализуемое (picklable) представление ещё не начатого Task.
+    Используется для передачи задач между процессами.
+
+    Attrs:
+        steps: Пути к шагам оставшейся цепочки ("module:QualName"), начиная с текущего.
+        payload: Входные данные текущего шага.
+        strict_types: Проверять ли типы во время исполнения.
+        fused: Сливать ли 1:1 шаги цепочки (см. fuse_steps()).
+        edges: Индексы следующих шагов для каждого шага из steps (пусто - цепочка не ветвится).
+    """
+
+    steps: Tuple[str, ...]
+    payload: Any
+    strict_types: bool
+    fused: bool = False
+    edges: Tuple[Tuple[int, ...], ...] = ()
+
+    def to_task(self) -> "Task":
+        """
+        Восстанавливает Task из дескриптора (импортирует шаги по их путям).
+        План цепочки компилируется один раз на процесс (см. compile_descriptor_plan()).
+
+        Исключения:
+            TaskDescriptorError: если какой-либо шаг не удалось импортировать.
+        """
+        from fiber.pipeline.task.core import Task
+
+        plan = compile_descriptor_plan(
+            self.steps, self.edges, self.fused, self.strict_types
+        )
+        return Task(plan=plan, payload=self.payload)
+
+
+@lru_cache(maxsize=256)
+def compile_descriptor_plan(
+    steps: Tuple[str, ...],
+    edges: Tuple[Tuple[int, ...], ...],
+    fused: bool,
+    strict_types: bool,
+) -> ExecutionPlan:
+    """
+    Компилирует план цепочки дескриптора. Результат кешируется: воркер-процесс получает
+    множество дескрипторов одних и тех же цепочек, и их задачи разделяют один план.
+
+    Исключения:
+        TaskDescriptorError: если какой-либо шаг не удалось импортировать.
+    """
+    step_types = [resolve_step_path(path) for path in steps]
+    if edges:
+        head = get_graph_from_edges(step_types, edges)
+        if fused:
+            fuse_steps(head)
+        return ExecutionPlan.compile(head, strict_types)
+    return ExecutionPlan.from_steps(step_types, strict_types, fuse=fused)
+
+
+def get_step_path(step: Type[Step]) -> str:
+    """
+    Возвращает путь импорта шага в формате "module:QualName".
+
+    Исключения:
+        TaskDescriptorError: если шаг нельзя импортировать по пути (например объявлен внутри функции).
+    """
+    qualname = step.__qualname__
+
+    if "<locals>" in qualname:
+        raise TaskDescriptorError(
+            f"Шаг {qualname} объявлен внутри функции и не может быть передан в другой процесс."
+        )
+
+    return f"{step.__module__}:{qualname}"
+
+
+def resolve_step_path(path: str) -> Type[Step]:
+    """
+    Импортирует шаг по пути, полученному из get_step_path().
+
+    Исключения:
+        TaskDescriptorError: если путь не указывает на наследника Step.
+    """
+    module_name, _, qualname = path.partition(":")
+
+    try:
+        obj = import_module(module_name)
+        for attr in qualname.split("."):
+            obj = getattr(obj, attr)
+    except (ImportError, AttributeError) as e:
+        raise TaskDescriptorError(f"Не удалось импортировать шаг {path}: {e}") from e
+
+    if not (isinstance(obj, type) and issubclass(obj, Step)):
+        raise TaskDescriptorError(f"{path} не является наследником Step.")
+
+    return obj
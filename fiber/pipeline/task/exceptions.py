@@ -8,3 +8,7 @@ class TaskRuntimeError(Exception):
 
 class TaskTypeRuntimeError(TaskRuntimeError):
     """Ошибка типов входных / выходных данных Task."""
+
+
+class TaskDescriptorError(Exception):
+    """Task не может быть преобразован в дескриптор (или восстановлен из него)."""
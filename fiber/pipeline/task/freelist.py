@@ -0,0 +1,50 @@
+from typing import TYPE_CHECKING, List, Optional
+
+if TYPE_CHECKING:
+    from fiber.pipeline.task.core import Task
+
+
+class TaskFreeList:
+    """
+    Список завершённых Task для переиспользования: новая задача цепочки берёт объект отсюда
+    вместо выделения памяти под новый (см. RuntimeConfig.TASK_FREE_LIST).
+
+    Без блокировок: list.append() и list.pop() атомарны под GIL. Из-за гонок список может
+    ненадолго превысить capacity на несколько объектов - это не влияет на корректность.
+    """
+
+    __slots__ = ("_items", "_capacity")
+
+    def __init__(self, capacity: int):
+        """
+        Args:
+            capacity: Сколько завершённых задач хранить.
+        """
+        if capacity < 1:
+            raise ValueError(f"capacity должен быть больше 0, а не {capacity}.")
+
+        self._items: List["Task"] = []
+        self._capacity = capacity
+
+    def acquire(self) -> Optional["Task"]:
+        """
+        Returns:
+            Завершённый Task (его нужно заново инициализировать) или None, если список пуст.
+        """
+        try:
+            return self._items.pop()
+        except IndexError:
+            return None
+
+    def release(self, task: "Task") -> None:
+        """
+        Кладёт завершённый Task в список (если есть место).
+        """
+        if len(self._items) < self._capacity:
+            self._items.append(task)
+
+    def get_capacity(self) -> int:
+        return self._capacity
+
+    def __len__(self) -> int:
+        return len(self._items)
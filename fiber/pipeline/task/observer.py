@@ -0,0 +1,28 @@
+from typing import Protocol, Type
+
+from fiber.step import Step
+
+
+class StepObserver(Protocol):
+    """
+    Получатель событий исполнения шагов задачи (см. Task.step()). Через него воркер
+    учитывает и шаги, слитые с задачей (PlanSlot.fused): их вызовы своих Task не получают.
+    """
+
+    def on_call(self, step: Type[Step]) -> None:
+        """
+        Вызван Step.start() слитого шага (вызовы шагов задач воркер учитывает сам).
+        """
+
+    def on_value(self, step: Type[Step], elapsed: int) -> None:
+        """
+        Шаг выдал значение.
+
+        Args:
+            elapsed: Время внутри start() / next() генератора (в наносекундах, time.perf_counter_ns()).
+        """
+
+    def on_error(self, step: Type[Step]) -> None:
+        """
+        Слитый шаг завершился ошибкой (ошибки шагов задач воркер учитывает сам).
+        """
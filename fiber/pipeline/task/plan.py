@@ -0,0 +1,238 @@
+from dataclasses import dataclass
+from logging import Logger
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Type, Union
+
+from fiber.step import (
+    Step,
+    get_step_types,
+    is_aggregate_step,
+    is_async_step,
+    is_batch_step,
+    is_ordered_step,
+)
+from fiber.pipeline.task.freelist import TaskFreeList
+from fiber.pipeline.task.utils.datastructs import Node, get_graph_from, iter_nodes
+from fiber.pipeline.task.utils.fusion import fuse_steps
+from fiber.pipeline.task.utils.types import TypeChecker, compile_type_checker
+
+# шаги цепочки; последним элементом может быть список ветвей - цепочек того же вида (см. split_branches())
+PipelineSteps = Sequence[Union[Type[Step], Sequence["PipelineSteps"]]]
+
+
+@dataclass(frozen=True)
+class PlanSlot:
+    """
+    Заранее вычисленные сведения об одном шаге цепочки.
+
+    Attrs:
+        step: Шаг.
+        inp_t: Тип входных данных шага.
+        out_t: Тип выходных данных шага.
+        check_input: Проверка входных данных (None - проверка не нужна: типизация не строгая или тип Any).
+        check_output: Проверка выходных данных (аналогично check_input).
+        logger: Логгер шага.
+        next: Индексы следующих шагов в плане (пусто - шаг последний, несколько - каждое значение шага
+            уходит в каждую ветвь).
+        steps_left: Сколько шагов осталось на самом длинном пути до конца цепочки, включая этот.
+        fused: Исполняется ли шаг сразу за предыдущим, в той же задаче (см. fuse_steps()).
+        is_batch: Объявлен ли у шага start_batch().
+        is_async: Объявлен ли Step.start() как `async def`.
+        is_aggregate: Является ли шаг агрегатом (AggregateStep).
+        is_ordered: Получает ли шаг значения в порядке исходных данных (Step.ordered).
+        feeds: Индексы шагов с Step.ordered дальше по цепочке, до которых доходят значения шага.
+    """
+
+    step: Type[Step]
+    inp_t: Any
+    out_t: Any
+    check_input: Optional[TypeChecker]
+    check_output: Optional[TypeChecker]
+    logger: Logger
+    next: Tuple[int, ...]
+    steps_left: int
+    fused: bool
+    is_batch: bool
+    is_async: bool
+    is_aggregate: bool
+    is_ordered: bool = False
+    feeds: Tuple[int, ...] = ()
+
+
+class ExecutionPlan:
+    """
+    Скомпилированная цепочка вызовов: неизменяемый массив PlanSlot, общий для всех задач цепочки.
+    Цепочка может ветвиться: шаги пронумерованы обходом графа в глубину, PlanSlot.next - индексы ветвей.
+
+    Всё, что зависит только от шага (типы, проверки типов, логгер, флаги), вычисляется один раз
+    при сборке, а Task хранит лишь ссылку на план и индекс текущего шага.
+
+    Attrs:
+        slots: Шаги цепочки.
+        free_list: Завершённые задачи цепочки для переиспользования (None - не переиспользуются, см. enable_recycling()).
+    """
+
+    __slots__ = ("slots", "free_list", "_strict_types")
+
+    def __init__(self, slots: Sequence[PlanSlot], strict_types: bool):
+        if len(slots) == 0:
+            raise ValueError("Нельзя создать план из пустой цепочки.")
+        if slots[0].is_aggregate:
+            # значения агрегата собирает Runtime, исполнить стартовую задачу нечем
+            raise ValueError(
+                f"Шаг-агрегат {slots[0].step.__name__} не может быть первым."
+            )
+
+        self.slots: Tuple[PlanSlot, ...] = tuple(slots)
+        self.free_list: Optional[TaskFreeList] = None
+        self._strict_types = strict_types
+
+    @classmethod
+    def compile(cls, head: Node[Type[Step]], strict_types: bool) -> "ExecutionPlan":
+        """
+        Компилирует граф вызовов в план.
+
+        Args:
+            head: Голова графа вызовов (с уже расставленными Node.fused, если шаги сливаются).
+            strict_types: Проверять ли типы во время исполнения.
+        """
+        nodes = list(iter_nodes(head))
+        indexes = {id(node): index for index, node in enumerate(nodes)}
+
+        # длина самого длинного пути до конца: ветви идут в обходе после своего шага
+        steps_left: Dict[int, int] = {}
+        for node in reversed(nodes):
+            steps_left[id(node)] = 1 + max(
+                (steps_left.get(id(successor), 1) for successor in node.next),
+                default=0,
+            )
+
+        # шаги с Step.ordered, до которых доходят значения шага (без него самого)
+        feeds: Dict[int, Tuple[int, ...]] = {}
+        for node in reversed(nodes):
+            reached = set()
+            for successor in node.next:
+                if is_ordered_step(successor.item):
+                    reached.add(indexes[id(successor)])
+                reached.update(feeds[id(successor)])
+            feeds[id(node)] = tuple(sorted(reached))
+
+        slots = []
+        for node in nodes:
+            step = node.item
+            inp_t, out_t = get_step_types(step)
+            slots.append(
+                PlanSlot(
+                    step=step,
+                    inp_t=inp_t,
+                    out_t=out_t,
+                    check_input=compile_type_checker(inp_t) if strict_types else None,
+                    check_output=compile_type_checker(out_t) if strict_types else None,
+                    logger=step.logger,
+                    next=tuple(indexes[id(successor)] for successor in node.next),
+                    steps_left=steps_left[id(node)],
+                    fused=node.fused,
+                    is_batch=is_batch_step(step),
+                    is_async=is_async_step(step),
+                    is_aggregate=is_aggregate_step(step),
+                    is_ordered=is_ordered_step(step),
+                    feeds=feeds[id(node)],
+                )
+            )
+
+        return cls(slots, strict_types)
+
+    @classmethod
+    def from_steps(
+        cls, steps: PipelineSteps, strict_types: bool, fuse: bool = False
+    ) -> "ExecutionPlan":
+        """
+        Компилирует план из последовательности шагов (возможно, с ветвями - см. split_branches()).
+
+        Args:
+            fuse: Слить идущие подряд 1:1 шаги (см. fuse_steps()).
+        """
+        head = get_graph_from(steps)
+        if fuse:
+            fuse_steps(head)
+        return cls.compile(head, strict_types)
+
+    def enable_recycling(self, capacity: int) -> None:
+        """
+        Включает переиспользование завершённых задач цепочки (повторный вызов ничего не меняет).
+
+        Args:
+            capacity: Сколько завершённых задач хранить.
+        """
+        if self.free_list is None:
+            self.free_list = TaskFreeList(capacity)
+
+    def is_strict(self) -> bool:
+        """
+        Returns:
+            Проверяются ли типы во время исполнения.
+        """
+        return self._strict_types
+
+    def is_fused(self) -> bool:
+        """
+        Returns:
+            Есть ли в плане слитые шаги.
+        """
+        return any(slot.fused for slot in self.slots)
+
+    def is_branched(self) -> bool:
+        """
+        Returns:
+            Ветвится ли цепочка.
+        """
+        return any(len(slot.next) > 1 for slot in self.slots)
+
+    def has_batch_steps(self) -> bool:
+        """
+        Returns:
+            Есть ли в плане шаги с start_batch().
+        """
+        return any(slot.is_batch for slot in self.slots)
+
+    def has_aggregate_steps(self) -> bool:
+        """
+        Returns:
+            Есть ли в плане шаги-агрегаты (AggregateStep).
+        """
+        return any(slot.is_aggregate for slot in self.slots)
+
+    def has_ordered_steps(self) -> bool:
+        """
+        Returns:
+            Есть ли в плане шаги с Step.ordered.
+        """
+        return any(slot.is_ordered for slot in self.slots)
+
+    def get_steps(self, start: int = 0) -> Tuple[Type[Step], ...]:
+        """
+        Returns:
+            Шаги плана, начиная с индекса start.
+        """
+        return tuple(slot.step for slot in self.slots[start:])
+
+    def __getitem__(self, index: int) -> PlanSlot:
+        return self.slots[index]
+
+    def __len__(self) -> int:
+        return len(self.slots)
+
+    def __repr__(self) -> str:
+        return f"ExecutionPlan({self._describe(0)})"
+
+    def _describe(self, index: int) -> str:
+        names: List[str] = []
+        slot = self.slots[index]
+        while len(slot.next) == 1:
+            names.append(slot.step.__name__)
+            slot = self.slots[slot.next[0]]
+        names.append(slot.step.__name__)
+        if slot.next:
+            names.append(
+                "[" + " | ".join(self._describe(branch) for branch in slot.next) + "]"
+            )
+        return " -> ".join(names)
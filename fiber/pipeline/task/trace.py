@@ -0,0 +1,14 @@
+from typing import NamedTuple
+
+
+class TraceContext(NamedTuple):
+    """
+    Контекст трассировки, который Task несёт от шага к шагу (см. RuntimeConfig.TRACE_FILE).
+
+    Attrs:
+        trace_id: Идентификатор трассы - общий для всех задач, порождённых одним значением шага-источника.
+        parent_span_id: Span вызова шага, который выдал входные данные задачи.
+    """
+
+    trace_id: int
+    parent_span_id: int
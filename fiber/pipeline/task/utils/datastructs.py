@@ -1,23 +1,24 @@
-from dataclasses import dataclass
-from typing import Optional, Generic, Sequence, TypeVar
-
+from dataclasses import dataclass, field
+from typing import Any, Dict, Generic, Iterator, List, Sequence, Tuple, TypeVar
 
 T = TypeVar("T")
 
 
-@dataclass
+@dataclass(eq=False)
 class Node(Generic[T]):
     """
-    Лист связного списка. Дополнительно хранит ссылку на следующий лист.
-    Если лист является последним, то next = None.
+    Вершина графа вызовов. Хранит ссылки на следующие вершины.
+    Если вершина является последней, то next пуст; если вершин несколько - граф ветвится.
 
     Attrs:
         item: T
-        next: Следующий вызов.
+        next: Следующие вызовы (ветви).
+        fused: Исполняется ли вызов сразу за предыдущим, в той же задаче (см. fuse_steps()).
     """
 
     item: T
-    next: Optional["Node[T]"] = None
+    next: List["Node[T]"] = field(default_factory=list)
+    fused: bool = False
 
 
 def get_linked_list_from(sequence: Sequence[T]) -> Node[T]:
@@ -34,14 +35,151 @@ def get_linked_list_from(sequence: Sequence[T]) -> Node[T]:
     if len(sequence) == 0:
         raise ValueError("Нельзя создать список из пустой последовательности.")
 
-    head_node = Node(sequence[0], None)
+    head_node = Node(sequence[0])
 
     prev_node = head_node
 
     for item in sequence[1:]:
         new_node = Node(item)
 
-        prev_node.next = new_node
+        prev_node.next.append(new_node)
         prev_node = new_node
 
     return head_node
+
+
+def split_branches(sequence: Sequence[Any]) -> Tuple[Sequence[Any], Sequence[Any]]:
+    """
+    Отделяет ветви от последовательности: последним элементом может быть список (или кортеж) ветвей -
+    последовательностей того же вида, каждая из которых продолжает последовательность.
+
+    Например [A, B, [[C, D], [E]]] - после B значения идут и в C -> D, и в E.
+
+    Возвращаает:
+        Элементы до ветвей и ветви (пусто, если последовательность не ветвится).
+    """
+    if len(sequence) > 0 and isinstance(sequence[-1], (list, tuple)):
+        return sequence[:-1], sequence[-1]
+    return sequence, ()
+
+
+def get_graph_from(sequence: Sequence[Any]) -> Node[Any]:
+    """
+    Преобразует последовательность с ветвями (см. split_branches()) в дерево из Node.
+    Последовательность без ветвей даёт тот же список, что и get_linked_list_from().
+
+    Возвращаает:
+        Node - голова графа.
+
+    Исключения:
+        ValueError: если последовательность или ветвь пусты, ветвей нет или они стоят не в конце.
+    """
+    items, branches = split_branches(sequence)
+    if len(items) == 0:
+        raise ValueError("Нельзя создать список из пустой последовательности.")
+    if any(isinstance(item, (list, tuple)) for item in items):
+        raise ValueError(
+            "Ветви могут быть только последним элементом последовательности."
+        )
+    if len(items) < len(sequence) and len(branches) == 0:
+        raise ValueError("Список ветвей пуст.")
+
+    head = get_linked_list_from(items)
+    tail = head
+    while tail.next:
+        tail = tail.next[0]
+    for branch in branches:
+        if not isinstance(branch, (list, tuple)):
+            raise ValueError(f"Ветвь должна быть последовательностью, а не {branch!r}.")
+        tail.next.append(get_graph_from(branch))
+
+    return head
+
+
+def get_graph_from_edges(items: Sequence[T], edges: Sequence[Sequence[int]]) -> Node[T]:
+    """
+    Собирает граф из вершин и их рёбер (edges[i] - индексы следующих вершин для items[i]).
+
+    Возвращаает:
+        Node[T] - голова графа (вершина items[0]).
+    """
+    nodes = [Node(item) for item in items]
+    for node, successors in zip(nodes, edges):
+        node.next = [nodes[i] for i in successors]
+    return nodes[0]
+
+
+def iter_nodes(head: Node[T]) -> Iterator[Node[T]]:
+    """
+    Обходит вершины графа в глубину (каждую - один раз), ветви - в порядке объявления.
+    """
+    seen: Dict[int, Node[T]] = {}
+    stack = [head]
+    while stack:
+        node = stack.pop()
+        if id(node) in seen:
+            continue
+        seen[id(node)] = node
+        yield node
+        stack.extend(reversed(node.next))
+
+
+def iter_paths(head: Node[T]) -> Iterator[List[T]]:
+    """
+    Перебирает пути графа от головы до каждой последней вершины.
+    """
+    stack: List[Tuple[Node[T], List[T]]] = [(head, [head.item])]
+    while stack:
+        node, path = stack.pop()
+        if not node.next:
+            yield path
+        for successor in reversed(node.next):
+            stack.append((successor, path + [successor.item]))
+
+
+def get_sequence_from(head: Node[T]) -> List[Any]:
+    """
+    Обратное к get_graph_from(): преобразует дерево из Node в последовательность с ветвями.
+    """
+    sequence: List[Any] = [head.item]
+    node = head
+    while len(node.next) == 1:
+        node = node.next[0]
+        sequence.append(node.item)
+    if node.next:
+        sequence.append([get_sequence_from(branch) for branch in node.next])
+    return sequence
+
+
+def merge_prefixes(heads: Sequence[Node[T]]) -> List[Node[T]]:
+    """
+    Сливает деревья в префиксное дерево (trie): деревья с одинаковой головой объединяются,
+    одинаковые вершины с общим путём от головы становятся одной вершиной, а дерево
+    ветвится там, где пути расходятся. Исходные деревья не изменяются.
+
+    Возвращаает:
+        Головы слитых деревьев (в порядке первого появления).
+    """
+    roots: List[Node[T]] = []
+    for head in heads:
+        _merge_into(roots, head)
+    return roots
+
+
+def count_nodes(heads: Sequence[Node[T]]) -> int:
+    """
+    Возвращаает:
+        Сколько вершин во всех деревьях.
+    """
+    return sum(1 for head in heads for _ in iter_nodes(head))
+
+
+def _merge_into(siblings: List[Node[T]], node: Node[T]) -> None:
+    for sibling in siblings:
+        if sibling.item == node.item:
+            break
+    else:
+        sibling = Node(node.item)
+        siblings.append(sibling)
+    for successor in node.next:
+        _merge_into(sibling.next, successor)
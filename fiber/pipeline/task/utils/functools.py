@@ -1,8 +1,24 @@
-from typing import Callable, Generator, TypeVar
+import asyncio
+from typing import (
+    Any,
+    AsyncGenerator,
+    Awaitable,
+    Callable,
+    Generator,
+    Iterable,
+    List,
+    Optional,
+    TypeVar,
+)
+from collections.abc import AsyncGenerator as AsyncGenABC, Coroutine as CoroABC
 from collections.abc import Generator as GenABC
 
-
 O = TypeVar("O")
+T = TypeVar("T")
+
+Offload = Callable[[Callable[[], T]], Awaitable[T]]
+
+_EXHAUSTED = object()
 
 
 def invoke_as_generator(callable: Callable[[], O]) -> Generator[O, None, None]:
@@ -11,5 +27,77 @@ def invoke_as_generator(callable: Callable[[], O]) -> Generator[O, None, None]:
     if isinstance(output, GenABC):
         generator = output
         yield from generator
+    elif isinstance(output, AsyncGenABC):
+        yield from _iterate_async_generator(output)
+    elif isinstance(output, CoroABC):
+        yield asyncio.run(output)
+    else:
+        yield output
+
+
+def invoke_batch(
+    start_batch: Callable[[List[Any]], Optional[Iterable[O]]], items: List[Any]
+) -> Generator[O, None, None]:
+    """
+    Вызывает Step.start_batch() с пачкой входных данных и выдаёт его результаты по одному
+    (None - результатов нет, например у шага-приёмника).
+    """
+    outputs = start_batch(items)
+    if outputs is not None:
+        yield from outputs
+
+
+def _iterate_async_generator(
+    async_generator: AsyncGenerator[O, None],
+) -> Generator[O, None, None]:
+    """
+    Синхронно проходит по асинхронному генератору на собственном event loop-е
+    (для async-шагов, запущенных синхронным Runtime).
+    """
+    loop = asyncio.new_event_loop()
+    try:
+        while True:
+            try:
+                yield loop.run_until_complete(async_generator.__anext__())
+            except StopAsyncIteration:
+                return
+    finally:
+        loop.run_until_complete(async_generator.aclose())
+        loop.close()
+
+
+async def invoke_as_async_generator(
+    callable: Callable[[], Any],
+    offload: Optional[Offload] = None,
+) -> AsyncGenerator[Any, None]:
+    """
+    Асинхронный аналог invoke_as_generator().
+
+    Args:
+        callable: Вызов Step.start(), результатом которого может быть значение, генератор,
+            корутина или асинхронный генератор.
+        offload: Если передан - сам вызов и каждый next() синхронного генератора
+            исполняются через него (например в пуле потоков), чтобы не блокировать event loop.
+    """
+    if offload is None:
+        output = callable()
+    else:
+        output = await offload(callable)
+
+    if isinstance(output, AsyncGenABC):
+        async for item in output:
+            yield item
+    elif isinstance(output, CoroABC):
+        yield await output
+    elif isinstance(output, GenABC):
+        while True:
+            if offload is None:
+                item = next(output, _EXHAUSTED)
+            else:
+                item = await offload(lambda: next(output, _EXHAUSTED))
+
+            if item is _EXHAUSTED:
+                return
+            yield item
     else:
         yield output
@@ -0,0 +1,35 @@
+from typing import Dict, Type
+
+from fiber.step import Step, is_one_to_one_step, is_ordered_step
+from fiber.pipeline.task.utils.datastructs import Node, iter_nodes
+
+
+def fuse_steps(head: Node[Type[Step]]) -> None:
+    """
+    Сливает идущие подряд 1:1 шаги (см. Step.one_to_one): вызов помечается fused,
+    если и он, и предыдущий шаг 1:1 и исполняются одним пулом. Задача предыдущего шага
+    исполняет такие вызовы сразу, за тот же ход воркера, без создания Task и возврата в очередь.
+
+    Вызов после шага-генератора не сливается - иначе значения генератора
+    обрабатывались бы последовательно одним воркером. Ветви (несколько следующих вызовов)
+    тоже не сливаются: каждая ветвь исполняется своей задачей. Шаги с Step.ordered не сливаются
+    с предыдущими: их значения сначала упорядочиваются.
+
+    Args:
+        head: Голова графа вызовов (первый шаг никогда не сливается).
+    """
+    predecessors: Dict[int, int] = {}
+    for node in iter_nodes(head):
+        for successor in node.next:
+            predecessors[id(successor)] = predecessors.get(id(successor), 0) + 1
+
+    for prev in iter_nodes(head):
+        for node in prev.next:
+            node.fused = (
+                len(prev.next) == 1
+                and predecessors[id(node)] == 1
+                and is_one_to_one_step(prev.item)
+                and is_one_to_one_step(node.item)
+                and not is_ordered_step(node.item)
+                and prev.item.pool == node.item.pool
+            )
@@ -1,7 +1,22 @@
-from typing import Any, Type, TypeVar, Union
+import sys
+from functools import partial
+from types import UnionType
+from typing import (
+    Any,
+    Callable,
+    Optional,
+    Tuple,
+    Type,
+    TypeVar,
+    Union,
+    get_args,
+    get_origin,
+)
 
 T = TypeVar("T")
 
+TypeChecker = Callable[[Any], bool]
+
 
 def impr_isinstance(data: T, expected_type: Union[Type[T], Any]) -> bool:
     """
@@ -9,6 +24,9 @@ def impr_isinstance(data: T, expected_type: Union[Type[T], Any]) -> bool:
 
     Особенности:
         `data` = ..., `expected_type` = typing.Any => True
+        NumPy-массивы (np.ndarray, numpy.typing.NDArray[...]) проверяются по dtype и размерности из аннотации.
+        Объединения (Optional[int], Union[int, str], int | None) - значение должно подходить хотя бы под один тип.
+        Для остальных generic-ов (List[int] и т.п.) проверяется только контейнер.
 
     Параметры:
         `data` (Any): Проверяемое значение.
@@ -17,7 +35,148 @@ def impr_isinstance(data: T, expected_type: Union[Type[T], Any]) -> bool:
     if expected_type is Any:
         return True
 
+    array_spec = _get_array_spec(expected_type)
+    if array_spec is not None:
+        return _array_matches(data, *array_spec)
+
+    origin = get_origin(expected_type)
+    if _is_union(origin):
+        return any(impr_isinstance(data, arg) for arg in get_args(expected_type))
+    if origin is not None:
+        return isinstance(origin, type) and isinstance(data, origin)
+
     if isinstance(data, expected_type):
         return True
 
     return False
+
+
+def compile_type_checker(expected_type: Union[Type[Any], Any]) -> Optional[TypeChecker]:
+    """
+    Заранее разбирает аннотацию и возвращает функцию проверки значения - тот же результат, что
+    impr_isinstance(data, expected_type), но без разбора аннотации при каждом вызове.
+
+    Returns:
+        Функция data -> bool или None, если аннотация ничего не ограничивает (typing.Any).
+    """
+    if expected_type is Any:
+        return None
+
+    array_spec = _get_array_spec(expected_type)
+    if array_spec is not None:
+        return partial(_array_matches, ndim=array_spec[0], scalar=array_spec[1])
+
+    origin = get_origin(expected_type)
+    if _is_union(origin):
+        args = get_args(expected_type)
+        checks = tuple(compile_type_checker(arg) for arg in args)
+        if None in checks:
+            # одна из альтернатив - typing.Any
+            return None
+        if all(isinstance(arg, type) and _get_array_spec(arg) is None for arg in args):
+            # только обычные классы - один isinstance() с кортежем
+            return partial(_isinstance_of, expected_type=args)
+        return partial(_any_of, checks=checks)
+    if origin is not None:
+        if not isinstance(origin, type):
+            return _never
+        return partial(_isinstance_of, expected_type=origin)
+
+    return partial(_isinstance_of, expected_type=expected_type)
+
+
+def is_type_compatible(out_t: Any, in_t: Any) -> bool:
+    """
+    Проверяет, можно ли передать выход одного шага (out_t) на вход следующего (in_t).
+
+    Типы должны совпадать. Для NumPy-массивов вход может быть шире выхода:
+    NDArray[np.float64] совместим с NDArray[np.floating] и np.ndarray, но не с NDArray[np.int64].
+    """
+    if out_t == in_t:
+        return True
+
+    out_spec, in_spec = _get_array_spec(out_t), _get_array_spec(in_t)
+    if out_spec is None or in_spec is None:
+        return False
+
+    out_ndim, out_dtype = out_spec
+    in_ndim, in_dtype = in_spec
+
+    if in_ndim is not None and out_ndim != in_ndim:
+        return False
+    if in_dtype is None:
+        return True
+    return out_dtype is not None and issubclass(out_dtype, in_dtype)
+
+
+def _get_array_spec(tp: Any) -> Optional[Tuple[Optional[int], Optional[type]]]:
+    """
+    Разбирает аннотацию NumPy-массива.
+
+    Returns:
+        (размерность, тип элементов) - None там, где аннотация ничего не ограничивает;
+        None, если это не аннотация массива (или NumPy не импортирован).
+    """
+    # numpy - необязательная зависимость: без импортированного numpy аннотаций массивов быть не может
+    np = sys.modules.get("numpy")
+    if np is None:
+        return None
+
+    if tp is np.ndarray:
+        return None, None
+
+    npt = sys.modules.get("numpy.typing")
+    if npt is not None and tp is npt.NDArray:
+        return None, None
+
+    origin = get_origin(tp)
+    if npt is not None and origin is npt.NDArray:
+        # numpy.typing.NDArray[dtype]
+        return None, _as_scalar_type(get_args(tp)[0])
+
+    if origin is not np.ndarray:
+        return None
+
+    shape, dtype = get_args(tp)
+    dtype_args = get_args(dtype)
+    scalar = _as_scalar_type(dtype_args[0]) if dtype_args else None
+
+    ndim = None
+    shape_args = get_args(shape)
+    if shape_args and Ellipsis not in shape_args:
+        ndim = len(shape_args)
+
+    return ndim, scalar
+
+
+def _as_scalar_type(tp: Any) -> Optional[type]:
+    # Any, TypeVar и т.п. не ограничивают тип элементов
+    return tp if isinstance(tp, type) else None
+
+
+def _is_union(origin: Any) -> bool:
+    return origin is Union or origin is UnionType
+
+
+def _isinstance_of(data: Any, expected_type: Union[type, Tuple[type, ...]]) -> bool:
+    return isinstance(data, expected_type)
+
+
+def _any_of(data: Any, checks: Tuple[TypeChecker, ...]) -> bool:
+    return any(check(data) for check in checks)
+
+
+def _never(data: Any) -> bool:
+    return False
+
+
+def _array_matches(data: Any, ndim: Optional[int], scalar: Optional[type]) -> bool:
+    np = sys.modules["numpy"]
+
+    if not isinstance(data, np.ndarray):
+        return False
+    if ndim is not None and data.ndim != ndim:
+        return False
+    if scalar is not None and not issubclass(data.dtype.type, scalar):
+        return False
+    return True
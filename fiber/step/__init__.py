@@ -1,5 +1,19 @@
 from fiber.step.core import Step
-from fiber.step.types import get_step_types
+from fiber.step.aggregate import (
+    AggregateStep,
+    CountWindow,
+    SlidingWindow,
+    TumblingWindow,
+    Window,
+)
+from fiber.step.types import (
+    get_step_types,
+    is_aggregate_step,
+    is_async_step,
+    is_batch_step,
+    is_one_to_one_step,
+    is_ordered_step,
+)
 from fiber.step.vars import I, O
 from fiber.step.exceptions import (
     NotAStepError,
@@ -9,7 +23,17 @@ from fiber.step.exceptions import (
 
 __all__ = [
     "Step",
+    "AggregateStep",
+    "TumblingWindow",
+    "SlidingWindow",
+    "CountWindow",
+    "Window",
     "get_step_types",
+    "is_aggregate_step",
+    "is_async_step",
+    "is_batch_step",
+    "is_one_to_one_step",
+    "is_ordered_step",
     "NotAStepError",
     "StepTypeParametersMissing",
     "I",
@@ -0,0 +1,166 @@
+from abc import abstractmethod
+from dataclasses import dataclass
+from typing import Any, Hashable, Union
+
+from fiber.step.core import Step
+from fiber.step.vars import I, O
+
+
+@dataclass(frozen=True)
+class TumblingWindow:
+    """
+    Окна по времени без перекрытия: [0, size), [size, 2 * size), ...
+
+    Attrs:
+        size: Длина окна (в секундах).
+    """
+
+    size: float
+
+    def __post_init__(self) -> None:
+        if self.size <= 0:
+            raise ValueError(f"size должен быть больше 0, а не {self.size}.")
+
+    @property
+    def every(self) -> float:
+        return self.size
+
+    @property
+    def panes(self) -> int:
+        return 1
+
+
+@dataclass(frozen=True)
+class SlidingWindow:
+    """
+    Скользящие окна по времени: окно длиной size закрывается каждые every секунд,
+    поэтому значение входит в size / every окон.
+
+    Attrs:
+        size: Длина окна (в секундах), кратная every.
+        every: Шаг окна (в секундах).
+    """
+
+    size: float
+    every: float
+
+    def __post_init__(self) -> None:
+        if self.every <= 0:
+            raise ValueError(f"every должен быть больше 0, а не {self.every}.")
+        if self.size < self.every or abs(self.size / self.every - self.panes) > 1e-9:
+            raise ValueError(
+                f"size ({self.size}) должен быть кратен every ({self.every})."
+            )
+
+    @property
+    def panes(self) -> int:
+        """
+        Returns:
+            Из скольких отрезков длиной every состоит окно.
+        """
+        return round(self.size / self.every)
+
+
+@dataclass(frozen=True)
+class CountWindow:
+    """
+    Окна по количеству: окно ключа закрывается, как только в нём наберётся count значений
+    (со всех воркеров вместе). В конце потока у ключа может остаться одно неполное окно.
+
+    Attrs:
+        count: Значений в окне.
+    """
+
+    count: int
+
+    def __post_init__(self) -> None:
+        if self.count < 1:
+            raise ValueError(f"count должен быть больше 0, а не {self.count}.")
+
+
+Window = Union[TumblingWindow, SlidingWindow, CountWindow]
+
+
+class AggregateStep(Step[I, O]):
+    """
+    Шаг-агрегат: сводит значения окна (см. window) в одно значение на ключ.
+    Значения шага не исполняются по одному - Runtime складывает их в частичные состояния
+    (у каждого воркера свои), при закрытии окна сливает состояния воркеров (merge())
+    и отдаёт результат finish() следующим шагам цепочки новыми Task-ами.
+
+    start() у агрегата не реализуется: его значения собирает Runtime из задач предыдущих шагов,
+    поэтому агрегат не может быть первым шагом цепочки.
+
+    Окна по времени считаются по часам Runtime (время обработки значения). В конце потока
+    все открытые окна закрываются досрочно.
+
+    Поддерживается только Runtime с BACKEND="thread".
+
+    Аттрибуты:
+        window: Окна шага (TumblingWindow, SlidingWindow или CountWindow).
+
+    Пример:
+        >>> class CountWords(AggregateStep[str, Tuple[str, int]]):
+        >>>     window = TumblingWindow(1.0)
+
+        >>>     @classmethod
+        >>>     def key(cls, data: str) -> str:
+        >>>         return data
+
+        >>>     @classmethod
+        >>>     def create(cls) -> int:
+        >>>         return 0
+
+        >>>     @classmethod
+        >>>     def add(cls, state: int, data: str) -> int:
+        >>>         return state + 1
+
+        >>>     @classmethod
+        >>>     def merge(cls, left: int, right: int) -> int:
+        >>>         return left + right
+
+        >>>     @classmethod
+        >>>     def finish(cls, key: str, state: int) -> Tuple[str, int]:
+        >>>         return key, state
+    """
+
+    window: Window = TumblingWindow(1.0)
+
+    @classmethod
+    def key(cls, data: I) -> Hashable:
+        """
+        Returns:
+            Ключ, по которому значение агрегируется (по умолчанию один ключ None на всё окно).
+        """
+        return None
+
+    @classmethod
+    @abstractmethod
+    def create(cls) -> Any:
+        """
+        Returns:
+            Пустое состояние ключа.
+        """
+
+    @classmethod
+    @abstractmethod
+    def add(cls, state: Any, data: I) -> Any:
+        """
+        Добавляет значение в состояние ключа (можно изменить state и вернуть его же).
+        """
+
+    @classmethod
+    @abstractmethod
+    def merge(cls, left: Any, right: Any) -> Any:
+        """
+        Сливает два состояния ключа (можно изменить left и вернуть его же, right изменять нельзя:
+        в скользящих окнах одно состояние входит в несколько окон).
+        """
+
+    @classmethod
+    def finish(cls, key: Hashable, state: Any) -> O:
+        """
+        Returns:
+            Результат окна для ключа - входные данные следующих шагов (по умолчанию само состояние).
+        """
+        return state
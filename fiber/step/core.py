@@ -1,6 +1,14 @@
 from abc import abstractmethod, ABC
 from logging import Logger
-from typing import Generic, Generator, Union, get_origin
+from typing import (
+    AsyncGenerator,
+    Awaitable,
+    Generic,
+    Generator,
+    Optional,
+    Union,
+    get_origin,
+)
 
 from fiber.logging import get_main_step_logger
 from fiber.step.vars import I, O
@@ -23,8 +31,27 @@ class Step(ABC, Generic[I, O]):
 
     Аттрибуты:
         start(): абстрактный статический метод, вызываемый у наследника при выполнении цепочки.
+        start_batch(items) (необязательный): классовый метод, принимающий список входных данных и возвращающий
+        итерируемое выходных (или None). Если объявлен, Runtime копит входные данные шага в пачки
+        (до max_batch_size штук или max_batch_delay секунд) и вызывает его вместо start() - это снимает
+        накладные расходы на каждый элемент (очередь, Task, обращения к БД или внешним API).
+        start_batch() должен быть синхронным (в т.ч. может быть генератором).
         logger (Logger): Логгер выделяемый шагу. Рекомнедуется при разработки ипользовать именно его
         и его наследников для централизованого и безопасного логгирования.
+        pool (Optional[str]): Пул воркеров, который исполняет шаг (см. RuntimeConfig.POOLS).
+        Например медленным I/O-шагам можно выделить pool = "io", чтобы они не занимали воркеров CPU-шагов.
+        None - общий пул.
+        one_to_one (Optional[bool]): Выдаёт ли шаг ровно одно значение на входное (1:1). Такие шаги, идущие подряд,
+        можно слить и исполнять одной задачей без возврата в очередь (см. TaskBuilder.build_from(fuse=True)).
+        None - определяется автоматически (start() без yield и не async), False - никогда не сливать шаг.
+        max_batch_size (int): Размер пачки для шагов с start_batch().
+        max_batch_delay (float): Сколько секунд пачка шага с start_batch() может копиться, прежде чем уйдёт неполной.
+        ordered (bool): Получать значения в порядке исходных данных (обхода генераторов предыдущих шагов),
+        как при одном воркере. Предыдущие шаги исполняются параллельно, а их значения придерживаются
+        в ограниченном буфере (см. RuntimeConfig.REORDER_LIMIT) и отдаются шагу по одному, по порядку.
+        Нужен шагам, чувствительным к порядку (дозапись в файл, нумерация). Только для Runtime с BACKEND="thread".
+
+    Агрегаты по окнам (подсчёт, группировка, top-K) наследуют AggregateStep, а не Step.
 
     Исключения:
         StepTypeParametersMissing:
@@ -55,10 +82,20 @@ class Step(ABC, Generic[I, O]):
     """
 
     logger: Logger
+    pool: Optional[str] = None
+    one_to_one: Optional[bool] = None
+    max_batch_size: int = 100
+    max_batch_delay: float = 0.05
+    ordered: bool = False
 
     @classmethod
     @abstractmethod
-    def start(cls, data: I) -> Union[O, Generator[O, None, None]]:
+    def start(cls, data: I) -> Union[
+        O,
+        Generator[O, None, None],
+        Awaitable[O],
+        AsyncGenerator[O, None],
+    ]:
         """
         Абстрактный классовый метод. Является основной точкой входа для каждого шага.
         В случае если шаг первый первый, то он не должен принимать None в качестве I, а если последний
@@ -71,6 +108,8 @@ class Step(ABC, Generic[I, O]):
             O или Generator[O, None, None]:
                 - Если возвращается O — шаг выполняется один раз и передаёт результат дальше.
                 - Если используется yield и возвращается генератор — шаг может передать несколько результатов.
+                - start() можно объявить и как `async def` (в т.ч. с yield) - такие шаги AsyncRuntime
+                  исполняет прямо в event loop-е, а синхронный Runtime - на собственном event loop-е в потоке воркера.
 
         Особенности yield:
             - Каждый yield запускает все оставшиеся шаги в цепочке, начиная со следующего.
@@ -109,9 +148,12 @@ class Step(ABC, Generic[I, O]):
         # break не было, и цикл завершен - вызов else
         for base in getattr(cls, "__orig_bases__", []):
             # получение обекта класса
-            if get_origin(base) is Step:
-                # если generic сгенерировал __orig_bases__ и там есть Step,
-                # то класс гарантированно инициализируется корректно
+            origin = get_origin(base)
+            if origin is Step or (
+                isinstance(origin, type) and issubclass(origin, Step)
+            ):
+                # если generic сгенерировал __orig_bases__ и там есть Step
+                # (или его generic-наследник, например AggregateStep[I, O]), то класс гарантированно инициализируется корректно
                 # (вся остальная валидация и так выполняеться в Generic)
 
                 return
@@ -1,7 +1,9 @@
+import inspect
 from logging import Logger
-from typing import Type, Tuple, Any, get_origin, get_args
+from typing import Any, Optional, Type, Tuple, get_origin, get_args
 
 from fiber.logging import get_kernel_logger
+from fiber.step.aggregate import AggregateStep
 from fiber.step.core import Step
 from fiber.step.exceptions import NotAStepError, StepTypeParametersMissing
 
@@ -46,15 +48,69 @@ def get_step_types(
         logger.fatal(error_msg)
         raise NotAStepError(error_msg)
 
-    # получение Generic-ов родителей (объектов класса typing._GenericAlias)
-    for base in getattr(step, "__orig_bases__", []):
-        # получение обекта класса
-        if get_origin(base) is Step:
-            # получение аргументов Generic-а
-            args = get_args(base)
-
-            return args
+    args = _get_step_args(step)
+    if args is not None:
+        return args
 
     error_msg = f"{step.__name__} должен явно указывать параметры типа: Step[InputType, OutputType]"
     step.logger.fatal(error_msg)
     raise StepTypeParametersMissing(error_msg)
+
+
+def is_async_step(step: Type[Step]) -> bool:
+    """
+    Проверяет, объявлен ли Step.start() как `async def` (корутина или асинхронный генератор).
+    """
+    return inspect.iscoroutinefunction(step.start) or inspect.isasyncgenfunction(
+        step.start
+    )
+
+
+def is_one_to_one_step(step: Type[Step]) -> bool:
+    """
+    Проверяет, выдаёт ли шаг ровно одно значение на входное (см. Step.one_to_one).
+    Если шаг не объявил это явно - 1:1 считается синхронный start() без yield.
+    """
+    if is_batch_step(step) or is_aggregate_step(step):
+        return False
+    if step.one_to_one is not None:
+        return step.one_to_one
+    return not (inspect.isgeneratorfunction(step.start) or is_async_step(step))
+
+
+def is_batch_step(step: Type[Step]) -> bool:
+    """
+    Проверяет, обрабатывает ли шаг данные пачками (объявлен Step.start_batch()).
+    """
+    return getattr(step, "start_batch", None) is not None
+
+
+def is_ordered_step(step: Type[Step]) -> bool:
+    """
+    Проверяет, получает ли шаг значения в порядке исходных данных (см. Step.ordered).
+    """
+    return bool(step.ordered)
+
+
+def is_aggregate_step(step: Type[Step]) -> bool:
+    """
+    Проверяет, является ли шаг агрегатом (наследником AggregateStep).
+    """
+    return issubclass(step, AggregateStep)
+
+
+def _get_step_args(step: type) -> Optional[Tuple[Any, ...]]:
+    # получение Generic-ов родителей (объектов класса typing._GenericAlias)
+    for base in getattr(step, "__orig_bases__", []):
+        # получение обекта класса
+        origin = get_origin(base)
+        if origin is Step:
+            # получение аргументов Generic-а
+            return get_args(base)
+        if isinstance(origin, type) and issubclass(origin, Step):
+            # generic-наследник Step (например AggregateStep[I, O]): его параметры подставляются в Step[...]
+            args = _get_step_args(origin)
+            if args is not None:
+                params = dict(zip(origin.__parameters__, get_args(base)))
+                return tuple(params.get(arg, arg) for arg in args)
+    return None
@@ -0,0 +1,73 @@
+from typing import Generator, List
+
+import pytest
+
+np = pytest.importorskip("numpy")
+npt = pytest.importorskip("numpy.typing")
+
+from fiber.step import Step  # noqa: E402
+from fiber.columnar import RecordBatch, iter_chunks  # noqa: E402
+from fiber.pipeline.task import TaskBuilder  # noqa: E402
+from fiber.pipeline.runtime import Runtime, RuntimeConfig, ITaskProvider  # noqa: E402
+
+
+def test_iter_chunks_keeps_views():
+    array = np.arange(10)
+    chunks = list(iter_chunks(array, 4))
+
+    assert [len(chunk) for chunk in chunks] == [4, 4, 2]
+    assert all(np.shares_memory(chunk, array) for chunk in chunks)
+
+
+def test_record_batch_columns():
+    batch = RecordBatch({"id": [1, 2, 3], "score": np.array([0.1, 0.5, 0.9])})
+    passed = batch.with_column("passed", batch["score"] > 0.3)
+
+    assert batch.column_names == ["id", "score"]
+    assert passed.column_names == ["id", "score", "passed"]
+    assert passed.schema["passed"] == np.bool_
+    assert [len(chunk) for chunk in passed.iter_chunks(2)] == [2, 1]
+    assert RecordBatch.concat(list(passed.iter_chunks(2)))["id"].tolist() == [1, 2, 3]
+
+
+def test_record_batch_rejects_ragged_columns():
+    with pytest.raises(ValueError):
+        RecordBatch({"a": [1, 2], "b": [1]})
+
+
+def test_chunks_flow_through_vectorized_steps():
+    sums: List[float] = []
+
+    class Source(Step[None, npt.NDArray[np.float64]]):
+        @classmethod
+        def start(cls, data: None) -> Generator[npt.NDArray[np.float64], None, None]:
+            yield from iter_chunks(np.arange(1000, dtype=np.float64), 256)
+
+    class Scale(Step[npt.NDArray[np.floating], npt.NDArray[np.float64]]):
+        @classmethod
+        def start(cls, data: npt.NDArray[np.floating]) -> npt.NDArray[np.float64]:
+            return data * 2.0
+
+    class Sink(Step[np.ndarray, None]):
+        @classmethod
+        def start(cls, data: np.ndarray) -> None:
+            sums.append(float(data.sum()))
+
+    class Provider(ITaskProvider):
+        def get_tasks(self):
+            return [
+                TaskBuilder.build_from(
+                    [Source, Scale, Sink],
+                    strict_building_types=True,
+                    strict_runtime_types=True,
+                )
+            ]
+
+    Runtime(
+        tasks_provider=Provider(),
+        config=RuntimeConfig(TASK_LIMIT=100, WORKERS=2, TASKS_PER_ITER=5),
+    ).run()
+
+    # границы кусков сохраняются: одна задача на кусок
+    assert len(sums) == 4
+    assert sum(sums) == 2.0 * sum(range(1000))
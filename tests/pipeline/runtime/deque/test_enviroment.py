@@ -1,3 +1,5 @@
+from threading import Event, Thread
+
 import pytest
 
 from fiber.pipeline.runtime.deque.enviroment import DequeEnviroment
@@ -19,3 +21,85 @@ def test_generation_lim_with_five_empty_deque(enviroment: DequeEnviroment):
         deque.put(None)
 
     assert enviroment.get_generation_limit() == 3
+
+
+class FakeTask:
+    def __init__(self, steps_left: int):
+        self._steps_left = steps_left
+
+    def steps_left(self) -> int:
+        return self._steps_left
+
+
+def test_reserve_slots_keeps_headroom_for_chain():
+    enviroment = DequeEnviroment(deque_limit=5, max_tasks_per_iter=5, strict_limit=True)
+    enviroment.seed(FakeTask(steps_left=3))
+
+    # одно место остаётся про запас, чтобы порождённые задачи дошли до конца цепочки
+    assert enviroment.reserve_slots(5, steps_left=3) == 3
+    assert enviroment.reserve_slots(1, steps_left=3) == 0
+    assert enviroment.reserve_slots(1, steps_left=2) == 1
+
+    enviroment.release_slots(2)
+    assert enviroment.reserve_slots(5, steps_left=2) == 2
+
+
+def test_parked_task_resumes_when_slots_free():
+    enviroment = DequeEnviroment(deque_limit=3, max_tasks_per_iter=5, strict_limit=True)
+    task = FakeTask(steps_left=2)
+    enviroment.seed(task)
+    enviroment.reserve_slots(2, steps_left=2)
+
+    enviroment.park(task)
+    assert enviroment.resume_parked() is None
+
+    enviroment.release_slots(1)
+    assert enviroment.resume_parked() is task
+    assert enviroment.resume_parked() is None
+
+
+def test_seed_rejects_chain_longer_than_strict_limit():
+    enviroment = DequeEnviroment(deque_limit=2, max_tasks_per_iter=5, strict_limit=True)
+
+    with pytest.raises(ValueError):
+        enviroment.seed(FakeTask(steps_left=3))
+
+
+def test_seed_waits_until_slots_free():
+    enviroment = DequeEnviroment(deque_limit=2, max_tasks_per_iter=5, strict_limit=True)
+    enviroment.seed(FakeTask(steps_left=1))
+    enviroment.seed(FakeTask(steps_left=1))
+    seeded = Event()
+
+    def seed() -> None:
+        enviroment.seed_when_room(FakeTask(steps_left=1))
+        seeded.set()
+
+    thread = Thread(target=seed)
+    thread.start()
+    assert not seeded.wait(0.05)
+
+    # место освобождает воркер - ожидание просыпается без опроса
+    enviroment.release_slots(1)
+    assert seeded.wait(5)
+    thread.join()
+    assert len(enviroment.get_deque()) == 3
+
+
+def test_seed_wait_is_interrupted_by_stop():
+    enviroment = DequeEnviroment(deque_limit=1, max_tasks_per_iter=5)
+    enviroment.seed(FakeTask(steps_left=1))
+    stop = Event()
+    result = []
+
+    thread = Thread(
+        target=lambda: result.append(
+            enviroment.seed_when_room(FakeTask(steps_left=1), stop)
+        )
+    )
+    thread.start()
+    stop.set()
+    enviroment.notify_room()
+    thread.join(5)
+
+    assert result == [False]
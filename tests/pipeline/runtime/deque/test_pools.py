@@ -0,0 +1,34 @@
+from typing import Optional
+
+from fiber.pipeline.runtime.deque.pools import PooledDequeEnviroment
+
+
+class FakeStep:
+    def __init__(self, pool: Optional[str]):
+        self.pool = pool
+
+
+class FakeTask:
+    def __init__(self, pool: Optional[str]):
+        self._step = FakeStep(pool)
+
+    def get_step(self) -> FakeStep:
+        return self._step
+
+
+def test_tasks_routed_to_pool_queues():
+    enviroment = PooledDequeEnviroment(
+        deque_limit=10, max_tasks_per_iter=5, pools=["io"]
+    )
+    io_task, cpu_task, unknown_task = FakeTask("io"), FakeTask(None), FakeTask("gpu")
+
+    deque = enviroment.get_deque()
+    for task in (io_task, cpu_task, unknown_task):
+        deque.put(task)
+
+    assert len(deque) == 3
+    assert enviroment.get_worker_deque("io").getleft() is io_task
+    # пул не из списка - общий пул
+    default = enviroment.get_worker_deque()
+    assert default.getleft() is cpu_task
+    assert default.getleft() is unknown_task
@@ -0,0 +1,114 @@
+from threading import Thread
+from typing import Generator, List
+
+import pytest
+
+from fiber.step import Step
+from fiber.pipeline.task import Task, TaskBuilder
+from fiber.pipeline.runtime import Runtime, RuntimeConfig, ITaskProvider
+from fiber.pipeline.runtime.deque.stealing import StealingDequeEnviroment
+
+
+@pytest.fixture
+def enviroment() -> StealingDequeEnviroment:
+    return StealingDequeEnviroment(deque_limit=10, max_tasks_per_iter=5)
+
+
+def test_local_put_and_get(enviroment: StealingDequeEnviroment):
+    local = enviroment.get_worker_deque()
+    local.put(1)
+    local.put(2)
+
+    assert local.getleft() == 1
+    assert len(enviroment.get_deque()) == 1
+
+
+def test_steal_from_peer(enviroment: StealingDequeEnviroment):
+    owner = enviroment.get_worker_deque()
+    thief = enviroment.get_worker_deque()
+
+    owner.put(1)
+    owner.put(2)
+
+    # вор забирает самую свежую задачу с противоположного конца
+    assert thief.getleft() == 2
+    assert owner.getleft() == 1
+
+
+def test_injected_items_are_shared(enviroment: StealingDequeEnviroment):
+    local = enviroment.get_worker_deque()
+    enviroment.get_deque().put(1)
+
+    assert local.getleft() == 1
+
+
+def test_generation_limit_counts_all_deques(enviroment: StealingDequeEnviroment):
+    first = enviroment.get_worker_deque()
+    second = enviroment.get_worker_deque()
+
+    for _ in range(3):
+        first.put(None)
+    for _ in range(2):
+        second.put(None)
+
+    assert enviroment.get_generation_limit() == 3
+
+
+def test_join_waits_for_stolen_tasks(enviroment: StealingDequeEnviroment):
+    owner = enviroment.get_worker_deque()
+    thief = enviroment.get_worker_deque()
+    enviroment.get_deque().put("seed")
+
+    seed = owner.getleft()
+    owner.put("child")
+    owner.task_done()
+
+    def steal_and_finish():
+        thief.getleft()
+        thief.task_done()
+
+    thread = Thread(target=steal_and_finish)
+    thread.start()
+
+    enviroment.get_deque().join()
+    thread.join()
+    assert seed == "seed"
+
+
+def test_runtime_with_work_stealing():
+    results = []
+
+    class Source(Step[None, int]):
+        @classmethod
+        def start(cls, data: None) -> Generator[int, None, None]:
+            yield from range(100)
+
+    class Fanout(Step[int, int]):
+        @classmethod
+        def start(cls, data: int) -> Generator[int, None, None]:
+            yield data
+            yield -data
+
+    class Sink(Step[int, None]):
+        @classmethod
+        def start(cls, data: int) -> None:
+            results.append(data)
+
+    class Provider(ITaskProvider):
+        def get_tasks(self) -> List[Task]:
+            return [
+                TaskBuilder.build_from(
+                    [Source, Fanout, Sink],
+                    strict_building_types=True,
+                    strict_runtime_types=False,
+                )
+            ]
+
+    Runtime(
+        tasks_provider=Provider(),
+        config=RuntimeConfig(
+            WORKERS=4, TASKS_PER_ITER=5, TASK_LIMIT=50, WORK_STEALING=True
+        ),
+    ).run()
+
+    assert sorted(results) == sorted(list(range(100)) + [-i for i in range(100)])
@@ -0,0 +1,274 @@
+import threading
+import time
+from typing import Dict, Generator, Hashable, List, Sequence, Tuple, Type
+
+import pytest
+
+from fiber.step import (
+    AggregateStep,
+    CountWindow,
+    SlidingWindow,
+    Step,
+    TumblingWindow,
+    Window,
+)
+from fiber.pipeline.task import Task, TaskBuilder
+from fiber.pipeline.runtime import AsyncRuntime, Runtime, RuntimeConfig, ITaskProvider
+
+
+class Provider(ITaskProvider):
+    def __init__(self, steps: Sequence[Type[Step]]):
+        self._steps = steps
+
+    def get_tasks(self) -> List[Task]:
+        return [
+            TaskBuilder.build_from(
+                self._steps,
+                strict_building_types=True,
+                strict_runtime_types=True,
+            )
+        ]
+
+
+def run_pipeline(steps: Sequence[Type[Step]], **config) -> Runtime:
+    runtime = Runtime(
+        tasks_provider=Provider(steps),
+        config=RuntimeConfig(
+            **{"TASK_LIMIT": 100, "WORKERS": 2, "TASKS_PER_ITER": 8, **config}
+        ),
+    )
+    runtime.run()
+    return runtime
+
+
+def make_word_count(window: Window):
+    lock = threading.Lock()
+    results: List[Tuple[str, int]] = []
+
+    class Words(Step[None, str]):
+        @classmethod
+        def start(cls, data: None) -> Generator[str, None, None]:
+            for i in range(600):
+                yield "abc"[i % 3]
+
+    class CountWords(AggregateStep[str, Tuple[str, int]]):
+        @classmethod
+        def key(cls, data: str) -> Hashable:
+            return data
+
+        @classmethod
+        def create(cls) -> int:
+            return 0
+
+        @classmethod
+        def add(cls, state: int, data: str) -> int:
+            return state + 1
+
+        @classmethod
+        def merge(cls, left: int, right: int) -> int:
+            return left + right
+
+        @classmethod
+        def finish(cls, key: Hashable, state: int) -> Tuple[str, int]:
+            return str(key), state
+
+    CountWords.window = window
+
+    class Collect(Step[Tuple[str, int], None]):
+        @classmethod
+        def start(cls, data: Tuple[str, int]) -> None:
+            with lock:
+                results.append(data)
+
+    return [Words, CountWords, Collect], results
+
+
+def totals(results: List[Tuple[str, int]]) -> Dict[str, int]:
+    counts: Dict[str, int] = {}
+    for key, count in results:
+        counts[key] = counts.get(key, 0) + count
+    return counts
+
+
+@pytest.mark.parametrize("strict", [False, True])
+def test_tumbling_windows_count_every_value_once(strict):
+    steps, results = make_word_count(TumblingWindow(0.01))
+
+    run_pipeline(steps, STRICT_TASK_LIMIT=strict)
+
+    assert totals(results) == {"a": 200, "b": 200, "c": 200}
+
+
+def test_sliding_windows_count_every_value_in_each_window():
+    steps, results = make_word_count(SlidingWindow(size=0.03, every=0.01))
+
+    run_pipeline(steps)
+
+    # значение входит в size / every окон
+    assert totals(results) == {"a": 600, "b": 600, "c": 600}
+
+
+def test_count_windows_close_when_full():
+    steps, results = make_word_count(CountWindow(50))
+
+    runtime = run_pipeline(steps, WORKERS=1, STRICT_TASK_LIMIT=True)
+
+    assert sorted(results) == sorted([(key, 50) for key in "abc"] * 4)
+    # задачи агрегата не занимают мест в очереди
+    assert runtime._deque_environ._occupied == 0
+
+
+def test_count_windows_are_shared_by_workers():
+    lock = threading.Lock()
+    sizes: List[int] = []
+
+    class Numbers(Step[None, int]):
+        @classmethod
+        def start(cls, data: None) -> Generator[int, None, None]:
+            yield from range(43)
+
+    class Pass(Step[int, int]):
+        # значения доходят до агрегата с разных воркеров
+        @classmethod
+        def start(cls, data: int) -> int:
+            time.sleep(0.001)
+            return data
+
+    class Size(AggregateStep[int, int]):
+        window = CountWindow(7)
+
+        @classmethod
+        def key(cls, data: int) -> Hashable:
+            return None
+
+        @classmethod
+        def create(cls) -> int:
+            return 0
+
+        @classmethod
+        def add(cls, state: int, data: int) -> int:
+            return state + 1
+
+        @classmethod
+        def merge(cls, left: int, right: int) -> int:
+            return left + right
+
+        @classmethod
+        def finish(cls, key: Hashable, state: int) -> int:
+            return state
+
+    class Collect(Step[int, None]):
+        @classmethod
+        def start(cls, data: int) -> None:
+            with lock:
+                sizes.append(data)
+
+    run_pipeline([Numbers, Pass, Size, Collect], WORKERS=4, TASKS_PER_ITER=2)
+
+    # окна набираются значениями всех воркеров, неполное - только последнее
+    assert sorted(sizes) == [1] + [7] * 6
+
+
+def test_long_window_is_closed_at_end_of_stream():
+    steps, results = make_word_count(TumblingWindow(60.0))
+
+    run_pipeline(steps)
+
+    assert sorted(results) == [("a", 200), ("b", 200), ("c", 200)]
+
+
+def test_aggregate_results_feed_branches_and_batches():
+    lock = threading.Lock()
+    batches: List[List[int]] = []
+    top: List[List[int]] = []
+
+    class Numbers(Step[None, int]):
+        @classmethod
+        def start(cls, data: None) -> Generator[int, None, None]:
+            yield from range(100)
+
+    class TopThree(AggregateStep[int, List[int]]):
+        window = TumblingWindow(60.0)
+
+        @classmethod
+        def create(cls) -> List[int]:
+            return []
+
+        @classmethod
+        def add(cls, state: List[int], data: int) -> List[int]:
+            return sorted(state + [data])[-3:]
+
+        @classmethod
+        def merge(cls, left: List[int], right: List[int]) -> List[int]:
+            return sorted(left + right)[-3:]
+
+    class Report(Step[List[int], None]):
+        @classmethod
+        def start(cls, data: List[int]) -> None:
+            with lock:
+                top.append(data)
+
+    class Store(Step[List[int], None]):
+        @classmethod
+        def start_batch(cls, items: List[List[int]]) -> None:
+            with lock:
+                batches.append([len(item) for item in items])
+
+    run_pipeline([Numbers, TopThree, [[Report], [Store]]])
+
+    assert top == [[97, 98, 99]]
+    assert batches == [[3]]
+
+
+def test_aggregate_errors_drop_values():
+    results: List[int] = []
+
+    class Numbers(Step[None, int]):
+        @classmethod
+        def start(cls, data: None) -> Generator[int, None, None]:
+            yield from range(10)
+
+    class Sum(AggregateStep[int, int]):
+        window = CountWindow(100)
+
+        @classmethod
+        def create(cls) -> int:
+            return 0
+
+        @classmethod
+        def add(cls, state: int, data: int) -> int:
+            if data == 3:
+                raise RuntimeError("Плохое значение.")
+            return state + data
+
+        @classmethod
+        def merge(cls, left: int, right: int) -> int:
+            return left + right
+
+    class Collect(Step[int, None]):
+        @classmethod
+        def start(cls, data: int) -> None:
+            results.append(data)
+
+    run_pipeline([Numbers, Sum, Collect], WORKERS=1)
+
+    assert results == [sum(range(10)) - 3]
+
+
+@pytest.mark.parametrize("backend", ["process", "async"])
+def test_aggregates_need_thread_backend(backend):
+    steps, _ = make_word_count(TumblingWindow(1.0))
+
+    with pytest.raises(ValueError):
+        if backend == "async":
+            AsyncRuntime(
+                tasks_provider=Provider(steps),
+                config=RuntimeConfig(TASK_LIMIT=100, WORKERS=1, TASKS_PER_ITER=8),
+            )
+        else:
+            Runtime(
+                tasks_provider=Provider(steps),
+                config=RuntimeConfig(
+                    TASK_LIMIT=100, WORKERS=1, TASKS_PER_ITER=8, BACKEND="process"
+                ),
+            )
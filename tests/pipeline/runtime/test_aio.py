@@ -0,0 +1,114 @@
+import asyncio
+import time
+from typing import AsyncGenerator, Generator, List
+
+import pytest
+
+from fiber.step import Step
+from fiber.pipeline.task import Task, TaskBuilder, TaskDone
+from fiber.pipeline.runtime import AsyncRuntime, RuntimeConfig, ITaskProvider
+
+
+class ListTaskProvider(ITaskProvider):
+    def __init__(self, tasks: List[Task]) -> None:
+        self._tasks = tasks
+
+    def get_tasks(self) -> List[Task]:
+        return self._tasks
+
+
+def test_async_runtime_with_mixed_steps():
+    results = []
+
+    class AsyncSource(Step[None, int]):
+        @classmethod
+        async def start(cls, data: None) -> AsyncGenerator[int, None]:
+            for i in range(10):
+                await asyncio.sleep(0)
+                yield i
+
+    class SyncDouble(Step[int, int]):
+        @classmethod
+        def start(cls, data: int) -> Generator[int, None, None]:
+            yield data * 2
+
+    class AsyncSink(Step[int, None]):
+        @classmethod
+        async def start(cls, data: int) -> None:
+            await asyncio.sleep(0)
+            results.append(data)
+
+    task = TaskBuilder.build_from(
+        [AsyncSource, SyncDouble, AsyncSink],
+        strict_building_types=True,
+        strict_runtime_types=True,
+    )
+
+    asyncio.run(
+        AsyncRuntime(
+            tasks_provider=ListTaskProvider([task]),
+            config=RuntimeConfig(WORKERS=2, TASKS_PER_ITER=5, TASK_LIMIT=100),
+        ).run()
+    )
+
+    assert sorted(results) == [i * 2 for i in range(10)]
+
+
+def test_async_runtime_concurrency():
+    items = 200
+    done = []
+
+    class Source(Step[None, int]):
+        @classmethod
+        def start(cls, data: None) -> Generator[int, None, None]:
+            yield from range(items)
+
+    class SlowIOSink(Step[int, None]):
+        @classmethod
+        async def start(cls, data: int) -> None:
+            await asyncio.sleep(0.1)
+            done.append(data)
+
+    task = TaskBuilder.build_from(
+        [Source, SlowIOSink],
+        strict_building_types=True,
+        strict_runtime_types=False,
+    )
+
+    started = time.perf_counter()
+    asyncio.run(
+        AsyncRuntime(
+            tasks_provider=ListTaskProvider([task]),
+            config=RuntimeConfig(
+                WORKERS=1, TASKS_PER_ITER=items, TASK_LIMIT=items, CONCURRENCY=items
+            ),
+        ).run()
+    )
+
+    assert len(done) == items
+    # последовательно это заняло бы 20 секунд
+    assert time.perf_counter() - started < 5
+
+
+def test_sync_runtime_with_async_step():
+    class AsyncStart(Step[None, int]):
+        @classmethod
+        async def start(cls, data: None) -> int:
+            return 42
+
+    class AsyncFinish(Step[int, None]):
+        @classmethod
+        async def start(cls, data: int) -> AsyncGenerator[None, None]:
+            assert data == 42
+            yield None
+
+    task = TaskBuilder.build_from(
+        [AsyncStart, AsyncFinish],
+        strict_building_types=True,
+        strict_runtime_types=False,
+    )
+
+    next_task = task.step()
+
+    with pytest.raises(TaskDone):
+        next_task.step()
@@ -0,0 +1,138 @@
+import time
+from typing import Generator, List, Type
+
+import pytest
+
+from fiber.step import Step
+from fiber.pipeline.task import Task, TaskBuilder
+from fiber.pipeline.runtime import Runtime, RuntimeConfig, ITaskProvider
+from fiber.pipeline.runtime.autoscaling import Autoscaler, WorkerStats
+
+
+@pytest.fixture
+def autoscaler() -> Autoscaler:
+    return Autoscaler(
+        min_workers=1,
+        max_workers=4,
+        interval=0.1,
+        stats=WorkerStats(),
+        queued=lambda: 0,
+        spawn=lambda: None,
+        retire=lambda: None,
+    )
+
+
+def test_scale_up_when_steps_block(autoscaler: Autoscaler):
+    # 2 воркера заняты всю секунду, но на CPU провели лишь 0.1 с - ждут I/O
+    assert autoscaler.decide(workers=2, queued=10, busy=2.0, cpu=0.1, elapsed=1.0) == 1
+
+
+def test_no_scale_up_at_max(autoscaler: Autoscaler):
+    assert autoscaler.decide(workers=4, queued=10, busy=4.0, cpu=0.1, elapsed=1.0) == 0
+
+
+def test_scale_down_when_cpu_saturated(autoscaler: Autoscaler):
+    # потоки упёрлись в CPU (GIL): ожидание - это конкуренция, а не I/O
+    assert autoscaler.decide(workers=3, queued=10, busy=3.0, cpu=1.0, elapsed=1.0) == -1
+
+
+def test_scale_down_when_idle(autoscaler: Autoscaler):
+    assert autoscaler.decide(workers=3, queued=0, busy=0.1, cpu=0.0, elapsed=1.0) == -1
+
+
+def test_keep_min_workers(autoscaler: Autoscaler):
+    assert autoscaler.decide(workers=1, queued=0, busy=0.0, cpu=0.0, elapsed=1.0) == 0
+
+
+def test_config_validates_bounds():
+    with pytest.raises(ValueError):
+        RuntimeConfig(
+            TASK_LIMIT=10, WORKERS=5, TASKS_PER_ITER=1, MIN_WORKERS=1, MAX_WORKERS=4
+        )
+
+    with pytest.raises(ValueError):
+        RuntimeConfig(
+            TASK_LIMIT=10, WORKERS=1, TASKS_PER_ITER=1, MAX_WORKERS=4, BACKEND="process"
+        )
+
+
+def run_pipeline(
+    config: RuntimeConfig,
+    items: int,
+    delay: float,
+    source_delay: float = 0.0,
+    runtime_cls: Type[Runtime] = Runtime,
+):
+    results: List[int] = []
+
+    class Source(Step[None, int]):
+        @classmethod
+        def start(cls, data: None) -> Generator[int, None, None]:
+            for i in range(items):
+                time.sleep(source_delay)
+                yield i
+
+    class Sleepy(Step[int, int]):
+        @classmethod
+        def start(cls, data: int) -> int:
+            time.sleep(delay)
+            return data
+
+    class Sink(Step[int, None]):
+        @classmethod
+        def start(cls, data: int) -> None:
+            results.append(data)
+
+    class Provider(ITaskProvider):
+        def get_tasks(self) -> List[Task]:
+            return [
+                TaskBuilder.build_from(
+                    [Source, Sleepy, Sink],
+                    strict_building_types=True,
+                    strict_runtime_types=False,
+                )
+            ]
+
+    runtime = runtime_cls(tasks_provider=Provider(), config=config)
+    runtime.run()
+    return runtime, results
+
+
+def test_runtime_scales_up_on_blocking_steps():
+    config = RuntimeConfig(
+        TASK_LIMIT=100,
+        WORKERS=1,
+        TASKS_PER_ITER=10,
+        MIN_WORKERS=1,
+        MAX_WORKERS=6,
+        SCALE_INTERVAL=0.02,
+    )
+    runtime, results = run_pipeline(config, items=100, delay=0.01)
+
+    assert sorted(results) == list(range(100))
+    assert runtime.get_peak_workers() > 1
+
+
+def test_runtime_shuts_down_after_retiring_workers():
+    config = RuntimeConfig(
+        TASK_LIMIT=100,
+        WORKERS=4,
+        TASKS_PER_ITER=1,
+        MIN_WORKERS=1,
+        MAX_WORKERS=4,
+        SCALE_INTERVAL=0.01,
+    )
+    retired: List[int] = []
+
+    class CountingRuntime(Runtime):
+        def _retire_worker(self) -> None:
+            retired.append(1)
+            super()._retire_worker()
+
+    # медленный источник - воркеры простаивают и отправляются на покой посреди работы
+    runtime, results = run_pipeline(
+        config, items=30, delay=0.0, source_delay=0.01, runtime_cls=CountingRuntime
+    )
+
+    assert sorted(results) == list(range(30))
+    assert retired
@@ -0,0 +1,86 @@
+import threading
+from typing import Generator, List
+
+import pytest
+
+from fiber.step import Step
+from fiber.pipeline.task import Task, TaskBuilder
+from fiber.pipeline.runtime import Runtime, RuntimeConfig, ITaskProvider
+
+ITEMS = 500
+LIMIT = 8
+
+
+@pytest.mark.parametrize("work_stealing", [False, True])
+def test_strict_limit_bounds_queue(work_stealing: bool):
+    lock = threading.Lock()
+    in_system = [0]
+    max_in_system = [0]
+    results: List[int] = []
+
+    def enter():
+        with lock:
+            in_system[0] += 1
+            max_in_system[0] = max(max_in_system[0], in_system[0])
+
+    class FastSource(Step[None, int]):
+        @classmethod
+        def start(cls, data: None) -> Generator[int, None, None]:
+            for i in range(ITEMS):
+                enter()
+                yield i
+
+    class Middle(Step[int, int]):
+        @classmethod
+        def start(cls, data: int) -> int:
+            return data * 2
+
+    class Sink(Step[int, None]):
+        @classmethod
+        def start(cls, data: int) -> None:
+            with lock:
+                results.append(data)
+                in_system[0] -= 1
+
+    class Provider(ITaskProvider):
+        def get_tasks(self) -> List[Task]:
+            return [
+                TaskBuilder.build_from(
+                    [FastSource, Middle, Sink],
+                    strict_building_types=True,
+                    strict_runtime_types=False,
+                )
+            ]
+
+    runtime = Runtime(
+        tasks_provider=Provider(),
+        config=RuntimeConfig(
+            WORKERS=4,
+            TASKS_PER_ITER=5,
+            TASK_LIMIT=LIMIT,
+            STRICT_TASK_LIMIT=True,
+            WORK_STEALING=work_stealing,
+        ),
+    )
+    runtime.run()
+
+    assert sorted(results) == [i * 2 for i in range(ITEMS)]
+    # элемент (в очереди, в работе или припаркованный) занимает место до завершения Sink
+    assert max_in_system[0] <= LIMIT
+    assert runtime.get_full_wait_time() >= 0.0
+
+
+def test_strict_limit_requires_two_slots():
+    with pytest.raises(ValueError):
+        RuntimeConfig(TASK_LIMIT=1, WORKERS=1, TASKS_PER_ITER=1, STRICT_TASK_LIMIT=True)
+
+
+def test_strict_limit_thread_backend_only():
+    with pytest.raises(ValueError):
+        RuntimeConfig(
+            TASK_LIMIT=10,
+            WORKERS=1,
+            TASKS_PER_ITER=1,
+            STRICT_TASK_LIMIT=True,
+            BACKEND="process",
+        )
@@ -0,0 +1,114 @@
+import threading
+import time
+from typing import Generator, List, Sequence, Type
+
+from fiber.step import Step
+from fiber.pipeline.task import Task, TaskBuilder, TaskDone
+from fiber.pipeline.runtime import Runtime, RuntimeConfig, ITaskProvider
+
+
+def run_pipeline(
+    steps: Sequence[Type[Step]], workers: int = 2, tasks_per_iter: int = 50
+) -> None:
+    class Provider(ITaskProvider):
+        def get_tasks(self) -> List[Task]:
+            return [
+                TaskBuilder.build_from(
+                    steps,
+                    strict_building_types=True,
+                    strict_runtime_types=True,
+                )
+            ]
+
+    Runtime(
+        tasks_provider=Provider(),
+        config=RuntimeConfig(
+            TASK_LIMIT=1000, WORKERS=workers, TASKS_PER_ITER=tasks_per_iter
+        ),
+    ).run()
+
+
+def test_payloads_accumulate_into_batches():
+    lock = threading.Lock()
+    enrich_batches: List[int] = []
+    stored: List[int] = []
+
+    class Source(Step[None, int]):
+        @classmethod
+        def start(cls, data: None) -> Generator[int, None, None]:
+            for i in range(250):
+                yield i
+
+    class Enrich(Step[int, int]):
+        max_batch_size = 100
+        max_batch_delay = 10.0
+
+        @classmethod
+        def start_batch(cls, items: List[int]) -> List[int]:
+            with lock:
+                enrich_batches.append(len(items))
+            return [item * 2 for item in items]
+
+    class Store(Step[int, None]):
+        max_batch_size = 50
+
+        @classmethod
+        def start_batch(cls, items: List[int]) -> None:
+            with lock:
+                stored.extend(items)
+
+    run_pipeline([Source, Enrich, Store])
+
+    assert sorted(stored) == [i * 2 for i in range(250)]
+    assert sum(enrich_batches) == 250
+    assert max(enrich_batches) <= 100
+    # неполные пачки уходят в очередь, когда больше нечего ждать
+    assert len(enrich_batches) < 10
+
+
+def test_batch_flushes_after_delay():
+    batches: List[List[int]] = []
+
+    class SlowSource(Step[None, int]):
+        @classmethod
+        def start(cls, data: None) -> Generator[int, None, None]:
+            yield 1
+            time.sleep(0.2)
+            yield 2
+
+    class Sink(Step[int, None]):
+        max_batch_delay = 0.01
+
+        @classmethod
+        def start_batch(cls, items: List[int]) -> None:
+            batches.append(list(items))
+
+    # по одному значению за ход: иначе оба значения уйдут из одного хода воркера
+    run_pipeline([SlowSource, Sink], workers=2, tasks_per_iter=1)
+
+    assert batches == [[1], [2]]
+
+
+def test_batch_step_runs_as_batch_of_one_without_runtime():
+    calls: List[List[int]] = []
+
+    class Source(Step[None, int]):
+        @classmethod
+        def start(cls, data: None) -> int:
+            return 7
+
+    class Sink(Step[int, None]):
+        @classmethod
+        def start_batch(cls, items: List[int]) -> None:
+            calls.append(items)
+
+    task = TaskBuilder.build_from(
+        [Source, Sink], strict_building_types=True, strict_runtime_types=False
+    )
+    child = task.step()
+    try:
+        child.step()
+    except TaskDone:
+        pass
+
+    assert calls == [[7]]
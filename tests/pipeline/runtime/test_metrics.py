@@ -0,0 +1,206 @@
+import asyncio
+import json
+import time
+from typing import Generator, List
+
+import pytest
+
+from fiber.step import Step
+from fiber.pipeline.task import Task, TaskBuilder
+from fiber.pipeline.runtime import AsyncRuntime, Runtime, RuntimeConfig, ITaskProvider
+from fiber.pipeline.runtime.metrics import LatencyHistogram
+
+
+class Source(Step[None, int]):
+    @classmethod
+    def start(cls, data: None) -> Generator[int, None, None]:
+        yield from range(20)
+
+
+class Slow(Step[int, int]):
+    @classmethod
+    def start(cls, data: int) -> int:
+        time.sleep(0.001)
+        return data
+
+
+class Failing(Step[int, None]):
+    @classmethod
+    def start(cls, data: int) -> None:
+        if data % 5 == 0:
+            raise RuntimeError("Сбой")
+
+
+class Provider(ITaskProvider):
+    def get_tasks(self) -> List[Task]:
+        return [
+            TaskBuilder.build_from(
+                [Source, Slow, Failing],
+                strict_building_types=True,
+                strict_runtime_types=True,
+            )
+        ]
+
+
+def test_histogram_quantiles():
+    histogram = LatencyHistogram()
+    for ms in range(1, 101):
+        histogram.record(ms * 1_000_000)
+
+    snapshot = histogram.snapshot()
+
+    assert snapshot.count == 100
+    assert snapshot.max == pytest.approx(0.1)
+    # погрешность корзин - не больше 12.5%
+    assert snapshot.p50 == pytest.approx(0.05, rel=0.125)
+    assert snapshot.p99 == pytest.approx(0.099, rel=0.125)
+
+
+def test_runtime_collects_step_metrics():
+    runtime = Runtime(
+        tasks_provider=Provider(),
+        config=RuntimeConfig(TASK_LIMIT=10, WORKERS=2, TASKS_PER_ITER=4, METRICS=True),
+    )
+    runtime.run()
+
+    snapshot = runtime.get_metrics()
+    source = snapshot.steps[Source.__qualname__]
+    slow = snapshot.steps[Slow.__qualname__]
+    failing = snapshot.steps[Failing.__qualname__]
+
+    assert source.calls == 1 and source.items == 20
+    assert slow.calls == 20 and slow.items == 20
+    assert slow.step_time.p50 >= 0.001
+    assert slow.queue_wait.count == 20
+    assert failing.calls == 20 and failing.errors == 4
+    assert snapshot.busy_workers == 0
+    assert snapshot.queue_size == 0
+
+
+class AddOne(Step[int, int]):
+    @classmethod
+    def start(cls, data: int) -> int:
+        return data + 1
+
+
+class Double(Step[int, int]):
+    @classmethod
+    def start(cls, data: int) -> int:
+        return data * 2
+
+
+class Sink(Step[int, None]):
+    @classmethod
+    def start(cls, data: int) -> None:
+        if data == 2:
+            raise RuntimeError("Сбой")
+
+
+class ListProvider(ITaskProvider):
+    def __init__(self, task: Task):
+        self._task = task
+
+    def get_tasks(self) -> List[Task]:
+        return [self._task]
+
+
+def run_with_metrics(task: Task):
+    runtime = Runtime(
+        tasks_provider=ListProvider(task),
+        config=RuntimeConfig(TASK_LIMIT=10, WORKERS=2, TASKS_PER_ITER=4, METRICS=True),
+    )
+    runtime.run()
+    return runtime.get_metrics()
+
+
+def test_fused_steps_have_own_metrics():
+    snapshot = run_with_metrics(
+        TaskBuilder.build_from(
+            [Source, AddOne, Double, Sink],
+            strict_building_types=True,
+            strict_runtime_types=True,
+            fuse=True,
+        )
+    )
+
+    add_one = snapshot.steps[AddOne.__qualname__]
+    double = snapshot.steps[Double.__qualname__]
+    sink = snapshot.steps[Sink.__qualname__]
+
+    assert snapshot.steps[Source.__qualname__].items == 20
+    assert add_one.calls == 20 and add_one.items == 20
+    assert double.calls == 20 and double.items == 20
+    assert double.step_time.count == 20
+    # значение 0 -> 1 -> 2 ломает последний слитый шаг
+    assert sink.calls == 20 and sink.items == 19 and sink.errors == 1
+    assert add_one.errors == 0
+
+
+def test_branch_values_are_counted_once():
+    snapshot = run_with_metrics(
+        TaskBuilder.build_from(
+            [Source, [[AddOne, Failing], [Double, Failing]]],
+            strict_building_types=True,
+            strict_runtime_types=True,
+        )
+    )
+
+    assert snapshot.steps[Source.__qualname__].items == 20
+    assert snapshot.steps[Source.__qualname__].step_time.count == 20
+    assert snapshot.steps[AddOne.__qualname__].calls == 20
+    assert snapshot.steps[Double.__qualname__].calls == 20
+
+
+def test_metrics_are_optional():
+    runtime = Runtime(
+        tasks_provider=Provider(),
+        config=RuntimeConfig(TASK_LIMIT=10, WORKERS=2, TASKS_PER_ITER=4),
+    )
+    runtime.run()
+
+    snapshot = runtime.get_metrics()
+
+    assert snapshot.steps == {}
+    assert snapshot.generation_limit > 0
+
+
+def test_async_runtime_collects_step_metrics():
+    runtime = AsyncRuntime(
+        tasks_provider=Provider(),
+        config=RuntimeConfig(
+            TASK_LIMIT=10, WORKERS=2, TASKS_PER_ITER=4, CONCURRENCY=4, METRICS=True
+        ),
+    )
+    asyncio.run(runtime.run())
+
+    slow = runtime.get_metrics().steps[Slow.__qualname__]
+
+    assert slow.calls == 20 and slow.items == 20
+
+
+def test_snapshot_export():
+    runtime = Runtime(
+        tasks_provider=Provider(),
+        config=RuntimeConfig(TASK_LIMIT=10, WORKERS=1, TASKS_PER_ITER=4, METRICS=True),
+    )
+    runtime.run()
+    snapshot = runtime.get_metrics()
+
+    data = json.loads(snapshot.to_json())
+    assert data["steps"][Slow.__qualname__]["items"] == 20
+
+    text = snapshot.to_prometheus()
+    assert "# TYPE fiber_step_calls_total counter" in text
+    assert f'fiber_step_items_total{{step="{Slow.__qualname__}"}} 20' in text
+    assert (
+        f'fiber_step_duration_seconds{{step="{Slow.__qualname__}",quantile="0.99"}}'
+        in text
+    )
+    assert "fiber_queue_size 0" in text
+
+
+def test_metrics_require_thread_backend():
+    with pytest.raises(ValueError):
+        RuntimeConfig(
+            TASK_LIMIT=10, WORKERS=1, TASKS_PER_ITER=1, BACKEND="process", METRICS=True
+        )
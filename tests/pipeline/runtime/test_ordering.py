@@ -0,0 +1,104 @@
+import random
+import time
+from typing import Generator, List
+
+import pytest
+
+from fiber.step import Step
+from fiber.pipeline.task import Task, TaskBuilder
+from fiber.pipeline.runtime import Runtime, RuntimeConfig, ITaskProvider
+
+SOURCES = 3
+VALUES = 100
+
+
+class ListProvider(ITaskProvider):
+    def __init__(self, steps) -> None:
+        self._steps = steps
+
+    def get_tasks(self):
+        # одна цепочка, запущенная несколько раз: порядок - и внутри запуска, и между запусками
+        plan = TaskBuilder.build_plan(
+            self._steps, strict_building_types=True, strict_runtime_types=False
+        )
+        return [Task(plan, None) for _ in range(SOURCES)]
+
+
+def make_steps(received: List[int]):
+    class Read(Step[None, int]):
+        @classmethod
+        def start(cls, data: None) -> Generator[int, None, None]:
+            yield from range(VALUES)
+
+    class Split(Step[int, int]):
+        @classmethod
+        def start(cls, data: int) -> Generator[int, None, None]:
+            # неравномерная работа: поздние значения обгоняют ранние
+            for part in range(data % 3):
+                time.sleep(random.random() / 2000)
+                yield data * 10 + part
+
+    class Store(Step[int, None]):
+        ordered = True
+
+        @classmethod
+        def start(cls, data: int) -> None:
+            received.append(data)
+
+    return [Read, Split, Store]
+
+
+EXPECTED = [
+    value * 10 + part for value in range(VALUES) for part in range(value % 3)
+] * SOURCES
+
+
+@pytest.mark.parametrize("strict", [False, True])
+@pytest.mark.parametrize("reorder_limit", [1024, 2])
+def test_ordered_step_receives_source_order(strict: bool, reorder_limit: int):
+    received: List[int] = []
+    Runtime(
+        tasks_provider=ListProvider(make_steps(received)),
+        config=RuntimeConfig(
+            TASK_LIMIT=20,
+            WORKERS=4,
+            TASKS_PER_ITER=4,
+            STRICT_TASK_LIMIT=strict,
+            REORDER_LIMIT=reorder_limit,
+        ),
+    ).run()
+
+    assert received == EXPECTED
+
+
+def test_ordering_rejects_batches_on_the_way():
+    class Read(Step[None, int]):
+        @classmethod
+        def start(cls, data: None) -> int:
+            return 1
+
+    class Batch(Step[int, int]):
+        @classmethod
+        def start(cls, data: int) -> int:
+            return data
+
+        @classmethod
+        def start_batch(cls, items: List[int]) -> List[int]:
+            return items
+
+    class Store(Step[int, None]):
+        ordered = True
+
+        @classmethod
+        def start(cls, data: int) -> None: ...
+
+    with pytest.raises(ValueError):
+        Runtime(
+            tasks_provider=ListProvider([Read, Batch, Store]),
+            config=RuntimeConfig(TASK_LIMIT=20, WORKERS=2, TASKS_PER_ITER=4),
+        )
+
+
+def test_reorder_limit_is_validated():
+    with pytest.raises(ValueError):
+        RuntimeConfig(TASK_LIMIT=20, WORKERS=2, TASKS_PER_ITER=4, REORDER_LIMIT=0)
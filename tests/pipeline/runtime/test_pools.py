@@ -0,0 +1,92 @@
+import threading
+import time
+from typing import Generator, List, Set
+
+import pytest
+
+from fiber.step import Step
+from fiber.pipeline.task import Task, TaskBuilder
+from fiber.pipeline.runtime import Runtime, RuntimeConfig, ITaskProvider
+
+
+def test_steps_run_in_their_pools():
+    fetch_threads: Set[int] = set()
+    parse_threads: Set[int] = set()
+    results: List[int] = []
+    lock = threading.Lock()
+
+    class Source(Step[None, int]):
+        @classmethod
+        def start(cls, data: None) -> Generator[int, None, None]:
+            for i in range(20):
+                yield i
+
+    class Fetch(Step[int, int]):
+        pool = "io"
+
+        @classmethod
+        def start(cls, data: int) -> int:
+            fetch_threads.add(threading.get_ident())
+            time.sleep(0.01)
+            return data
+
+    class Parse(Step[int, int]):
+        @classmethod
+        def start(cls, data: int) -> int:
+            parse_threads.add(threading.get_ident())
+            return data * 2
+
+    class Sink(Step[int, None]):
+        @classmethod
+        def start(cls, data: int) -> None:
+            with lock:
+                results.append(data)
+
+    class Provider(ITaskProvider):
+        def get_tasks(self) -> List[Task]:
+            return [
+                TaskBuilder.build_from(
+                    [Source, Fetch, Parse, Sink],
+                    strict_building_types=True,
+                    strict_runtime_types=False,
+                )
+            ]
+
+    runtime = Runtime(
+        tasks_provider=Provider(),
+        config=RuntimeConfig(
+            TASK_LIMIT=100, WORKERS=1, TASKS_PER_ITER=5, POOLS={"io": 4}
+        ),
+    )
+    runtime.run()
+
+    assert sorted(results) == [i * 2 for i in range(20)]
+    # I/O-шаг исполняют только воркеры пула "io", остальные шаги - общий пул
+    assert len(parse_threads) == 1
+    assert not fetch_threads & parse_threads
+
+
+def test_pools_validation():
+    with pytest.raises(ValueError):
+        RuntimeConfig(TASK_LIMIT=10, WORKERS=1, TASKS_PER_ITER=1, POOLS={"io": 0})
+
+    with pytest.raises(ValueError):
+        RuntimeConfig(
+            TASK_LIMIT=10,
+            WORKERS=1,
+            TASKS_PER_ITER=1,
+            POOLS={"io": 2},
+            WORK_STEALING=True,
+        )
+
+
+def test_pools_reject_strict_task_limit():
+    # припаркованные задачи одного пула возобновлял бы воркер другого - очередь зависала
+    with pytest.raises(ValueError):
+        RuntimeConfig(
+            TASK_LIMIT=20,
+            WORKERS=1,
+            TASKS_PER_ITER=4,
+            POOLS={"io": 1},
+            STRICT_TASK_LIMIT=True,
+        )
@@ -0,0 +1,253 @@
+import multiprocessing
+import os
+from typing import Generator, Iterator, List
+
+import pytest
+
+from fiber.step import Step
+from fiber.pipeline.task import Task, TaskBuilder, TaskDescriptor, TaskDescriptorError
+from fiber.pipeline.task.descriptor import get_step_path
+from fiber.pipeline.runtime import Runtime, RuntimeConfig, ITaskProvider
+from fiber.pipeline.runtime.deque.process import ProcessDequeEnviroment
+from fiber.pipeline.runtime.worker.process import ProcessTaskWorker
+
+OUTPUT_ENV = "FIBER_TEST_PROCESS_OUTPUT"
+
+
+class NumbersStep(Step[None, int]):
+    @classmethod
+    def start(cls, data: None) -> Generator[int, None, None]:
+        for i in range(20):
+            yield i
+
+
+class SquareStep(Step[int, int]):
+    @classmethod
+    def start(cls, data: int) -> int:
+        return data * data
+
+
+class FileSinkStep(Step[int, None]):
+    @classmethod
+    def start(cls, data: int) -> None:
+        with open(os.environ[OUTPUT_ENV], "a") as file:
+            file.write(f"{os.getpid()} {data}\n")
+
+
+class FailingSquareStep(Step[int, int]):
+    @classmethod
+    def start(cls, data: int) -> int:
+        if data % 5 == 0:
+            raise RuntimeError(f"Не удалось обработать {data}.")
+        return data * data
+
+
+class TaskProviderTestingImpl(ITaskProvider):
+    def get_tasks(self) -> List[Task]:
+        task = TaskBuilder.build_from(
+            [NumbersStep, SquareStep, FileSinkStep],
+            strict_building_types=True,
+            strict_runtime_types=True,
+        )
+        return [task]
+
+
+def test_process_backend(tmp_path, monkeypatch):
+    output = tmp_path / "output.txt"
+    monkeypatch.setenv(OUTPUT_ENV, str(output))
+
+    Runtime(
+        tasks_provider=TaskProviderTestingImpl(),
+        config=RuntimeConfig(
+            WORKERS=3, TASKS_PER_ITER=2, TASK_LIMIT=10, BACKEND="process"
+        ),
+    ).run()
+
+    lines = output.read_text().splitlines()
+    results = sorted(int(line.split()[1]) for line in lines)
+    pids = {line.split()[0] for line in lines}
+
+    assert results == [i * i for i in range(20)]
+    assert str(os.getpid()) not in pids
+
+
+def test_process_backend_spawn(tmp_path, monkeypatch):
+    output = tmp_path / "output.txt"
+    monkeypatch.setenv(OUTPUT_ENV, str(output))
+    spawn = multiprocessing.get_context("spawn")
+    monkeypatch.setattr(multiprocessing, "get_context", lambda *args: spawn)
+
+    Runtime(
+        tasks_provider=TaskProviderTestingImpl(),
+        config=RuntimeConfig(
+            WORKERS=2, TASKS_PER_ITER=2, TASK_LIMIT=10, BACKEND="process"
+        ),
+    ).run()
+
+    lines = output.read_text().splitlines()
+    results = sorted(int(line.split()[1]) for line in lines)
+
+    assert results == [i * i for i in range(20)]
+
+
+class FailingTaskProvider(ITaskProvider):
+    def get_tasks(self) -> List[Task]:
+        task = TaskBuilder.build_from(
+            [NumbersStep, FailingSquareStep, FileSinkStep],
+            strict_building_types=True,
+            strict_runtime_types=True,
+        )
+        return [task]
+
+
+def test_process_backend_drops_failed_tasks(tmp_path, monkeypatch):
+    output = tmp_path / "output.txt"
+    monkeypatch.setenv(OUTPUT_ENV, str(output))
+
+    Runtime(
+        tasks_provider=FailingTaskProvider(),
+        config=RuntimeConfig(
+            WORKERS=2, TASKS_PER_ITER=2, TASK_LIMIT=10, BACKEND="process"
+        ),
+    ).run()
+
+    results = sorted(int(line.split()[1]) for line in output.read_text().splitlines())
+    assert results == [i * i for i in range(20) if i % 5 != 0]
+
+
+def test_process_worker_drops_descriptor_with_wrong_type():
+    environ = ProcessDequeEnviroment(
+        deque_limit=10, max_tasks_per_iter=2, ctx=multiprocessing.get_context()
+    )
+    deque = environ.get_deque()
+    steps = tuple(get_step_path(step) for step in (SquareStep, FileSinkStep))
+    deque.put(TaskDescriptor(steps=steps, payload="1", strict_types=True))
+    deque.put(None)
+
+    ProcessTaskWorker(environ).run()
+    deque.task_done()  # None воркер не отмечает
+    deque.join()
+
+    assert len(deque) == 0
+
+
+def test_descriptor_roundtrip():
+    task = TaskBuilder.build_from(
+        [NumbersStep, SquareStep, FileSinkStep],
+        strict_building_types=True,
+        strict_runtime_types=False,
+    )
+
+    descriptor = task.to_descriptor()
+    assert descriptor.steps[0].endswith(":NumbersStep")
+
+    restored = descriptor.to_task()
+    next_task = restored.step()
+    assert next_task.to_descriptor().payload == 0
+
+
+def test_descriptor_plan_compiled_once():
+    task = TaskBuilder.build_from(
+        [NumbersStep, SquareStep, FileSinkStep],
+        strict_building_types=True,
+        strict_runtime_types=False,
+    )
+    children = [task.step().to_descriptor() for _ in range(2)]
+
+    first, second = (child.to_task() for child in children)
+
+    assert first is not second
+    assert first.get_plan() is second.get_plan()
+    assert first.to_descriptor().payload == 0
+    assert second.to_descriptor().payload == 1
+
+
+def test_started_task_has_no_descriptor():
+    task = TaskBuilder.build_from(
+        [NumbersStep, SquareStep, FileSinkStep],
+        strict_building_types=True,
+        strict_runtime_types=False,
+    )
+    task.step()
+
+    with pytest.raises(TaskDescriptorError):
+        task.to_descriptor()
+
+
+def test_local_step_has_no_descriptor():
+    class LocalStep(Step[None, None]):
+        @classmethod
+        def start(cls, data: None) -> None: ...
+
+    task = TaskBuilder.build_from(
+        [LocalStep],
+        strict_building_types=True,
+        strict_runtime_types=False,
+    )
+
+    with pytest.raises(TaskDescriptorError):
+        task.to_descriptor()
+
+
+def test_unknown_backend():
+    with pytest.raises(ValueError):
+        RuntimeConfig(WORKERS=1, TASKS_PER_ITER=1, TASK_LIMIT=1, BACKEND="fiber")  # type: ignore
+
+
+class BranchedTaskProvider(ITaskProvider):
+    def get_tasks(self) -> List[Task]:
+        task = TaskBuilder.build_from(
+            [NumbersStep, [[SquareStep, FileSinkStep], [FileSinkStep]]],
+            strict_building_types=True,
+            strict_runtime_types=True,
+        )
+        return [task]
+
+
+def test_branched_descriptor_roundtrip():
+    (task,) = BranchedTaskProvider().get_tasks()
+    square, sink = task.step(), task.step()
+
+    descriptor = square.to_descriptor()
+    assert descriptor.edges == ((1,), (), ())
+    restored = descriptor.to_task()
+    assert repr(restored.get_plan()) == "ExecutionPlan(SquareStep -> FileSinkStep)"
+
+    restored = sink.to_descriptor().to_task()
+    assert restored.get_step() is FileSinkStep
+    assert restored.get_plan().get_steps() == (FileSinkStep,)
+
+
+def test_process_backend_with_branches(tmp_path, monkeypatch):
+    output = tmp_path / "output.txt"
+    monkeypatch.setenv(OUTPUT_ENV, str(output))
+
+    Runtime(
+        tasks_provider=BranchedTaskProvider(),
+        config=RuntimeConfig(
+            WORKERS=2, TASKS_PER_ITER=2, TASK_LIMIT=10, BACKEND="process"
+        ),
+    ).run()
+
+    results = sorted(int(line.split()[1]) for line in output.read_text().splitlines())
+    assert results == sorted([i * i for i in range(20)] + list(range(20)))
+
+
+def test_process_backend_with_lazy_seeds(tmp_path, monkeypatch):
+    output = tmp_path / "output.txt"
+    monkeypatch.setenv(OUTPUT_ENV, str(output))
+
+    class LazyTaskProvider(ITaskProvider):
+        def get_tasks(self) -> Iterator[Task]:
+            for _ in range(3):
+                yield from TaskProviderTestingImpl().get_tasks()
+
+    Runtime(
+        tasks_provider=LazyTaskProvider(),
+        config=RuntimeConfig(
+            WORKERS=2, TASKS_PER_ITER=2, TASK_LIMIT=10, BACKEND="process"
+        ),
+    ).run()
+
+    results = sorted(int(line.split()[1]) for line in output.read_text().splitlines())
+    assert results == sorted([i * i for i in range(20)] * 3)
@@ -0,0 +1,202 @@
+import json
+import time
+from typing import Generator, List
+
+import pytest
+
+from fiber.step import Step
+from fiber.pipeline.task import Task, TaskBuilder
+from fiber.pipeline.runtime import Runtime, RuntimeConfig, ITaskProvider
+from fiber.pipeline.runtime.profiling import RUNTIME_FRAME
+
+
+def burn(seconds: float) -> None:
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        pass
+
+
+class Source(Step[None, int]):
+    @classmethod
+    def start(cls, data: None) -> Generator[int, None, None]:
+        yield from range(20)
+
+
+class Busy(Step[int, int]):
+    @classmethod
+    def start(cls, data: int) -> int:
+        burn(0.01)
+        return data
+
+
+class Sleepy(Step[int, None]):
+    @classmethod
+    def start(cls, data: int) -> None:
+        time.sleep(0.005)
+
+
+class Provider(ITaskProvider):
+    def get_tasks(self) -> List[Task]:
+        return [
+            TaskBuilder.build_from(
+                [Source, Busy, Sleepy],
+                strict_building_types=True,
+                strict_runtime_types=True,
+            )
+        ]
+
+
+def run(path) -> Runtime:
+    runtime = Runtime(
+        tasks_provider=Provider(),
+        config=RuntimeConfig(
+            TASK_LIMIT=10,
+            WORKERS=2,
+            TASKS_PER_ITER=4,
+            PROFILE_PATH=str(path),
+            PROFILE_INTERVAL=0.001,
+        ),
+    )
+    runtime.run()
+    return runtime
+
+
+def test_samples_are_attributed_to_steps(tmp_path):
+    profile = run(tmp_path / "profile").get_profile()
+
+    assert profile is not None
+    busy = profile.steps[Busy.__qualname__]
+    sleepy = profile.steps[Sleepy.__qualname__]
+    assert busy.samples > 0 and sleepy.samples > 0
+    # Busy тратит CPU, Sleepy - ждёт
+    assert busy.cpu_time > sleepy.cpu_time
+    assert Busy.__qualname__ in profile.to_text()
+
+
+def test_collapsed_stacks_point_to_hot_lines(tmp_path):
+    run(tmp_path / "profile")
+
+    lines = (tmp_path / "profile.collapsed").read_text(encoding="utf-8").splitlines()
+    stacks = [line.rsplit(" ", 1)[0].split(";") for line in lines]
+    roots = {stack[0] for stack in stacks}
+    assert Busy.__qualname__ in roots
+
+    busy = [stack for stack in stacks if stack[0] == Busy.__qualname__]
+    # под шагом - его start() и функция, в которой тратится время (со строкой)
+    assert any(stack[1].startswith("Busy.start (test_profiling.py:") for stack in busy)
+    assert any(
+        frame.startswith("burn (test_profiling.py:")
+        for stack in busy
+        for frame in stack
+    )
+    assert all(int(line.rsplit(" ", 1)[1]) > 0 for line in lines)
+    assert roots <= {
+        Source.__qualname__,
+        Busy.__qualname__,
+        Sleepy.__qualname__,
+        RUNTIME_FRAME,
+    }
+
+
+def test_speedscope_document(tmp_path):
+    run(tmp_path / "profile")
+
+    document = json.loads(
+        (tmp_path / "profile.speedscope.json").read_text(encoding="utf-8")
+    )
+    frames = document["shared"]["frames"]
+    assert document["profiles"]
+    for profile in document["profiles"]:
+        assert profile["type"] == "sampled"
+        assert len(profile["samples"]) == len(profile["weights"])
+        assert all(
+            0 <= index < len(frames)
+            for sample in profile["samples"]
+            for index in sample
+        )
+
+
+class Burner(Step[int, int]):
+    @classmethod
+    def start(cls, data: int) -> int:
+        burn(0.01)
+        return data
+
+
+class BurnFirst(Burner):
+    pass
+
+
+class BurnSecond(Burner):
+    pass
+
+
+class InheritedProvider(ITaskProvider):
+    def get_tasks(self) -> List[Task]:
+        return [
+            TaskBuilder.build_from(
+                [Source, BurnFirst, BurnSecond, Sleepy],
+                strict_building_types=True,
+                strict_runtime_types=True,
+            )
+        ]
+
+
+def test_inherited_start_is_attributed_to_running_step(tmp_path):
+    runtime = Runtime(
+        tasks_provider=InheritedProvider(),
+        config=RuntimeConfig(
+            TASK_LIMIT=10,
+            WORKERS=2,
+            TASKS_PER_ITER=4,
+            PROFILE_PATH=str(tmp_path / "profile"),
+            PROFILE_INTERVAL=0.001,
+        ),
+    )
+    runtime.run()
+    profile = runtime.get_profile()
+
+    assert profile is not None
+    # код start() общий, шаг берётся из задачи воркера
+    assert profile.steps[BurnFirst.__qualname__].samples > 0
+    assert profile.steps[BurnSecond.__qualname__].samples > 0
+    assert Burner.__qualname__ not in profile.steps
+
+
+def test_samples_with_same_stack_are_merged(tmp_path):
+    profile = run(tmp_path / "profile").get_profile()
+
+    assert profile is not None
+    lines = (tmp_path / "profile.collapsed").read_text(encoding="utf-8").splitlines()
+    counts = [int(line.rsplit(" ", 1)[1]) for line in lines]
+    document = json.loads(
+        (tmp_path / "profile.speedscope.json").read_text(encoding="utf-8")
+    )
+    stored = sum(len(item["samples"]) for item in document["profiles"])
+
+    assert sum(counts) == profile.samples
+    # хранятся разные стеки, а не каждый образец
+    assert stored < profile.samples
+
+
+def test_profiling_is_optional():
+    runtime = Runtime(
+        tasks_provider=Provider(),
+        config=RuntimeConfig(TASK_LIMIT=10, WORKERS=1, TASKS_PER_ITER=4),
+    )
+    runtime.run()
+
+    assert runtime.get_profile() is None
+
+
+def test_profile_config_validation(tmp_path):
+    with pytest.raises(ValueError):
+        RuntimeConfig(TASK_LIMIT=10, WORKERS=1, TASKS_PER_ITER=1, PROFILE_INTERVAL=0)
+    with pytest.raises(ValueError):
+        RuntimeConfig(
+            TASK_LIMIT=10,
+            WORKERS=1,
+            TASKS_PER_ITER=1,
+            BACKEND="process",
+            PROFILE_PATH=str(tmp_path / "profile"),
+        )
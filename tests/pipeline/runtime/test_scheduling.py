@@ -0,0 +1,127 @@
+from typing import Generator, List, Tuple
+
+import pytest
+
+from fiber.step import Step
+from fiber.pipeline.task import Task, TaskBuilder
+from fiber.pipeline.runtime import (
+    Runtime,
+    RuntimeConfig,
+    ITaskProvider,
+    SchedulingPolicy,
+    FifoPolicy,
+    LifoPolicy,
+    DepthPriorityPolicy,
+)
+from fiber.pipeline.runtime.deque.enviroment import DequeEnviroment
+
+
+def run_tracing_pipeline(policy: SchedulingPolicy) -> Tuple[List[str], int]:
+    """
+    Returns:
+        События источника и последнего шага в порядке исполнения и максимальный размер очереди.
+    """
+    events: List[str] = []
+    max_queued = [0]
+    environ: List[DequeEnviroment] = []
+
+    class Source(Step[None, int]):
+        @classmethod
+        def start(cls, data: None) -> Generator[int, None, None]:
+            for i in range(5):
+                events.append(f"src{i}")
+                yield i
+
+    class Middle(Step[int, int]):
+        @classmethod
+        def start(cls, data: int) -> int:
+            return data
+
+    class Sink(Step[int, None]):
+        @classmethod
+        def start(cls, data: int) -> None:
+            events.append(f"sink{data}")
+            max_queued[0] = max(max_queued[0], len(environ[0].get_deque()))
+
+    class Provider(ITaskProvider):
+        def get_tasks(self) -> List[Task]:
+            return [
+                TaskBuilder.build_from(
+                    [Source, Middle, Sink],
+                    strict_building_types=True,
+                    strict_runtime_types=False,
+                )
+            ]
+
+    runtime = Runtime(
+        tasks_provider=Provider(),
+        config=RuntimeConfig(
+            WORKERS=1, TASKS_PER_ITER=1, TASK_LIMIT=100, SCHEDULING=policy
+        ),
+    )
+    environ.append(runtime._deque_environ)
+    runtime.run()
+
+    return events, max_queued[0]
+
+
+def test_fifo_is_breadth_first():
+    events, _ = run_tracing_pipeline(FifoPolicy())
+
+    assert events.index("src1") < events.index("sink0")
+    assert sorted(events) == sorted(
+        [f"src{i}" for i in range(5)] + [f"sink{i}" for i in range(5)]
+    )
+
+
+def test_lifo_is_depth_first():
+    events, max_queued = run_tracing_pipeline(LifoPolicy())
+
+    expected = []
+    for i in range(5):
+        expected += [f"src{i}", f"sink{i}"]
+
+    assert events == expected
+    # в очереди не больше одной задачи на каждый шаг цепочки перед последним
+    assert max_queued <= 2
+
+
+def test_depth_priority_prefers_tasks_closer_to_the_end():
+    class Start(Step[None, int]):
+        @classmethod
+        def start(cls, data: None) -> int:
+            return 1
+
+    class Middle(Step[int, int]):
+        @classmethod
+        def start(cls, data: int) -> int:
+            return data
+
+    class Finish(Step[int, None]):
+        @classmethod
+        def start(cls, data: int) -> None: ...
+
+    long_task = TaskBuilder.build_from(
+        [Start, Middle, Finish],
+        strict_building_types=True,
+        strict_runtime_types=False,
+    )
+    short_task = long_task.step().step()
+
+    policy = DepthPriorityPolicy()
+    deque = policy.create_deque()
+    policy.schedule(deque, None, [long_task, short_task])
+
+    assert policy.take(deque) is short_task
+    assert policy.take(deque) is long_task
+
+
+def test_work_stealing_with_depth_priority():
+    with pytest.raises(ValueError):
+        RuntimeConfig(
+            WORKERS=1,
+            TASKS_PER_ITER=1,
+            TASK_LIMIT=1,
+            WORK_STEALING=True,
+            SCHEDULING=DepthPriorityPolicy(),
+        )
@@ -0,0 +1,149 @@
+import asyncio
+import threading
+from typing import AsyncIterator, Iterator, List
+
+import pytest
+
+from fiber.step import Step
+from fiber.pipeline.task import Task, TaskBuilder
+from fiber.pipeline.runtime import AsyncRuntime, Runtime, RuntimeConfig, ITaskProvider
+
+SEEDS = 500
+LIMIT = 20
+
+
+class Counter:
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.yielded = 0
+        self.finished = 0
+        self.peak_outstanding = 0
+        self.yielded_at_first_result = None
+
+    def on_yield(self) -> None:
+        with self.lock:
+            self.yielded += 1
+            self.peak_outstanding = max(
+                self.peak_outstanding, self.yielded - self.finished
+            )
+
+    def on_finish(self) -> None:
+        with self.lock:
+            if self.yielded_at_first_result is None:
+                self.yielded_at_first_result = self.yielded
+            self.finished += 1
+
+
+def make_plan(counter: Counter):
+    class Source(Step[None, int]):
+        @classmethod
+        def start(cls, data: None) -> int:
+            return 1
+
+    class Sink(Step[int, None]):
+        @classmethod
+        def start(cls, data: int) -> None:
+            counter.on_finish()
+
+    return TaskBuilder.build_from(
+        [Source, Sink], strict_building_types=True, strict_runtime_types=True
+    ).get_plan()
+
+
+class LazyProvider(ITaskProvider):
+    def __init__(self, counter: Counter, fail_at: int = -1) -> None:
+        self._counter = counter
+        self._plan = make_plan(counter)
+        self._fail_at = fail_at
+
+    def get_tasks(self) -> Iterator[Task]:
+        for i in range(SEEDS):
+            if i == self._fail_at:
+                raise RuntimeError("Поставщик упал.")
+            self._counter.on_yield()
+            yield Task(self._plan, None)
+
+
+class AsyncLazyProvider(LazyProvider):
+    async def get_tasks(self) -> AsyncIterator[Task]:  # type: ignore[override]
+        for task in super().get_tasks():
+            await asyncio.sleep(0)
+            yield task
+
+
+def config(**kwargs) -> RuntimeConfig:
+    return RuntimeConfig(
+        **{"TASK_LIMIT": LIMIT, "WORKERS": 2, "TASKS_PER_ITER": 8, **kwargs}
+    )
+
+
+@pytest.mark.parametrize("strict", [False, True])
+@pytest.mark.parametrize("provider_cls", [LazyProvider, AsyncLazyProvider])
+def test_lazy_seeds_follow_queue_limit(provider_cls, strict):
+    counter = Counter()
+
+    Runtime(
+        tasks_provider=provider_cls(counter), config=config(STRICT_TASK_LIMIT=strict)
+    ).run()
+
+    assert counter.finished == SEEDS
+    # воркеры начинают работу до того, как поставщик выдаст все задачи
+    assert counter.yielded_at_first_result < SEEDS
+    # стартовые задачи не копятся сверх предела очереди (+ задачи в руках воркеров и подающего потока)
+    assert counter.peak_outstanding <= 2 * LIMIT
+
+
+def test_lazy_seeds_in_async_runtime():
+    counter = Counter()
+
+    asyncio.run(
+        AsyncRuntime(tasks_provider=AsyncLazyProvider(counter), config=config()).run()
+    )
+
+    assert counter.finished == SEEDS
+    assert counter.peak_outstanding <= 2 * LIMIT
+
+
+def test_provider_error_is_raised_after_run():
+    counter = Counter()
+
+    with pytest.raises(RuntimeError):
+        Runtime(
+            tasks_provider=LazyProvider(counter, fail_at=100), config=config()
+        ).run()
+
+    # задачи, выданные до ошибки, исполнены
+    assert counter.finished == 100
+
+
+def test_provider_error_is_raised_after_async_run():
+    counter = Counter()
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(
+            AsyncRuntime(
+                tasks_provider=LazyProvider(counter, fail_at=100), config=config()
+            ).run()
+        )
+
+    assert counter.finished == 100
+
+
+class SetProvider(ITaskProvider):
+    def __init__(self, counter: Counter) -> None:
+        self._plan = make_plan(counter)
+
+    def get_tasks(self) -> List[Task]:
+        return {Task(self._plan, None) for _ in range(SEEDS)}  # type: ignore[return-value]
+
+
+def test_finite_collection_is_seeded_up_front():
+    counter = Counter()
+
+    runtime = Runtime(tasks_provider=SetProvider(counter), config=config())
+    # set - не поток задач: всё в очереди до запуска, стадии для неизвестных цепочек не нужны
+    assert runtime._seeder is None
+    assert runtime._batcher is None and runtime._aggregator is None
+    runtime.run()
+
+    assert counter.finished == SEEDS
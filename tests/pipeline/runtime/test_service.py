@@ -0,0 +1,105 @@
+import threading
+from concurrent.futures import wait
+from typing import Generator, List
+
+import pytest
+
+from fiber.step import Step
+from fiber.pipeline.task import TaskRuntimeError
+from fiber.pipeline.runtime import PersistentRuntime, RuntimeConfig
+
+SUBMISSIONS = 100
+
+
+def make_config(**kwargs) -> RuntimeConfig:
+    return RuntimeConfig(TASK_LIMIT=50, WORKERS=2, TASKS_PER_ITER=4, **kwargs)
+
+
+def make_steps(stored: List[int]):
+    lock = threading.Lock()
+
+    class Split(Step[int, int]):
+        @classmethod
+        def start(cls, data: int) -> Generator[int, None, None]:
+            for part in range(3):
+                yield data * 10 + part
+
+    class Store(Step[int, None]):
+        @classmethod
+        def start(cls, data: int) -> None:
+            with lock:
+                stored.append(data)
+
+    return [Split, Store]
+
+
+@pytest.mark.parametrize("strict", [False, True])
+def test_submissions_complete_on_warm_workers(strict: bool):
+    stored: List[int] = []
+    steps = make_steps(stored)
+
+    with PersistentRuntime(make_config(STRICT_TASK_LIMIT=strict)) as runtime:
+        threads = set(threading.enumerate())
+        futures = [runtime.submit(steps, value) for value in range(SUBMISSIONS)]
+        done, not_done = wait(futures, timeout=10)
+
+        assert not not_done
+        assert all(future.result() is None for future in done)
+        # воркеры не пересоздаются на каждую отправку
+        assert set(threading.enumerate()) == threads
+
+    assert sorted(stored) == sorted(
+        value * 10 + part for value in range(SUBMISSIONS) for part in range(3)
+    )
+
+
+def test_submission_completes_without_waiting_for_others():
+    release = threading.Event()
+
+    class Slow(Step[None, None]):
+        @classmethod
+        def start(cls, data: None) -> None:
+            release.wait(10)
+
+    stored: List[int] = []
+    with PersistentRuntime(make_config()) as runtime:
+        slow = runtime.submit([Slow])
+        fast = runtime.submit(make_steps(stored), 1)
+
+        fast.result(timeout=10)
+        assert sorted(stored) == [10, 11, 12]
+        assert not slow.done()
+
+        release.set()
+        slow.result(timeout=10)
+
+
+def test_failed_step_fails_submission():
+    class Broken(Step[int, None]):
+        @classmethod
+        def start(cls, data: int) -> None:
+            raise RuntimeError("boom")
+
+    with PersistentRuntime(make_config()) as runtime:
+        future = runtime.submit([Broken], 1)
+
+        with pytest.raises(TaskRuntimeError):
+            future.result(timeout=10)
+
+
+def test_submit_requires_started_runtime():
+    with pytest.raises(ValueError):
+        PersistentRuntime(make_config()).submit(make_steps([]), 1)
+
+
+def test_submit_rejects_batch_steps():
+    class Batch(Step[int, None]):
+        @classmethod
+        def start(cls, data: int) -> None: ...
+
+        @classmethod
+        def start_batch(cls, items: List[int]) -> None: ...
+
+    with PersistentRuntime(make_config()) as runtime:
+        with pytest.raises(ValueError):
+            runtime.submit([Batch], 1)
@@ -0,0 +1,138 @@
+import threading
+import time
+from typing import Generator, List
+
+import pytest
+
+from fiber.api.pipeliner import Pipeliner
+from fiber.step import Step
+from fiber.pipeline.builder.exceptions import PipelineBuildError
+from fiber.pipeline.runtime import RuntimeConfig
+
+VALUES = 200
+
+
+def make_steps(produced: List[int]):
+    lock = threading.Lock()
+
+    class Read(Step[None, int]):
+        @classmethod
+        def start(cls, data: None) -> Generator[int, None, None]:
+            yield from range(VALUES)
+
+    class Square(Step[int, int]):
+        @classmethod
+        def start(cls, data: int) -> int:
+            with lock:
+                produced.append(data)
+            return data * data
+
+    return Read, Square
+
+
+def make_pipeliner() -> Pipeliner:
+    return Pipeliner(RuntimeConfig(TASK_LIMIT=50, WORKERS=2, TASKS_PER_ITER=4))
+
+
+def test_run_iter_yields_final_outputs():
+    produced: List[int] = []
+    pipeliner = make_pipeliner().add_pipeline(make_steps(produced), stream=True)
+
+    assert sorted(pipeliner.run_iter()) == [i * i for i in range(VALUES)]
+
+
+def test_run_iter_applies_backpressure():
+    produced: List[int] = []
+    pipeliner = make_pipeliner().add_pipeline(make_steps(produced), stream=True)
+
+    results = pipeliner.run_iter(maxsize=4)
+    try:
+        next(results)
+        time.sleep(0.2)
+        # без чтения конвеер не уходит вперёд дальше буфера и очереди
+        assert len(produced) < 50
+        assert len(list(results)) == VALUES - 1
+    finally:
+        results.close()
+
+
+def test_run_iter_keeps_source_order():
+    produced: List[int] = []
+    pipeliner = Pipeliner(
+        RuntimeConfig(TASK_LIMIT=50, WORKERS=4, TASKS_PER_ITER=4, REORDER_LIMIT=8)
+    ).add_pipeline(make_steps(produced), stream=True, ordered=True)
+
+    assert list(pipeliner.run_iter(maxsize=4)) == [i * i for i in range(VALUES)]
+
+
+def test_ordered_requires_stream():
+    with pytest.raises(ValueError):
+        make_pipeliner().add_pipeline(make_steps([]), ordered=True)
+
+
+def test_run_iter_stops_early():
+    produced: List[int] = []
+    pipeliner = make_pipeliner().add_pipeline(make_steps(produced), stream=True)
+
+    for index, _ in enumerate(pipeliner.run_iter(maxsize=2)):
+        if index == 10:
+            break
+
+    # остальные значения отброшены, конвеер доработал до конца
+    assert len(produced) == VALUES
+
+
+def test_run_discards_streamed_outputs():
+    produced: List[int] = []
+    pipeliner = make_pipeliner().add_pipeline(make_steps(produced), stream=True)
+
+    pipeliner.run()
+
+    assert len(produced) == VALUES
+
+
+def test_stream_skips_branches_returning_none():
+    counted: List[int] = []
+
+    class Read(Step[None, int]):
+        @classmethod
+        def start(cls, data: None) -> Generator[int, None, None]:
+            yield from range(10)
+
+    class Count(Step[int, None]):
+        @classmethod
+        def start(cls, data: int) -> None:
+            counted.append(data)
+
+    class Format(Step[int, str]):
+        @classmethod
+        def start(cls, data: int) -> str:
+            return f"#{data}"
+
+    pipeliner = make_pipeliner().add_pipeline([Read, [[Count], [Format]]], stream=True)
+
+    assert sorted(pipeliner.run_iter()) == sorted(f"#{i}" for i in range(10))
+    assert sorted(counted) == list(range(10))
+
+
+def test_unstreamed_pipeline_still_must_return_none():
+    with pytest.raises(PipelineBuildError):
+        make_pipeliner().add_pipeline(make_steps([]))
+
+
+def test_run_iter_rejects_process_backend():
+    pipeliner = Pipeliner(
+        RuntimeConfig(TASK_LIMIT=10, WORKERS=1, TASKS_PER_ITER=1, BACKEND="process")
+    )
+
+    # ошибка - при вызове, а не на первом next()
+    with pytest.raises(ValueError):
+        pipeliner.run_iter()
+
+
+def test_run_iter_validates_maxsize_on_call():
+    pipeliner = make_pipeliner()
+    pipeliner.add_pipeline(make_steps([]), stream=True)
+
+    with pytest.raises(ValueError):
+        pipeliner.run_iter(maxsize=0)
@@ -0,0 +1,132 @@
+import asyncio
+import json
+from typing import Any, Dict, Generator, List
+
+import pytest
+
+from fiber.step import Step
+from fiber.pipeline.task import Task, TaskBuilder
+from fiber.pipeline.runtime import AsyncRuntime, Runtime, RuntimeConfig, ITaskProvider
+
+
+class Source(Step[None, int]):
+    @classmethod
+    def start(cls, data: None) -> Generator[int, None, None]:
+        yield from range(10)
+
+
+class Double(Step[int, int]):
+    @classmethod
+    def start(cls, data: int) -> int:
+        return data * 2
+
+
+class Failing(Step[int, None]):
+    @classmethod
+    def start(cls, data: int) -> None:
+        if data == 8:
+            raise RuntimeError("Сбой")
+
+
+class Provider(ITaskProvider):
+    def get_tasks(self) -> List[Task]:
+        return [
+            TaskBuilder.build_from(
+                [Source, Double, Failing],
+                strict_building_types=True,
+                strict_runtime_types=True,
+            )
+        ]
+
+
+def read_spans(path) -> List[Dict[str, Any]]:
+    spans = []
+    with open(path, encoding="utf-8") as file:
+        for line in file:
+            request = json.loads(line)
+            for resource in request["resourceSpans"]:
+                for scope in resource["scopeSpans"]:
+                    spans.extend(scope["spans"])
+    return spans
+
+
+def run(path, **config) -> List[Dict[str, Any]]:
+    Runtime(
+        tasks_provider=Provider(),
+        config=RuntimeConfig(
+            TASK_LIMIT=10, WORKERS=2, TASKS_PER_ITER=4, TRACE_FILE=str(path), **config
+        ),
+    ).run()
+    return read_spans(path)
+
+
+def test_spans_link_each_item_to_source(tmp_path):
+    spans = run(tmp_path / "trace.jsonl")
+    by_id = {span["spanId"]: span for span in spans}
+
+    sinks = [span for span in spans if span["name"] == Failing.__qualname__]
+    assert len(sinks) == 10
+    # у каждого значения своя трасса: sink -> double -> source
+    assert len({span["traceId"] for span in sinks}) == 10
+    for sink in sinks:
+        double = by_id[sink["parentSpanId"]]
+        source = by_id[double["parentSpanId"]]
+        assert double["name"] == Double.__qualname__
+        assert source["name"] == Source.__qualname__
+        assert "parentSpanId" not in source
+        assert sink["traceId"] == double["traceId"] == source["traceId"]
+
+
+def test_failed_step_span_has_error_status(tmp_path):
+    spans = run(tmp_path / "trace.jsonl")
+
+    failed = [span for span in spans if span["status"]]
+    assert len(failed) == 1
+    assert failed[0]["name"] == Failing.__qualname__
+    assert failed[0]["status"]["code"] == 2
+
+
+def test_otlp_span_shape(tmp_path):
+    span = run(tmp_path / "trace.jsonl")[0]
+
+    assert len(span["traceId"]) == 32 and len(span["spanId"]) == 16
+    assert int(span["endTimeUnixNano"]) >= int(span["startTimeUnixNano"])
+    assert {attr["key"] for attr in span["attributes"]} == {
+        "fiber.step",
+        "fiber.step.index",
+    }
+
+
+def test_zero_sample_ratio_writes_nothing(tmp_path):
+    assert run(tmp_path / "trace.jsonl", TRACE_SAMPLE_RATIO=0.0) == []
+
+
+def test_async_runtime_traces(tmp_path):
+    path = tmp_path / "trace.jsonl"
+    runtime = AsyncRuntime(
+        tasks_provider=Provider(),
+        config=RuntimeConfig(
+            TASK_LIMIT=10,
+            WORKERS=2,
+            TASKS_PER_ITER=4,
+            CONCURRENCY=4,
+            TRACE_FILE=str(path),
+        ),
+    )
+    asyncio.run(runtime.run())
+
+    sinks = [span for span in read_spans(path) if span["name"] == Failing.__qualname__]
+    assert len(sinks) == 10
+
+
+def test_trace_config_validation(tmp_path):
+    with pytest.raises(ValueError):
+        RuntimeConfig(TASK_LIMIT=10, WORKERS=1, TASKS_PER_ITER=1, TRACE_SAMPLE_RATIO=2)
+    with pytest.raises(ValueError):
+        RuntimeConfig(
+            TASK_LIMIT=10,
+            WORKERS=1,
+            TASKS_PER_ITER=1,
+            BACKEND="process",
+            TRACE_FILE=str(tmp_path / "trace.jsonl"),
+        )
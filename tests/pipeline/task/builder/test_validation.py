@@ -1,10 +1,12 @@
 import pytest
 from typing import Generic, List, Sequence, Tuple, Type, TypeVar
 
-from fiber.step import Step
+from fiber.step import AggregateStep, Step
 from fiber.pipeline.task.builder.validation import (
     StepSequenceValidator,
     EmptySequenceError,
+    InvalidAggregatePositionError,
+    InvalidBranchesError,
     IncompatibleStepTypesError,
     InvalidPipelineEndpointsError,
     NotAStepError,
@@ -42,6 +44,17 @@ def test_incorrect_start_type():
         StepSequenceValidator.validate([LIncStep, FinalStep])
 
 
+def test_with_input_allows_any_start_type():
+    StepSequenceValidator.validate([LIncStep, FinalStep], with_input=True)
+
+    with pytest.raises(InvalidPipelineEndpointsError):
+        StepSequenceValidator.validate([LIncStep, FinalStep])
+    with pytest.raises(InvalidPipelineEndpointsError):
+        StepSequenceValidator.validate([LIncStep, RIncStep], with_input=True)
+    with pytest.raises(IncompatibleStepTypesError):
+        StepSequenceValidator.validate([RIncStep, FinalStep], with_input=True)
+
+
 def test_incorrect_final_type():
     with pytest.raises(InvalidPipelineEndpointsError):
         StepSequenceValidator.validate([StartStep, RIncStep])
@@ -95,3 +108,54 @@ def test_sequence_with_incorrect_steps():
 
     with pytest.raises(NotAStepError):
         StepSequenceValidator.validate([StartStep, NotAStep, FinalStep])  # type: ignore
+
+
+def test_branches_validation():
+    StepSequenceValidator.validate([StartStep, [[FinalStep], [FinalStep]]])
+
+
+def test_every_branch_edge_is_checked():
+    with pytest.raises(IncompatibleStepTypesError):
+        StepSequenceValidator.validate(
+            [StartStep, [[FinalStep], [LIncStep, FinalStep]]]
+        )
+
+
+def test_every_branch_end_is_checked():
+    with pytest.raises(InvalidPipelineEndpointsError):
+        StepSequenceValidator.validate([StartStep, [[FinalStep], [RIncStep]]])
+
+
+@pytest.mark.parametrize(
+    "steps",
+    [
+        [StartStep, []],
+        [StartStep, [[]]],
+        [StartStep, [FinalStep]],
+        [StartStep, [[FinalStep]], FinalStep],
+    ],
+)
+def test_malformed_branches(steps):
+    with pytest.raises(InvalidBranchesError):
+        StepSequenceValidator.validate(steps)
+
+
+class StartAggregate(AggregateStep[None, int]):
+    @classmethod
+    def create(cls) -> int:
+        return 0
+
+    @classmethod
+    def add(cls, state: int, data: None) -> int:
+        return state + 1
+
+    @classmethod
+    def merge(cls, left: int, right: int) -> int:
+        return left + right
+
+
+def test_aggregate_cannot_be_first():
+    with pytest.raises(InvalidAggregatePositionError):
+        StepSequenceValidator.validate([StartAggregate, FinalStep])
+    with pytest.raises(InvalidAggregatePositionError):
+        StepSequenceValidator.validate([StartAggregate, FinalStep], with_input=True)
@@ -0,0 +1,122 @@
+import threading
+from typing import Generator, List
+
+import pytest
+
+from fiber.step import Step
+from fiber.pipeline.task import ExecutionPlan, Task, TaskBuilder, TaskDone
+from fiber.pipeline.task.freelist import TaskFreeList
+from fiber.pipeline.runtime import Runtime, RuntimeConfig, ITaskProvider
+
+
+class Source(Step[None, int]):
+    @classmethod
+    def start(cls, data: None) -> Generator[int, None, None]:
+        yield 1
+        yield 2
+
+
+class AddOne(Step[int, int]):
+    @classmethod
+    def start(cls, data: int) -> int:
+        return data + 1
+
+
+class Sink(Step[int, None]):
+    @classmethod
+    def start(cls, data: int) -> None:
+        return None
+
+
+def test_task_has_no_dict():
+    task = TaskBuilder.build_from(
+        [Source, AddOne, Sink],
+        strict_building_types=True,
+        strict_runtime_types=True,
+    )
+
+    assert not hasattr(task, "__dict__")
+
+
+def test_free_list_respects_capacity():
+    free_list = TaskFreeList(capacity=1)
+    plan = ExecutionPlan.from_steps([AddOne, Sink], strict_types=False)
+
+    free_list.release(Task(plan, 1))
+    free_list.release(Task(plan, 2))
+
+    assert len(free_list) == 1
+    assert free_list.acquire() is not None
+    assert free_list.acquire() is None
+
+
+def test_finished_task_is_reused():
+    plan = ExecutionPlan.from_steps([AddOne, AddOne, Sink], strict_types=True)
+    plan.enable_recycling(4)
+
+    first = Task(plan, 1)
+    child = first.step()
+    with pytest.raises(TaskDone):
+        first.step()
+    first.recycle()
+
+    grandchild = child.step()
+
+    assert grandchild is first
+    assert grandchild.get_index() == 2
+    assert not grandchild.is_done()
+
+
+def test_unfinished_task_is_not_recycled():
+    plan = ExecutionPlan.from_steps([AddOne, Sink], strict_types=False)
+    plan.enable_recycling(4)
+
+    Task(plan, 1).recycle()
+
+    assert len(plan.free_list) == 0  # type: ignore[arg-type]
+
+
+def test_runtime_with_free_list():
+    results: List[int] = []
+    lock = threading.Lock()
+
+    class Numbers(Step[None, int]):
+        @classmethod
+        def start(cls, data: None) -> Generator[int, None, None]:
+            yield from range(500)
+
+    class Collect(Step[int, None]):
+        @classmethod
+        def start(cls, data: int) -> None:
+            with lock:
+                results.append(data)
+
+    class Provider(ITaskProvider):
+        def get_tasks(self) -> List[Task]:
+            return [
+                TaskBuilder.build_from(
+                    [Numbers, AddOne, Collect],
+                    strict_building_types=True,
+                    strict_runtime_types=True,
+                )
+            ]
+
+    Runtime(
+        tasks_provider=Provider(),
+        config=RuntimeConfig(
+            TASK_LIMIT=50, WORKERS=4, TASKS_PER_ITER=8, TASK_FREE_LIST=64
+        ),
+    ).run()
+
+    assert sorted(results) == list(range(1, 501))
+
+
+def test_free_list_requires_thread_backend():
+    with pytest.raises(ValueError):
+        RuntimeConfig(
+            TASK_LIMIT=10,
+            WORKERS=1,
+            TASKS_PER_ITER=1,
+            BACKEND="process",
+            TASK_FREE_LIST=16,
+        )
@@ -0,0 +1,159 @@
+from typing import Generator
+
+import pytest
+
+from fiber.step import AggregateStep, Step
+from fiber.pipeline.task import ExecutionPlan, Task, TaskBuilder, TaskDone
+
+
+class Source(Step[None, int]):
+    @classmethod
+    def start(cls, data: None) -> Generator[int, None, None]:
+        yield 1
+        yield 2
+
+
+class AddOne(Step[int, int]):
+    @classmethod
+    def start(cls, data: int) -> int:
+        return data + 1
+
+
+class Sink(Step[int, None]):
+    @classmethod
+    def start(cls, data: int) -> None:
+        return None
+
+
+def test_plan_precomputes_slots():
+    plan = ExecutionPlan.from_steps([Source, AddOne, Sink], strict_types=True)
+
+    assert len(plan) == 3
+    assert [slot.step for slot in plan.slots] == [Source, AddOne, Sink]
+    assert [slot.next for slot in plan.slots] == [(1,), (2,), ()]
+    assert [slot.steps_left for slot in plan.slots] == [3, 2, 1]
+    assert plan[1].inp_t is int and plan[1].out_t is int
+    assert plan[1].logger is AddOne.logger
+    assert plan[1].check_input is not None and plan[1].check_input(1)
+
+
+def test_plan_without_strict_types_has_no_checkers():
+    plan = ExecutionPlan.from_steps([Source, AddOne, Sink], strict_types=False)
+
+    assert all(slot.check_input is None for slot in plan.slots)
+    assert all(slot.check_output is None for slot in plan.slots)
+
+
+def test_plan_rejects_empty_chain():
+    with pytest.raises(ValueError):
+        ExecutionPlan([], strict_types=False)
+
+
+def test_tasks_share_plan():
+    task = TaskBuilder.build_from(
+        [Source, AddOne, Sink],
+        strict_building_types=True,
+        strict_runtime_types=True,
+    )
+
+    child = task.step()
+    grandchild = child.step()
+
+    assert child.get_plan() is task.get_plan() is grandchild.get_plan()
+    assert (task.get_index(), child.get_index(), grandchild.get_index()) == (0, 1, 2)
+    assert grandchild.get_step() is Sink
+    assert isinstance(grandchild, Task)
+
+    with pytest.raises(TaskDone):
+        grandchild.step()
+
+
+def test_branched_plan():
+    plan = ExecutionPlan.from_steps(
+        [Source, AddOne, [[AddOne, Sink], [Sink]]], strict_types=True
+    )
+
+    assert [slot.step for slot in plan.slots] == [Source, AddOne, AddOne, Sink, Sink]
+    assert [slot.next for slot in plan.slots] == [(1,), (2, 4), (3,), (), ()]
+    assert [slot.steps_left for slot in plan.slots] == [4, 3, 2, 1, 1]
+    assert plan.is_branched()
+    assert repr(plan) == "ExecutionPlan(Source -> AddOne -> [AddOne -> Sink | Sink])"
+
+
+def test_value_spawns_task_per_branch():
+    task = TaskBuilder.build_from(
+        [Source, AddOne, [[AddOne, Sink], [Sink]]],
+        strict_building_types=True,
+        strict_runtime_types=True,
+    )
+    child = task.step()
+
+    # одно значение AddOne - по Task на каждую ветвь, затем шаг завершается
+    first, second = child.step(), child.step()
+    assert (first.get_index(), second.get_index()) == (2, 4)
+    assert first.get_step() is AddOne and second.get_step() is Sink
+    with pytest.raises(TaskDone):
+        child.step()
+
+    # генератор источника продвигается только после того, как значение роздано
+    assert task.step().get_index() == 1
+
+
+def test_plan_marks_steps_feeding_ordered_steps():
+    class OrderedSink(Step[int, None]):
+        ordered = True
+
+        @classmethod
+        def start(cls, data: int) -> None:
+            return None
+
+    plan = ExecutionPlan.from_steps(
+        [Source, AddOne, [[AddOne, OrderedSink], [Sink]]], strict_types=False
+    )
+
+    assert plan.has_ordered_steps()
+    assert [slot.is_ordered for slot in plan.slots] == [False] * 3 + [True, False]
+    assert [slot.feeds for slot in plan.slots] == [(3,), (3,), (3,), (), ()]
+
+
+def test_child_paths_follow_source_order():
+    task = TaskBuilder.build_from(
+        [Source, AddOne, [[AddOne, Sink], [Sink]]],
+        strict_building_types=True,
+        strict_runtime_types=False,
+    )
+    assert task.step().get_path() is None
+
+    task = TaskBuilder.build_from(
+        [Source, AddOne, [[AddOne, Sink], [Sink]]],
+        strict_building_types=True,
+        strict_runtime_types=False,
+    )
+    task.set_path((7,))
+    first = task.step()
+    branches = first.step(), first.step()
+
+    assert first.get_path() == (7, 0)
+    assert [branch.get_path() for branch in branches] == [(7, 0, 0), (7, 0, 1)]
+    assert task.get_next_path() == (7, 1)
+
+
+def test_plan_rejects_aggregate_first_without_validation():
+    class Total(AggregateStep[None, int]):
+        @classmethod
+        def create(cls) -> int:
+            return 0
+
+        @classmethod
+        def add(cls, state: int, data: None) -> int:
+            return state + 1
+
+        @classmethod
+        def merge(cls, left: int, right: int) -> int:
+            return left + right
+
+    # проверка цепочки выключена, но стартовую задачу агрегата всё равно не создать
+    with pytest.raises(ValueError):
+        TaskBuilder.build_from(
+            [Total, Sink], strict_building_types=False, strict_runtime_types=False
+        )
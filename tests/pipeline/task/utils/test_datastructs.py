@@ -1,4 +1,15 @@
-from fiber.pipeline.task.utils.datastructs import get_linked_list_from, Node
+import pytest
+
+from fiber.pipeline.task.utils.datastructs import (
+    Node,
+    count_nodes,
+    get_graph_from,
+    get_linked_list_from,
+    get_sequence_from,
+    iter_nodes,
+    iter_paths,
+    merge_prefixes,
+)
 
 
 def test_getting_linked_list():
@@ -11,7 +22,7 @@ def test_getting_linked_list():
         assert node is not None
 
         assert node.item is obj
-        node = node.next
+        node = node.next[0] if node.next else None
 
     assert node is None
 
@@ -21,4 +32,76 @@ def testing_node_state_state():
     node = Node(item)
 
     assert node.item is item
-    assert node.next is None
+    assert node.next == []
+
+
+def test_graph_with_branches():
+    a, b, c, d, e = (object() for _ in range(5))
+
+    head = get_graph_from([a, b, [[c, d], [e]]])
+
+    assert head.item is a
+    (tail,) = head.next
+    assert tail.item is b
+    assert [branch.item for branch in tail.next] == [c, e]
+    assert list(iter_paths(head)) == [[a, b, c, d], [a, b, e]]
+    assert [node.item for node in iter_nodes(head)] == [a, b, c, d, e]
+
+
+def test_graph_without_branches_is_linked_list():
+    objects = [object(), object()]
+
+    assert list(iter_paths(get_graph_from(objects))) == [objects]
+
+
+@pytest.mark.parametrize(
+    "sequence",
+    [
+        [],
+        [object(), []],
+        [object(), [[]]],
+        [[[object()]], object()],
+    ],
+)
+def test_graph_rejects_malformed_branches(sequence):
+    with pytest.raises(ValueError):
+        get_graph_from(sequence)
+
+
+@pytest.mark.parametrize(
+    "sequence",
+    [
+        ["a"],
+        ["a", "b", "c"],
+        ["a", [["b", "c"], ["d"]]],
+        ["a", [["b", [["c"], ["d"]]], ["e"]]],
+    ],
+)
+def test_sequence_from_graph_roundtrip(sequence):
+    assert get_sequence_from(get_graph_from(sequence)) == sequence
+
+
+def test_merging_shared_prefixes():
+    heads = [
+        get_graph_from(["read", "parse", "count"]),
+        get_graph_from(["read", "parse", "store"]),
+        get_graph_from(["read", "dump"]),
+        get_graph_from(["other", "count"]),
+    ]
+
+    roots = merge_prefixes(heads)
+
+    assert [get_sequence_from(root) for root in roots] == [
+        ["read", [["parse", [["count"], ["store"]]], ["dump"]]],
+        ["other", "count"],
+    ]
+    assert count_nodes(heads) == 10
+    assert count_nodes(roots) == 7
+    # исходные деревья не изменяются
+    assert list(iter_paths(heads[0])) == [["read", "parse", "count"]]
+
+
+def test_merging_identical_pipelines():
+    roots = merge_prefixes([get_graph_from(["a", "b"]), get_graph_from(["a", "b"])])
+
+    assert [get_sequence_from(root) for root in roots] == [["a", "b"]]
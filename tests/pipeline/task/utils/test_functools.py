@@ -1,7 +1,11 @@
+import asyncio
 from collections.abc import Generator as GenABC
 
 import pytest
-from fiber.pipeline.task.utils.functools import invoke_as_generator
+from fiber.pipeline.task.utils.functools import (
+    invoke_as_generator,
+    invoke_as_async_generator,
+)
 
 
 def test_invoke_as_generator_with_ret_func():
@@ -35,3 +39,44 @@ def test_invoke_as_generator_with_yield_func():
 
     with pytest.raises(StopIteration):
         next(output)
+
+
+def test_invoke_as_generator_with_async_funcs():
+    obj1 = object()
+    obj2 = object()
+
+    async def coro_func():
+        return obj1
+
+    async def async_gen_func():
+        yield obj1
+        yield obj2
+
+    assert list(invoke_as_generator(lambda: coro_func())) == [obj1]
+    assert list(invoke_as_generator(lambda: async_gen_func())) == [obj1, obj2]
+
+
+def test_invoke_as_async_generator_with_offload():
+    obj1 = object()
+    obj2 = object()
+    offloaded = []
+
+    def simple_func():
+        yield obj1
+        yield obj2
+
+    async def offload(callable):
+        offloaded.append(callable)
+        return callable()
+
+    async def collect():
+        return [
+            item
+            async for item in invoke_as_async_generator(
+                lambda: simple_func(), offload=offload
+            )
+        ]
+
+    assert asyncio.run(collect()) == [obj1, obj2]
+    # сам вызов + next() на каждый элемент и на исчерпание
+    assert len(offloaded) == 4
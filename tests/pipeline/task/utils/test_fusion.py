@@ -0,0 +1,245 @@
+from typing import Generator, List
+
+import pytest
+
+from fiber.step import Step
+from fiber.pipeline.task import Task, TaskBuilder, TaskDone, TaskRuntimeError
+from fiber.pipeline.task.utils.datastructs import get_graph_from, get_linked_list_from
+from fiber.pipeline.task.utils.fusion import fuse_steps
+
+
+class Source(Step[None, int]):
+    @classmethod
+    def start(cls, data: None) -> Generator[int, None, None]:
+        yield 1
+        yield 2
+
+
+class AddOne(Step[int, int]):
+    @classmethod
+    def start(cls, data: int) -> int:
+        return data + 1
+
+
+class Double(Step[int, int]):
+    @classmethod
+    def start(cls, data: int) -> int:
+        return data * 2
+
+
+class NotFused(Step[int, int]):
+    one_to_one = False
+
+    @classmethod
+    def start(cls, data: int) -> int:
+        return data
+
+
+class IoStep(Step[int, int]):
+    pool = "io"
+
+    @classmethod
+    def start(cls, data: int) -> int:
+        return data
+
+
+class OrderedStep(Step[int, int]):
+    ordered = True
+
+    @classmethod
+    def start(cls, data: int) -> int:
+        return data
+
+
+def fused_flags(steps) -> List[bool]:
+    head = get_linked_list_from(steps)
+    fuse_steps(head)
+    flags = []
+    node = head
+    while node is not None:
+        flags.append(node.fused)
+        node = node.next[0] if node.next else None
+    return flags
+
+
+def test_fuse_marks_runs_of_one_to_one_steps():
+    # после генератора не сливаем: иначе его значения обрабатывал бы один воркер
+    assert fused_flags([Source, AddOne, Double, AddOne]) == [False, False, True, True]
+
+
+def test_fuse_skips_branches():
+    head = get_graph_from([AddOne, Double, [[AddOne, Double], [Double]]])
+    fuse_steps(head)
+
+    (double,) = head.next
+    assert double.fused
+    # ветви исполняются своими задачами, внутри ветви шаги сливаются
+    assert [branch.fused for branch in double.next] == [False, False]
+    assert double.next[0].next[0].fused
+
+
+def test_fuse_respects_opt_out_and_pools():
+    assert fused_flags([AddOne, NotFused, Double]) == [False, False, False]
+    assert fused_flags([AddOne, IoStep, Double]) == [False, False, False]
+
+
+def test_fuse_keeps_ordered_steps_separate():
+    # значения упорядоченного шага сначала ждут своей очереди, а следующие за ним сливаются с ним
+    assert fused_flags([AddOne, OrderedStep, Double]) == [False, False, True]
+
+
+def run_to_end(task: Task) -> List[Task]:
+    produced = []
+    queue = [task]
+    while queue:
+        current = queue.pop()
+        while True:
+            try:
+                queue.append(current.step())
+            except TaskDone:
+                break
+            produced.append(queue[-1])
+    return produced
+
+
+def test_fused_chain_skips_intermediate_tasks():
+    results: List[int] = []
+
+    class Sink(Step[int, None]):
+        @classmethod
+        def start(cls, data: int) -> None:
+            results.append(data)
+
+    plain = TaskBuilder.build_from(
+        [Source, AddOne, Double, AddOne, Sink],
+        strict_building_types=True,
+        strict_runtime_types=True,
+    )
+    fused = TaskBuilder.build_from(
+        [Source, AddOne, Double, AddOne, Sink],
+        strict_building_types=True,
+        strict_runtime_types=True,
+        fuse=True,
+    )
+
+    plain_tasks = run_to_end(plain)
+    fused_tasks = run_to_end(fused)
+
+    assert sorted(results) == [5, 5, 7, 7]
+    # каждое значение источника становится одной задачей вместо четырёх
+    assert len(plain_tasks) == 8
+    assert len(fused_tasks) == 2
+
+
+def test_fused_step_error_drops_only_value():
+    class Broken(Step[int, int]):
+        @classmethod
+        def start(cls, data: int) -> int:
+            raise ValueError("broken")
+
+    task = TaskBuilder.build_from(
+        [Source, AddOne, Broken, Double],
+        strict_building_types=False,
+        strict_runtime_types=False,
+        fuse=True,
+    )
+    child = task.step()
+
+    with pytest.raises(TaskRuntimeError):
+        child.step()
+    # как и без слияния: отброшено только значение, задача шага AddOne продолжает работу
+    assert not child.is_done()
+    with pytest.raises(TaskDone):
+        child.step()
+
+
+def run_skipping_errors(task: Task) -> None:
+    # как воркер: сломанная задача отбрасывается, незавершённая продолжает работу
+    queue = [task]
+    while queue:
+        current = queue.pop()
+        while True:
+            try:
+                queue.append(current.step())
+            except TaskDone:
+                break
+            except TaskRuntimeError:
+                if current.is_done():
+                    break
+
+
+def test_fused_step_error_matches_unfused_output():
+    results: List[int] = []
+
+    class Numbers(Step[None, int]):
+        @classmethod
+        def start(cls, data: None) -> Generator[int, None, None]:
+            yield from range(10)
+
+    class Pair(Step[int, int]):
+        # объявлен 1:1, но выдаёт два значения: следующие шаги сливаются с его задачей
+        one_to_one = True
+
+        @classmethod
+        def start(cls, data: int) -> Generator[int, None, None]:
+            yield data
+            yield data + 10
+
+    class FailOnThree(Step[int, int]):
+        @classmethod
+        def start(cls, data: int) -> int:
+            if data % 3 == 0:
+                raise ValueError(f"{data} делится на 3")
+            return data
+
+    class Sink(Step[int, None]):
+        @classmethod
+        def start(cls, data: int) -> None:
+            results.append(data)
+
+    outputs = []
+    for fuse in (False, True):
+        results.clear()
+        run_skipping_errors(
+            TaskBuilder.build_from(
+                [Numbers, Pair, FailOnThree, Double, Sink],
+                strict_building_types=True,
+                strict_runtime_types=True,
+                fuse=fuse,
+            )
+        )
+        outputs.append(sorted(results))
+
+    expected = [2 * i for i in range(20) if i % 3 != 0]
+    assert outputs[0] == outputs[1] == expected
+
+
+def test_fused_step_returning_generator_falls_back_to_task():
+    results: List[int] = []
+
+    def split(data: int) -> Generator[int, None, None]:
+        yield data
+        yield data + 10
+
+    class Splitter(Step[int, int]):
+        one_to_one = True
+
+        @classmethod
+        def start(cls, data: int) -> int:
+            # объявлен 1:1, но вернул генератор
+            return split(data)  # type: ignore[return-value]
+
+    class Sink(Step[int, None]):
+        @classmethod
+        def start(cls, data: int) -> None:
+            results.append(data)
+
+    task = TaskBuilder.build_from(
+        [Source, AddOne, Splitter, Double, Sink],
+        strict_building_types=True,
+        strict_runtime_types=False,
+        fuse=True,
+    )
+    run_to_end(task)
+
+    assert sorted(results) == [4, 6, 24, 26]
@@ -1,7 +1,11 @@
-from typing import Dict, List, Set, Any
+from typing import Dict, List, Optional, Set, Any, Union
 
 import pytest
-from fiber.pipeline.task.utils.types import impr_isinstance
+from fiber.pipeline.task.utils.types import (
+    compile_type_checker,
+    impr_isinstance,
+    is_type_compatible,
+)
 
 
 @pytest.mark.parametrize(
@@ -72,3 +76,80 @@ def test_incorret_type():
 # )
 # def test_with_incorect_non_empty_collections_and_typed_generics(obj, obj_t):
 # assert not impr_isinstance(obj, obj_t)
+
+
+@pytest.mark.parametrize(
+    ["obj", "obj_t", "expected"],
+    [
+        (1, Optional[int], True),
+        (None, Optional[int], True),
+        ("1", Optional[int], False),
+        (1, Union[int, str], True),
+        ("1", Union[int, str], True),
+        (1.1, Union[int, str], False),
+        (1, int | None, True),
+        (None, int | None, True),
+        ("1", int | None, False),
+        ([1], Union[List[int], None], True),
+        ({1}, Union[List[int], None], False),
+        ("1", Union[int, Any], True),
+    ],
+)
+def test_with_unions(obj, obj_t, expected):
+    assert impr_isinstance(obj, obj_t) == expected
+    check = compile_type_checker(obj_t)
+    assert check is None or check(obj) == expected
+
+
+def test_generic_alias_checks_container():
+    assert impr_isinstance([1, 2], List[int])
+    assert not impr_isinstance({1}, List[int])
+
+
+def test_ndarray_dtype_and_ndim():
+    np = pytest.importorskip("numpy")
+    npt = pytest.importorskip("numpy.typing")
+
+    floats = np.zeros(3, dtype=np.float64)
+
+    assert impr_isinstance(floats, npt.NDArray[np.float64])
+    assert impr_isinstance(floats, npt.NDArray[np.floating])
+    assert not impr_isinstance(floats, npt.NDArray[np.int64])
+    assert impr_isinstance(floats, np.ndarray[tuple[int], np.dtype[np.float64]])
+    assert not impr_isinstance(
+        floats, np.ndarray[tuple[int, int], np.dtype[np.float64]]
+    )
+
+
+def test_ndarray_type_compatibility():
+    np = pytest.importorskip("numpy")
+    npt = pytest.importorskip("numpy.typing")
+
+    assert is_type_compatible(npt.NDArray[np.float64], npt.NDArray[np.floating])
+    assert is_type_compatible(npt.NDArray[np.float64], np.ndarray)
+    assert not is_type_compatible(npt.NDArray[np.float64], npt.NDArray[np.int64])
+    assert not is_type_compatible(np.ndarray, npt.NDArray[np.float64])
+    assert not is_type_compatible(int, float)
+
+
+@pytest.mark.parametrize(
+    ["obj", "obj_t"],
+    [
+        (1, int),
+        ("1", int),
+        ([1, 2], List),
+        ([1, 2], Dict),
+        ({"field": 1}, Dict[str, int]),
+        (None, type(None)),
+        (None, Optional[int]),
+        ("1", Union[int, float]),
+    ],
+)
+def test_compiled_checker_matches_impr_isinstance(obj, obj_t):
+    check = compile_type_checker(obj_t)
+    assert check is not None
+    assert check(obj) == impr_isinstance(obj, obj_t)
+
+
+def test_compiled_checker_skips_any():
+    assert compile_type_checker(Any) is None
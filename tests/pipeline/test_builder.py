@@ -1,5 +1,12 @@
+import logging
+from typing import Generator, List
+
+import pytest
+
 from fiber.step import Step
 from fiber.pipeline.builder import PipelineBuilder
+from fiber.pipeline.builder.exceptions import PipelineBuildError
+from fiber.pipeline.runtime import Runtime, RuntimeConfig, TaskProvider
 from fiber.pipeline.task import Task
 
 
@@ -20,3 +27,172 @@ def test_pipeline_builder():
 
     task = pipeline_builder.__tasks_for_provider__[0]
     assert isinstance(task, Task)
+
+
+def test_branched_pipeline_runs_shared_steps_once():
+    parsed: List[int] = []
+    counted: List[int] = []
+    stored: List[str] = []
+
+    class Read(Step[None, int]):
+        @classmethod
+        def start(cls, data: None) -> Generator[int, None, None]:
+            yield from range(10)
+
+    class Parse(Step[int, int]):
+        @classmethod
+        def start(cls, data: int) -> int:
+            parsed.append(data)
+            return data * 10
+
+    class Count(Step[int, None]):
+        @classmethod
+        def start(cls, data: int) -> None:
+            counted.append(data)
+
+    class Format(Step[int, str]):
+        @classmethod
+        def start(cls, data: int) -> str:
+            return f"#{data}"
+
+    class Store(Step[str, None]):
+        @classmethod
+        def start(cls, data: str) -> None:
+            stored.append(data)
+
+    pipeline_builder = PipelineBuilder()
+    pipeline_builder.add_pipeline([Read, Parse, [[Count], [Format, Store]]])
+    Runtime(
+        tasks_provider=TaskProvider(pipeline_builder),
+        config=RuntimeConfig(TASK_LIMIT=100, WORKERS=2, TASKS_PER_ITER=4),
+    ).run()
+
+    assert sorted(parsed) == list(range(10))
+    assert sorted(counted) == [i * 10 for i in range(10)]
+    assert sorted(stored) == sorted(f"#{i * 10}" for i in range(10))
+
+
+def test_branched_pipeline_validates_every_branch():
+    class Start(Step[None, int]): ...
+
+    class Finish(Step[int, None]): ...
+
+    class Text(Step[str, None]): ...
+
+    with pytest.raises(PipelineBuildError):
+        PipelineBuilder().add_pipeline([Start, [[Finish], [Text]]])
+
+
+def test_merged_pipelines_run_shared_prefix_once(caplog):
+    read: List[int] = []
+    parsed: List[int] = []
+    counted: List[int] = []
+    stored: List[int] = []
+
+    class Read(Step[None, int]):
+        @classmethod
+        def start(cls, data: None) -> Generator[int, None, None]:
+            for i in range(10):
+                read.append(i)
+                yield i
+
+    class Parse(Step[int, int]):
+        @classmethod
+        def start(cls, data: int) -> int:
+            parsed.append(data)
+            return data * 10
+
+    class Count(Step[int, None]):
+        @classmethod
+        def start(cls, data: int) -> None:
+            counted.append(data)
+
+    class Store(Step[int, None]):
+        @classmethod
+        def start(cls, data: int) -> None:
+            stored.append(data)
+
+    pipeline_builder = PipelineBuilder(merge_prefixes=True)
+    pipeline_builder.add_pipeline([Read, Parse, Count])
+    pipeline_builder.add_pipeline([Read, Parse, Store])
+
+    with caplog.at_level(logging.INFO):
+        assert len(pipeline_builder.__tasks_for_provider__) == 1
+    assert "вызовов шагов на значение 6 -> 4" in caplog.text
+
+    Runtime(
+        tasks_provider=TaskProvider(pipeline_builder),
+        config=RuntimeConfig(TASK_LIMIT=100, WORKERS=2, TASKS_PER_ITER=4),
+    ).run()
+
+    assert sorted(read) == list(range(10))
+    assert sorted(parsed) == list(range(10))
+    assert sorted(counted) == [i * 10 for i in range(10)]
+    assert sorted(stored) == [i * 10 for i in range(10)]
+
+
+def test_pipelines_are_not_merged_by_default():
+    class Start(Step[None, int]): ...
+
+    class Finish(Step[int, None]): ...
+
+    pipeline_builder = PipelineBuilder()
+    pipeline_builder.add_pipeline([Start, Finish])
+    pipeline_builder.add_pipeline([Start, Finish])
+
+    assert len(pipeline_builder.__tasks_for_provider__) == 2
+
+
+def test_fed_pipeline_seeds_one_task_per_input():
+    inputs = 500
+    stored: List[str] = []
+    produced = iter(range(inputs))
+
+    class Format(Step[int, str]):
+        @classmethod
+        def start(cls, data: int) -> str:
+            return f"#{data}"
+
+    class Store(Step[str, None]):
+        @classmethod
+        def start(cls, data: str) -> None:
+            stored.append(data)
+
+    pipeline_builder = PipelineBuilder()
+    pipeline_builder.feed([Format, Store], produced)
+    # входы не читаются до запуска
+    assert next(produced) == 0
+
+    Runtime(
+        tasks_provider=TaskProvider(pipeline_builder),
+        config=RuntimeConfig(TASK_LIMIT=20, WORKERS=2, TASKS_PER_ITER=4),
+    ).run()
+
+    assert sorted(stored) == sorted(f"#{i}" for i in range(1, inputs))
+
+
+def test_fed_pipeline_is_validated_once():
+    class Format(Step[int, str]): ...
+
+    class Parse(Step[int, None]): ...
+
+    with pytest.raises(PipelineBuildError):
+        PipelineBuilder().feed([Format, Parse], range(10))
+
+
+def test_fed_collection_is_not_lazy():
+    class Format(Step[int, str]):
+        @classmethod
+        def start(cls, data: int) -> str:
+            return f"#{data}"
+
+    class Store(Step[str, None]):
+        @classmethod
+        def start(cls, data: str) -> None:
+            pass
+
+    pipeline_builder = PipelineBuilder()
+    pipeline_builder.feed([Format, Store], {1, 2, 3})
+
+    tasks = pipeline_builder.__tasks_for_provider__
+    assert isinstance(tasks, list) and len(tasks) == 3
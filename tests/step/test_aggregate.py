@@ -0,0 +1,66 @@
+from typing import List, Tuple
+
+import pytest
+
+from fiber.step import (
+    AggregateStep,
+    CountWindow,
+    SlidingWindow,
+    Step,
+    TumblingWindow,
+    get_step_types,
+    is_aggregate_step,
+    is_one_to_one_step,
+)
+
+
+class Top(AggregateStep[int, Tuple[int, ...]]):
+    @classmethod
+    def create(cls) -> List[int]:
+        return []
+
+    @classmethod
+    def add(cls, state: List[int], data: int) -> List[int]:
+        return sorted(state + [data])[-3:]
+
+    @classmethod
+    def merge(cls, left: List[int], right: List[int]) -> List[int]:
+        return sorted(left + right)[-3:]
+
+
+def test_aggregate_step_types():
+    class Subclass(Top): ...
+
+    assert get_step_types(Top) == (int, Tuple[int, ...])
+    assert get_step_types(Subclass) == (int, Tuple[int, ...])
+
+
+def test_aggregate_step_kind():
+    class Plain(Step[int, int]):
+        @classmethod
+        def start(cls, data: int) -> int:
+            return data
+
+    assert is_aggregate_step(Top)
+    assert not is_aggregate_step(Plain)
+    # агрегаты никогда не сливаются
+    assert not is_one_to_one_step(Top)
+
+
+@pytest.mark.parametrize(
+    "make",
+    [
+        lambda: TumblingWindow(0),
+        lambda: SlidingWindow(size=1.0, every=0.3),
+        lambda: SlidingWindow(size=0.5, every=1.0),
+        lambda: CountWindow(0),
+    ],
+)
+def test_invalid_windows(make):
+    with pytest.raises(ValueError):
+        make()
+
+
+def test_sliding_window_panes():
+    assert SlidingWindow(size=1.0, every=0.25).panes == 4
+    assert TumblingWindow(2.0).panes == 1
@@ -0,0 +1,78 @@
+import logging
+from typing import Generator
+
+import pytest
+
+from fiber.logging import (
+    ColoredFormatter,
+    configure_logging,
+    get_main_logger,
+    shutdown_logging,
+)
+from fiber.step import Step
+from fiber.pipeline.task import TaskBuilder, TaskDone
+
+
+@pytest.fixture
+def restore_logging():
+    yield
+    configure_logging(level=logging.DEBUG, background=False)
+
+
+def test_formatter_does_not_mutate_record():
+    record = logging.LogRecord(
+        name="fiber.kernel",
+        level=logging.INFO,
+        pathname=__file__,
+        lineno=1,
+        msg="Значение: %s",
+        args=(1,),
+        exc_info=None,
+    )
+
+    line = ColoredFormatter().format(record)
+
+    assert "[FIBER.KERNEL]" in line
+    assert "Значение: 1" in line
+    assert record.name == "fiber.kernel"
+    assert record.msg == "Значение: %s"
+    assert record.levelname == "INFO"
+
+
+def test_background_writer_flushes_on_shutdown(capsys, restore_logging):
+    logger = configure_logging(level=logging.INFO, background=True)
+
+    logger.info("Фоновая запись %s", 42)
+    shutdown_logging()
+
+    assert "Фоновая запись 42" in capsys.readouterr().err
+
+
+def test_payload_is_not_formatted_below_level(restore_logging):
+    formatted = []
+
+    class Payload:
+        def __repr__(self) -> str:
+            formatted.append(True)
+            return "Payload()"
+
+    class Source(Step[None, Payload]):
+        @classmethod
+        def start(cls, data: None) -> Generator[Payload, None, None]:
+            yield Payload()
+
+    class Sink(Step[Payload, None]):
+        @classmethod
+        def start(cls, data: Payload) -> None:
+            return None
+
+    configure_logging(level=logging.WARNING)
+    task = TaskBuilder.build_from(
+        [Source, Sink], strict_building_types=True, strict_runtime_types=True
+    )
+    child = task.step()
+    with pytest.raises(TaskDone):
+        child.step()
+
+    assert not formatted
+    assert get_main_logger().level == logging.WARNING